@@ -1,19 +1,43 @@
 import os
 import tempfile
+import shutil
 import redis
 import json
 import time
 from rq import Queue, Worker
-from flask import Flask, request, render_template, redirect, url_for, send_from_directory, flash, jsonify, make_response
-from werkzeug.utils import secure_filename
+from flask import Flask, request, render_template, redirect, url_for, send_from_directory, send_file, flash, jsonify, make_response, abort
+from werkzeug.utils import secure_filename, safe_join
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, tuple_
+from sqlalchemy.orm import deferred
+from sqlalchemy.exc import IntegrityError
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
-from faster_whisper import WhisperModel
+from caption_codec import encode_captions, decode_captions
 import logging
 import subprocess
 from datetime import datetime, date
 import re
+import uuid
+import mimetypes
+import base64
+import click
+from redis_pool import create_redis_connection, read_status_snapshot
+from storage import create_storage, storage_key
+from transcript_search import index_transcript, search_transcripts, SearchUnavailable
+from upstream import INTERACTIVE_QUEUE, TASK_TIMEOUT_SECONDS, TASK_RESULT_TTL_SECONDS, cached_stock_search
+from quota import daily_tries_used, reserve_daily_tries, refund_daily_tries, record_usage, pending_usage
+from lifecycle import track_artifact, touch_artifact, delete_artifact, touch_job_artifacts, delete_job_artifacts, begin_job_work, end_job_work, run_disk_maintenance, collect_disk_metrics
+from uploads import (
+    UploadError, hash_and_write_stream, create_upload_session, load_upload_session,
+    upload_progress, write_chunk, finish_upload_session, abort_upload_session
+)
+from pipeline import TRANSCRIPTION_PIPELINE, AUTO_EXPORT_PIPELINE, batch_exports_key, enqueue_pipeline, pipeline_status, pipeline_params, pipeline_stages, cancel_auto_export, sprites_dir, waveform_path, pcm_path, stage_job_id, cancel_pipeline, discard_cancelled_job
+from job_control import (
+    JobCancelled, request_cancel, raise_if_cancelled, clear_cancel,
+    fingerprint, submission_key, idempotency_key, claim_submission, release_submission,
+    lookup_idempotency_key, remember_idempotency_key
+)
 
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = os.environ.get('UPLOAD_FOLDER', 'uploads')
@@ -29,6 +53,26 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SERVER_NAME'] = os.environ.get('FLASK_SERVER_NAME') # e.g., 'your-domain.railway.app'
 app.config['PREFERRED_URL_SCHEME'] = os.environ.get('FLASK_PREFERRED_URL_SCHEME', 'https')
 
+# Media offload: set MEDIA_ACCEL_REDIRECT_PREFIX to an nginx `internal` location
+# aliased to UPLOAD_FOLDER, or USE_X_SENDFILE=1 behind Apache/lighttpd
+app.config['MEDIA_ACCEL_REDIRECT_PREFIX'] = os.environ.get('MEDIA_ACCEL_REDIRECT_PREFIX')
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE') == '1'
+
+# Object storage (see storage.py). 'local' keeps everything under UPLOAD_FOLDER
+# on this host; 's3' puts originals, exports and editor media in an
+# S3-compatible bucket so workers can run on other nodes. S3_ENDPOINT_URL
+# points it at MinIO or a local stand-in server instead of AWS.
+app.config['STORAGE_BACKEND'] = os.environ.get('STORAGE_BACKEND', 'local')
+app.config['S3_BUCKET'] = os.environ.get('S3_BUCKET')
+app.config['S3_PREFIX'] = os.environ.get('S3_PREFIX', '')
+app.config['S3_ENDPOINT_URL'] = os.environ.get('S3_ENDPOINT_URL')
+app.config['S3_REGION'] = os.environ.get('S3_REGION')
+app.config['S3_ACCESS_KEY_ID'] = os.environ.get('S3_ACCESS_KEY_ID')
+app.config['S3_SECRET_ACCESS_KEY'] = os.environ.get('S3_SECRET_ACCESS_KEY')
+# Read-through cache of remote objects on this node (worker inputs, editor metadata)
+app.config['STORAGE_CACHE_DIR'] = os.environ.get('STORAGE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'autoai_storage_cache'))
+app.config['STORAGE_CACHE_MAX_BYTES'] = int(os.environ.get('STORAGE_CACHE_MAX_BYTES', 20 * 1024 ** 3))
+
 # Configure Redis Queue
 app.config['REDIS_URL'] = os.environ.get('REDIS_URL', 'redis://localhost:6379')
 
@@ -87,10 +131,19 @@ oauth.register(
     client_kwargs={'scope': 'identify email'}
 )
 
-# Initialize Redis and RQ queue
-redis_conn = redis.from_url(app.config['REDIS_URL'])
+# Initialize Redis and RQ queue (explicit shared pool, see redis_pool.py)
+redis_conn = create_redis_connection(app.config['REDIS_URL'])
 q = Queue(connection=redis_conn)
 
+storage = create_storage(app.config)
+
+def media_key(filepath):
+    """Storage key of a file under UPLOAD_FOLDER."""
+    return storage_key(filepath, app.config['UPLOAD_FOLDER'])
+
+def media_exists(filepath):
+    return bool(filepath) and storage.exists(media_key(filepath))
+
 # Define model storage directory within /tmp for Vercel
 # Vercel's /tmp directory is cleared between invocations, but cached for cold starts
 MODEL_DIR = os.path.join(tempfile.gettempdir(), "faster_whisper_models")
@@ -99,9 +152,13 @@ os.makedirs(MODEL_DIR, exist_ok=True)
 # Global variable to hold the model, loaded once
 _faster_whisper_model = None
 
+# faster-whisper (ctranslate2, onnxruntime) and numpy are imported where they are
+# used, not at module level: gunicorn web workers import this module but only
+# RQ workers transcribe, and worker.py imports them up front instead.
 def load_faster_whisper_model(model_size="base", device="cpu", compute_type="int8"):
     global _faster_whisper_model
     if _faster_whisper_model is None:
+        from faster_whisper import WhisperModel
         app.logger.info(f"Loading faster-whisper model '{model_size}' to {MODEL_DIR}...")
         _faster_whisper_model = WhisperModel(model_size, device=device, compute_type=compute_type, download_root=MODEL_DIR)
         app.logger.info(f"Faster-whisper model '{model_size}' loaded successfully.")
@@ -188,13 +245,73 @@ class VideoProcessingJob(db.Model):
     language = db.Column(db.String(10), nullable=True) # Store selected language
     subtitle_pos_x = db.Column(db.Float, default=50.0) # Subtitle X position (percentage)
     subtitle_pos_y = db.Column(db.Float, default=15.0) # Subtitle Y position (percentage)
-    word_level_captions_json = db.Column(db.Text, nullable=True) # Store word-level captions as JSON
+    # The caption columns are the bulk of a row; they load (together) only when accessed
+    word_level_captions_json = deferred(db.Column(db.Text, nullable=True), group='captions') # Legacy JSON captions, read until the row is rewritten
+    word_level_captions_blob = deferred(db.Column(db.LargeBinary, nullable=True), group='captions') # Word-level captions in caption_codec's columnar format
+    captions_version = db.Column(db.Integer, default=0, nullable=False) # Bumped on every caption write, for optimistic concurrency
     zoom_effects_json = db.Column(db.Text, nullable=True) # Store auto-generated zoom effects as JSON
     sound_effects_json = db.Column(db.Text, nullable=True) # Store auto-generated sound effects as JSON
+    preview_proxy_filepath = db.Column(db.String(256), nullable=True) # Low-res editor proxy, exports use the original
+    batch_id = db.Column(db.String(36), db.ForeignKey('processing_batch.id'), nullable=True, index=True) # Set for jobs created by /api/batches
+
+    # Job history is keyset-paginated newest first, optionally filtered by status
+    __table_args__ = (
+        db.Index('ix_video_processing_job_user_created', 'user_id', 'created_at', 'id'),
+        db.Index('ix_video_processing_job_user_status_created', 'user_id', 'status', 'created_at', 'id'),
+    )
+
+    def has_captions(self):
+        return bool(self.word_level_captions_blob or self.word_level_captions_json)
+
+    def get_captions(self, start=None, end=None):
+        """Word-level captions, optionally only the segments overlapping [start, end) seconds."""
+        if self.word_level_captions_blob:
+            return decode_captions(self.word_level_captions_blob, start=start, end=end)
+        if not self.word_level_captions_json:
+            return []
+        captions = json.loads(self.word_level_captions_json)
+        if start is not None or end is not None:
+            captions = [
+                seg for seg in captions
+                if (start is None or seg.get('end', 0) > start) and (end is None or seg.get('start', 0) < end)
+            ]
+        return captions
+
+    def set_captions(self, captions):
+        self.word_level_captions_blob = encode_captions(captions)
+        self.word_level_captions_json = None
+        self.captions_version = (self.captions_version or 0) + 1
 
     def __repr__(self):
         return f"<VideoProcessingJob {self.id} - {self.status}>"
 
+class CaptionRevision(db.Model):
+    # Frozen copy of a caption version that an export renders, so the editor can keep patching meanwhile
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(36), db.ForeignKey('video_processing_job.id'), nullable=False, index=True)
+    version = db.Column(db.Integer, nullable=False)
+    captions_blob = db.Column(db.LargeBinary, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (db.UniqueConstraint('job_id', 'version', name='_job_caption_version_uc'),)
+
+    def __repr__(self):
+        return f"<CaptionRevision {self.job_id} v{self.version}>"
+
+class ProcessingBatch(db.Model):
+    id = db.Column(db.String(36), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    style_template_id = db.Column(db.Integer, db.ForeignKey('user_style_template.id'), nullable=True)
+    style_json = db.Column(db.Text, nullable=True) # Snapshot of the template, so later edits don't change a running batch
+    auto_export = db.Column(db.Boolean, default=False) # Render every video as soon as it is transcribed
+    export_settings_json = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    jobs = db.relationship('VideoProcessingJob', backref='batch', lazy=True)
+
+    def __repr__(self):
+        return f"<ProcessingBatch {self.id} ({'auto-export' if self.auto_export else 'transcribe only'})>"
+
 class UserStyleTemplate(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -209,9 +326,55 @@ class UserStyleTemplate(db.Model):
 
 
 
+# Flask-Login loads the user on every authenticated request, status polls included.
+# The columns the request path reads are cached in Redis; anything else lazy-loads
+# from the DB on first access. Any flushed change to a User drops its entry.
+USER_CACHE_FIELDS = ('username', 'email', 'oauth_provider', 'subscription_tier', 'daily_tries_count', 'last_try_date')
+USER_CACHE_TTL_SECONDS = int(os.environ.get('USER_CACHE_TTL_SECONDS', 60))
+
+def user_cache_key(user_id):
+    return f"user_cache:{user_id}"
+
+def invalidate_user_cache(user_id):
+    try:
+        redis_conn.delete(user_cache_key(user_id))
+    except redis.RedisError as e:
+        app.logger.warning(f"Could not invalidate cached user {user_id}: {e}")
+
+def cache_user(user):
+    fields = {name: getattr(user, name) for name in USER_CACHE_FIELDS}
+    fields['last_try_date'] = fields['last_try_date'].isoformat() if fields['last_try_date'] else None
+    try:
+        redis_conn.setex(user_cache_key(user.id), USER_CACHE_TTL_SECONDS, json.dumps(fields))
+    except redis.RedisError as e:
+        app.logger.warning(f"Could not cache user {user.id}: {e}")
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    from sqlalchemy.orm import make_transient_to_detached
+
+    try:
+        cached = redis_conn.get(user_cache_key(user_id))
+    except redis.RedisError:
+        cached = None
+    if cached:
+        fields = json.loads(cached)
+        if fields['last_try_date']:
+            fields['last_try_date'] = date.fromisoformat(fields['last_try_date'])
+        user = User(id=int(user_id), **fields)
+        make_transient_to_detached(user)
+        # Attached without a SELECT; edits made during the request still flush as UPDATEs
+        return db.session.merge(user, load=False)
+
+    user = User.query.get(int(user_id))
+    if user:
+        cache_user(user)
+    return user
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def drop_cached_user(mapper, connection, user):
+    invalidate_user_cache(user.id)
 
 
 
@@ -236,9 +399,176 @@ def seconds_to_srt_time(seconds):
     millis = int((seconds - int(seconds)) * 1000)
     return f"{hours:02}:{minutes:02}:{secs:02},{millis:03}"
 
+def captions_to_srt(captions):
+    lines = []
+    for index, segment in enumerate(captions, start=1):
+        lines.append(f"{index}\n{seconds_to_srt_time(segment['start'])} --> {seconds_to_srt_time(segment['end'])}\n{segment.get('text', '').strip()}\n")
+    return "\n".join(lines)
+
+# Exports pin the caption version they render; older pins are dropped past this many per job
+CAPTION_REVISIONS_KEPT = 5
+
+def apply_caption_ops(captions, ops):
+    """
+    Apply editor ops to a caption document and return the new document.
+    Segments are addressed by id, words by index within their segment:
+      {"op": "update_segment", "id": ..., "fields": {...}}
+      {"op": "update_word", "id": ..., "index": n, "fields": {...}}
+      {"op": "insert_segment", "segment": {...}}
+      {"op": "delete_segment", "id": ...}
+    Raises ValueError on an op that does not apply.
+    """
+    segments = {seg['id']: seg for seg in captions}
+    order = [seg['id'] for seg in captions]
+    for op in ops:
+        kind = op.get('op')
+        if kind == 'insert_segment':
+            segment = op.get('segment') or {}
+            if 'id' not in segment or segment['id'] in segments:
+                raise ValueError(f"insert_segment needs a new segment id (got {segment.get('id')!r})")
+            segments[segment['id']] = {"text": "", "start": 0.0, "end": 0.0, "words": [], **segment}
+            order.append(segment['id'])
+            continue
+        segment = segments.get(op.get('id'))
+        if segment is None:
+            raise ValueError(f"Unknown segment {op.get('id')!r}")
+        if kind == 'delete_segment':
+            del segments[segment['id']]
+            order.remove(segment['id'])
+        elif kind == 'update_segment':
+            fields = {k: v for k, v in (op.get('fields') or {}).items() if k != 'id'}
+            segments[segment['id']] = {**segment, **fields}
+        elif kind == 'update_word':
+            words = list(segment.get('words') or [])
+            index = op.get('index')
+            if not isinstance(index, int) or not 0 <= index < len(words):
+                raise ValueError(f"Segment {segment['id']!r} has no word {index!r}")
+            words[index] = {**words[index], **(op.get('fields') or {})}
+            segments[segment['id']] = {**segment, "words": words}
+        else:
+            raise ValueError(f"Unknown op {kind!r}")
+    return sorted((segments[seg_id] for seg_id in order), key=lambda seg: seg.get('start', 0))
+
+def pin_caption_revision(job_entry):
+    """Freeze the job's current caption version for an export and return its number."""
+    version = job_entry.captions_version
+    if not CaptionRevision.query.filter_by(job_id=job_entry.id, version=version).first():
+        blob = job_entry.word_level_captions_blob or encode_captions(job_entry.get_captions())
+        db.session.add(CaptionRevision(job_id=job_entry.id, version=version, captions_blob=blob))
+        stale = (CaptionRevision.query.filter_by(job_id=job_entry.id)
+                 .order_by(CaptionRevision.version.desc()).offset(CAPTION_REVISIONS_KEPT).all())
+        for revision in stale:
+            db.session.delete(revision)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()  # A concurrent export pinned the same version
+    return version
+
+def load_caption_revision(job_id, version):
+    revision = CaptionRevision.query.filter_by(job_id=job_id, version=version).first()
+    return decode_captions(revision.captions_blob) if revision else None
+
+# Transcription checkpoints survive worker crashes and job timeouts for this long
+TRANSCRIBE_CHECKPOINT_TTL = 48 * 3600
+
+def transcribe_checkpoint_keys(checkpoint_id):
+    return f"transcribe_checkpoint:{checkpoint_id}:segments", f"transcribe_checkpoint:{checkpoint_id}:offset"
+
+def load_transcribe_checkpoint(checkpoint_id):
+    """Return (completed segments, audio offset in seconds) saved for a transcription."""
+    segments_key, offset_key = transcribe_checkpoint_keys(checkpoint_id)
+    pipe = redis_conn.pipeline()
+    pipe.lrange(segments_key, 0, -1)
+    pipe.get(offset_key)
+    raw_segments, raw_offset = pipe.execute()
+    if not raw_segments or raw_offset is None:
+        return [], 0.0
+    return [json.loads(seg) for seg in raw_segments], float(raw_offset)
+
+def save_transcribe_checkpoint(checkpoint_id, new_segments, offset):
+    """Append newly completed segments and move the resume offset in one transaction."""
+    segments_key, offset_key = transcribe_checkpoint_keys(checkpoint_id)
+    pipe = redis_conn.pipeline(transaction=True)
+    if new_segments:
+        pipe.rpush(segments_key, *[json.dumps(seg) for seg in new_segments])
+    pipe.set(offset_key, offset)
+    pipe.expire(segments_key, TRANSCRIBE_CHECKPOINT_TTL)
+    pipe.expire(offset_key, TRANSCRIBE_CHECKPOINT_TTL)
+    pipe.execute()
+
+def clear_transcribe_checkpoint(checkpoint_id):
+    redis_conn.delete(*transcribe_checkpoint_keys(checkpoint_id))
+
+def transcribe_audio_file(audio_filepath, language=None, checkpoint_id=None, checkpoint_every=10, cancel_id=None):
+    """
+    Run faster-whisper over a normalized PCM artifact (see audio_pcm) and return
+    word-level caption segments. The samples are memory-mapped, not decoded.
+
+    With a checkpoint_id, completed segments and the audio offset they reach are
+    checkpointed to Redis every `checkpoint_every` segments. A later call with the
+    same id (a retried or rescheduled job) only transcribes the audio after the
+    last checkpoint and merges the result with what was already done.
+
+    With a cancel_id, the segment loop stops with JobCancelled as soon as that
+    job is cancelled instead of running inference to the end of the file.
+    """
+    word_level_captions, offset = [], 0.0
+    if checkpoint_id:
+        word_level_captions, offset = load_transcribe_checkpoint(checkpoint_id)
+        if word_level_captions:
+            app.logger.info(f"Resuming transcription {checkpoint_id} at {offset:.2f}s with {len(word_level_captions)} segments done")
+
+    from audio_pcm import open_pcm
+
+    # Resuming is just a later view into the same mapping
+    audio = open_pcm(audio_filepath, start_seconds=offset)
+
+    model_ft = load_faster_whisper_model()
+    segments, info = model_ft.transcribe(
+        audio, 
+        beam_size=5, 
+        language=language if language else None,
+        word_timestamps=True # Enable word-level timestamps
+    )
+    
+    # Process segments to extract word-level data
+    pending = []
+    for segment in segments:
+        raise_if_cancelled(redis_conn, cancel_id)
+        segment_words = []
+        # Ensure segment.words is iterable
+        if hasattr(segment, 'words') and segment.words:
+            for word in segment.words:
+                # Rounded to the precision caption_codec stores (ms, 1/10000), so
+                # checkpointed, stored and decoded values are the same floats
+                segment_words.append({
+                    "text": word.word,
+                    "start": round(word.start + offset, 3),
+                    "end": round(word.end + offset, 3),
+                    "probability": round(getattr(word, 'probability', 0.0), 4) # Confidence score, default to 0.0 if not present
+                })
+
+        pending.append({
+            "id": f"segment_{len(word_level_captions) + len(pending) + 1}", # Unique ID for each segment
+            "text": segment.text.strip(),
+            "start": round(segment.start + offset, 3),
+            "end": round(segment.end + offset, 3),
+            "words": segment_words
+        })
+
+        if checkpoint_id and len(pending) >= checkpoint_every:
+            save_transcribe_checkpoint(checkpoint_id, pending, pending[-1]["end"])
+            word_level_captions.extend(pending)
+            pending = []
+
+    word_level_captions.extend(pending)
+    return word_level_captions
+
 def transcribe_video_task(user_id, original_filepath, filename, language, user_max_duration):
     from rq import get_current_job
     from app import app, db, User, UsageLog, seconds_to_srt_time, load_faster_whisper_model, get_video_duration, MODEL_DIR, os, subprocess, logging, date, tempfile
+    from audio_pcm import extract_pcm
     
     with app.app_context():
         current_job_id = get_current_job().id
@@ -249,6 +579,7 @@ def transcribe_video_task(user_id, original_filepath, filename, language, user_m
 
         app.logger.info(f"Starting video transcription for job {current_job_id}, user {user_id}, file {filename}")
         
+        temp_dir = None
         try:
             video_duration = get_video_duration(original_filepath)
             if video_duration is None:
@@ -262,46 +593,21 @@ def transcribe_video_task(user_id, original_filepath, filename, language, user_m
             audio_filename_base = os.path.splitext(filename)[0]
             # Use a temporary directory for audio extraction
             temp_dir = tempfile.mkdtemp(dir=app.config['UPLOAD_FOLDER'])
-            audio_filepath = os.path.join(temp_dir, f"{audio_filename_base}.mp3")
-
-            ffmpeg_audio_command = ["ffmpeg", "-i", original_filepath, "-y", audio_filepath]
-            app.logger.info(f"Running FFmpeg audio extraction for job {current_job_id}: {' '.join(ffmpeg_audio_command)}")
-            subprocess.run(ffmpeg_audio_command, check=True, capture_output=True)
-
-            model_ft = load_faster_whisper_model()
-            segments, info = model_ft.transcribe(
-                audio_filepath, 
-                beam_size=5, 
-                language=language if language else None,
-                word_timestamps=True # Enable word-level timestamps
-            )
-            
-            # Process segments to extract word-level data
-            word_level_captions = []
-            for i, segment in enumerate(segments):
-                segment_words = []
-                # Ensure segment.words is iterable
-                if hasattr(segment, 'words') and segment.words:
-                    for word in segment.words:
-                        segment_words.append({
-                            "text": word.word,
-                            "start": word.start,
-                            "end": word.end,
-                            "probability": getattr(word, 'probability', 0.0) # Confidence score, default to 0.0 if not present
-                        })
-                
-                word_level_captions.append({
-                    "id": f"segment_{i+1}", # Unique ID for each segment
-                    "text": segment.text.strip(),
-                    "start": segment.start,
-                    "end": segment.end,
-                    "words": segment_words
-                })
+            audio_filepath = os.path.join(temp_dir, f"{audio_filename_base}.wav")
+
+            app.logger.info(f"Extracting normalized audio for job {current_job_id}")
+            returncode, output = extract_pcm(original_filepath, audio_filepath, redis_conn=redis_conn, cancel_id=current_job_id)
+            if returncode != 0:
+                raise subprocess.CalledProcessError(returncode, "ffmpeg", output=b"", stderr=output.encode())
+
+            word_level_captions = transcribe_audio_file(audio_filepath, language, checkpoint_id=current_job_id, cancel_id=current_job_id)
             
             # Save word-level data as JSON in the database
             job_entry = VideoProcessingJob.query.get(current_job_id)
             if job_entry:
-                job_entry.word_level_captions_json = json.dumps(word_level_captions)
+                job_entry.set_captions(word_level_captions)
+                # Indexed in the same transaction, so a transcribed job is always searchable
+                index_transcript(db.session, job_entry.id, job_entry.user_id, word_level_captions)
                 # The generated_srt_filepath is no longer directly used for content storage
                 # but might be referenced elsewhere. Point it to a placeholder.
                 job_entry.generated_srt_filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{current_job_id}_word_level_data.json")
@@ -309,6 +615,7 @@ def transcribe_video_task(user_id, original_filepath, filename, language, user_m
                 db.session.commit()
             else:
                 app.logger.error(f"VideoProcessingJob with ID {current_job_id} not found after transcription.")
+            clear_transcribe_checkpoint(current_job_id)
             
             # Clean up audio file and temp directory
             os.remove(audio_filepath)
@@ -326,6 +633,10 @@ def transcribe_video_task(user_id, original_filepath, filename, language, user_m
                 "generated_srt_filepath": srt_filepath
             }
 
+        except JobCancelled:
+            app.logger.info(f"Transcription job {current_job_id} cancelled")
+            discard_cancelled_job(redis_conn, current_job_id, original_filepath)
+            return {"status": "cancelled"}
         except subprocess.CalledProcessError as e:
             # Update job status to failed
             job_entry = VideoProcessingJob.query.get(current_job_id)
@@ -344,16 +655,102 @@ def transcribe_video_task(user_id, original_filepath, filename, language, user_m
                 db.session.commit()
             app.logger.error(f"An unexpected error occurred for transcription job {current_job_id}: {e}")
             return {"status": "failed", "error": f"An unexpected error occurred during transcription: {e}"}
+        finally:
+            # Failure paths used to leak the extracted audio
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def transcribe_word_level_task(language, video_filepath, pcm_filepath=None, scratch_upload=False):
+    """
+    RQ task behind /api/transcribe_word_level: word-level captions through the
+    same path as the upload pipeline (transcribe_audio_file, the process-wide
+    model, real word timestamps). A job's normalized audio artifact is mapped
+    when this node has it; otherwise the video is decoded to scratch PCM.
+    With scratch_upload the video was a one-off upload and is deleted after.
+    """
+    from rq import get_current_job
+    from audio_pcm import extract_pcm
 
+    with app.app_context():
+        task_id = get_current_job().id
+        temp_dir = None
+        try:
+            if pcm_filepath and os.path.exists(pcm_filepath):
+                audio_filepath = pcm_filepath
+            else:
+                temp_dir = tempfile.mkdtemp(dir=app.config['UPLOAD_FOLDER'])
+                audio_filepath = os.path.join(temp_dir, f"{task_id}.wav")
+                returncode, output = extract_pcm(storage.local_path(media_key(video_filepath)), audio_filepath, redis_conn=redis_conn, cancel_id=task_id)
+                if returncode != 0:
+                    raise RuntimeError(f"FFmpeg audio extraction error: {output}")
+            captions = transcribe_audio_file(audio_filepath, language, cancel_id=task_id)
+        finally:
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+            if scratch_upload:
+                # The upload was tracked under this task's id
+                delete_job_artifacts(redis_conn, task_id)
+
+    return {
+        "status": "success",
+        "captions": captions,
+        "duration": captions[-1]['end'] if captions else 0
+    }
 
 @app.cli.command("init-db")
 def init_db_command():
     """Drops and creates the database tables."""
+    from migrations import run_migrations
     with app.app_context():
+        # Tables created by raw migration steps are not in the model metadata
+        db.session.execute(db.text("DROP TABLE IF EXISTS transcript_segment"))
+        db.session.commit()
         db.drop_all()
-        db.create_all()
+        db.session.execute(db.text("DROP TABLE IF EXISTS schema_migrations"))
+        db.session.commit()
+    # On an empty database the baseline step creates every table and the rest are no-ops
+    run_migrations()
     print("Dropped and initialized the database.")
 
+@app.cli.command("db-upgrade")
+def db_upgrade_command():
+    """Applies pending schema migrations (run once per deploy)."""
+    from migrations import run_migrations
+    applied = run_migrations()
+    print(f"Applied migrations {applied}." if applied else "Schema is up to date.")
+
+@app.cli.command("disk-gc")
+def disk_gc_command():
+    """Applies retention and the disk quota, sweeps orphaned scratch files."""
+    summary = run_disk_maintenance(redis_conn)
+    print(f"Expired {len(summary['expired'])}, evicted {len(summary['evicted'])}, removed {len(summary['orphans'])} orphaned scratch paths.")
+    print(json.dumps(summary['metrics'], indent=2))
+
+@app.cli.command("disk-usage")
+def disk_usage_command():
+    """Prints disk usage per artifact tier."""
+    print(json.dumps(collect_disk_metrics(redis_conn), indent=2))
+
+@app.cli.command("reindex-transcripts")
+@click.option('--user-id', default=None, type=int, help='Only this user\'s jobs.')
+def reindex_transcripts_command(user_id):
+    """Rebuilds the transcript search index, e.g. for jobs transcribed before it existed."""
+    query = VideoProcessingJob.query.filter(db.or_(
+        VideoProcessingJob.word_level_captions_blob.isnot(None),
+        VideoProcessingJob.word_level_captions_json.isnot(None)
+    ))
+    if user_id is not None:
+        query = query.filter_by(user_id=user_id)
+    jobs = segments = 0
+    for job_id, owner_id in query.with_entities(VideoProcessingJob.id, VideoProcessingJob.user_id).all():
+        job_entry = VideoProcessingJob.query.get(job_id)
+        segments += index_transcript(db.session, job_id, owner_id, job_entry.get_captions())
+        db.session.commit()
+        db.session.expunge_all()  # Caption documents are big; don't keep every one in the identity map
+        jobs += 1
+    print(f"Indexed {segments} segments from {jobs} jobs")
+
 @app.route('/')
 def index():
     message = request.args.get('message')
@@ -582,7 +979,6 @@ def logout():
     logout_user()
     return redirect(url_for('index', message="Info! You have been logged out."))
 
-import requests # Needed for making HTTP requests to external APIs
 import stripe # Import Stripe library
 
 # ... (Stripe API key configuration)
@@ -596,6 +992,8 @@ def upgrade():
     # In a real app, you'd have multiple plans. For simplicity, let's assume one "Pro" plan.
     # Get the base URL for redirects
     base_url = url_for('index', _external=True)
+    # The tier is about to change; the next request re-reads it instead of a cached copy
+    invalidate_user_cache(current_user.id)
 
     try:
         checkout_session = stripe.checkout.Session.create(
@@ -656,6 +1054,16 @@ def user_usage_data():
     dates = [log.date.strftime('%Y-%m-%d') for log in usage_data]
     videos_processed = [log.videos_processed for log in usage_data]
 
+    # Today's count may still be waiting for the next usage flush
+    unflushed = pending_usage(redis_conn, current_user.id)
+    if unflushed:
+        today = date.today().strftime('%Y-%m-%d')
+        if dates and dates[-1] == today:
+            videos_processed[-1] += unflushed
+        else:
+            dates.append(today)
+            videos_processed.append(unflushed)
+
     return jsonify({
         'dates': dates,
         'videos_processed': videos_processed
@@ -734,31 +1142,35 @@ def burn_subtitles_task(original_job_id, user_id, original_video_filepath, srt_f
         
         if not user:
             app.logger.error(f"User with ID {user_id} not found for burning job {original_job_id}")
+            end_job_work(redis_conn, original_job_id, 'burn')
+            release_submission(redis_conn, submission_key('burn', user_id, original_job_id), original_job_id)
             return {"status": "failed", "error": "User not found"}
 
         app.logger.info(f"Starting video burning with Hormozi-style subtitles for original job {original_job_id}, user {user_id}, file {filename_for_output}")
         
         try:
-            # Check if original video file still exists
-            if not os.path.exists(original_video_filepath):
+            # Check if original video file still exists (on S3 it is no longer on local disk)
+            if not storage.exists(media_key(original_video_filepath)):
                 app.logger.error(f"Original video file not found for burning job {original_job_id}: {original_video_filepath}")
                 if job_entry:
                     job_entry.status = 'failed'
                     db.session.commit()
-                if os.path.exists(srt_filepath):
-                    os.remove(srt_filepath)
+                delete_artifact(redis_conn, media_key(srt_filepath))
                 return {"status": "failed", "error": "Original video file not found. It might have been deleted or moved."}
             
             # Check if SRT file exists
-            if not os.path.exists(srt_filepath):
+            if not storage.exists(media_key(srt_filepath)):
                 app.logger.error(f"SRT file not found for burning job {original_job_id}: {srt_filepath}")
                 if job_entry:
                     job_entry.status = 'failed'
                     db.session.commit()
-                if os.path.exists(original_video_filepath):
-                    os.remove(original_video_filepath)
+                delete_artifact(redis_conn, media_key(original_video_filepath))
                 return {"status": "failed", "error": "SRT file not found. It might have been deleted or moved."}
 
+            # ffprobe/ffmpeg need local files; remote storage fills this node's read-through cache
+            local_video_filepath = storage.local_path(media_key(original_video_filepath))
+            local_srt_filepath = storage.local_path(media_key(srt_filepath))
+
             output_video_filename = f"subtitled_{filename_for_output}"
             output_video_filepath = os.path.join(app.config['UPLOAD_FOLDER'], output_video_filename)
             
@@ -767,7 +1179,7 @@ def burn_subtitles_task(original_job_id, user_id, original_video_filepath, srt_f
                 ffprobe_cmd = [
                     'ffprobe', '-v', 'error', '-select_streams', 'v:0',
                     '-show_entries', 'stream=width,height', '-of', 'csv=s=x:p=0',
-                    original_video_filepath
+                    local_video_filepath
                 ]
                 result = subprocess.run(ffprobe_cmd, capture_output=True, text=True, check=True)
                 video_width, video_height = map(int, result.stdout.strip().split('x'))
@@ -808,7 +1220,7 @@ def burn_subtitles_task(original_job_id, user_id, original_video_filepath, srt_f
                 return int(hours) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000
             
             # Read SRT file
-            with open(srt_filepath, 'r', encoding='utf-8') as f:
+            with open(local_srt_filepath, 'r', encoding='utf-8') as f:
                 srt_content = f.read()
             
             captions = parse_srt(srt_content)
@@ -921,7 +1333,7 @@ def burn_subtitles_task(original_job_id, user_id, original_video_filepath, srt_f
             
             ffmpeg_burn_command = [
                 "ffmpeg",
-                "-i", original_video_filepath,
+                "-i", local_video_filepath,
                 "-y",
                 "-vf", vf_string,
                 "-preset", "ultrafast",
@@ -939,27 +1351,16 @@ def burn_subtitles_task(original_job_id, user_id, original_video_filepath, srt_f
             
             app.logger.info(f"FFmpeg completed successfully for job {original_job_id}")
 
+            # Publish where the web tier can serve it (a no-op with local storage)
+            track_artifact(redis_conn, original_job_id, media_key(output_video_filepath), 'export')
+            storage.put(media_key(output_video_filepath), output_video_filepath, move=True)
+
             # Clean up original uploaded file and SRT file after processing
-            if os.path.exists(original_video_filepath):
-                os.remove(original_video_filepath)
-            if os.path.exists(srt_filepath):
-                os.remove(srt_filepath)
-
-            # Record usage in UsageLog
-            today = date.today()
-            usage_log = UsageLog.query.filter_by(user_id=user.id, date=today).first()
-            if usage_log:
-                usage_log.videos_processed += 1
-            else:
-                usage_log = UsageLog(user_id=user.id, date=today, videos_processed=1)
-                db.session.add(usage_log)
-            db.session.commit()
+            delete_artifact(redis_conn, media_key(original_video_filepath))
+            delete_artifact(redis_conn, media_key(srt_filepath))
 
-            # Increment daily tries count for the user only on successful completion
-            if user.max_daily_tries != -1: # Only for users with limited tries
-                user.daily_tries_count += 1
-                user.last_try_date = date.today() # Update last_try_date to today for this successful try
-                db.session.commit()
+            # Counted in Redis and flushed to UsageLog in batches; the daily try was taken at upload
+            record_usage(redis_conn, user.id)
 
             video_download_url = f"/download/{output_video_filename}"
             
@@ -988,10 +1389,8 @@ def burn_subtitles_task(original_job_id, user_id, original_video_filepath, srt_f
             app.logger.error(f"FFmpeg stdout: {e.stdout.decode(errors='ignore')}")
             app.logger.error(f"FFmpeg stderr: {e.stderr.decode(errors='ignore')}")
             # Clean up original video and srt if burning failed
-            if os.path.exists(original_video_filepath):
-                os.remove(original_video_filepath)
-            if os.path.exists(srt_filepath):
-                os.remove(srt_filepath)
+            delete_artifact(redis_conn, media_key(original_video_filepath))
+            delete_artifact(redis_conn, media_key(srt_filepath))
             return {"status": "failed", "error": f"FFmpeg burning error: {e.stderr.decode(errors='ignore')}"}
         except Exception as e:
             # Update job status to failed
@@ -1001,11 +1400,13 @@ def burn_subtitles_task(original_job_id, user_id, original_video_filepath, srt_f
                 db.session.commit()
             app.logger.error(f"An unexpected error occurred for burning job {original_job_id}: {e}")
             # Clean up original video and srt if burning failed
-            if os.path.exists(original_video_filepath):
-                os.remove(original_video_filepath)
-            if os.path.exists(srt_filepath):
-                os.remove(srt_filepath)
+            delete_artifact(redis_conn, media_key(original_video_filepath))
+            delete_artifact(redis_conn, media_key(srt_filepath))
             return {"status": "failed", "error": f"An unexpected error occurred during burning: {e}"}
+        finally:
+            end_job_work(redis_conn, original_job_id, 'burn')
+            # Succeeded or failed, the burn is over: a new one may be started
+            release_submission(redis_conn, submission_key('burn', user_id, original_job_id), original_job_id)
 
 
 def get_video_duration(filepath):
@@ -1026,21 +1427,151 @@ def get_video_duration(filepath):
         app.logger.error(f"Error getting video duration: {e}")
         return None
 
+def get_video_dimensions(filepath):
+    try:
+        cmd = [
+            'ffprobe', '-v', 'error', '-select_streams', 'v:0',
+            '-show_entries', 'stream=width,height', '-of', 'csv=s=x:p=0',
+            filepath
+        ]
+        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        width, height = map(int, result.stdout.strip().split('x')[:2])
+        return width, height
+    except Exception as e:
+        app.logger.error(f"Error getting video dimensions: {e}")
+        return None
+
+def save_upload_with_hash(file, filepath):
+    """Write an uploaded file to disk and return its content hash, in a single pass."""
+    with open(filepath, 'wb') as out:
+        return hash_and_write_stream(file.stream, out)
+
+def check_daily_upload_limit(count=1):
+    """
+    Cheap early rejection before any bytes are received: an error response if
+    `count` more videos would not fit today's quota. The authoritative check is
+    reserve_upload_tries() once the job actually exists.
+    """
+    user_max_tries = current_user.get_max_daily_tries()
+    if user_max_tries == -1:
+        return None
+    remaining = max(0, user_max_tries - daily_tries_used(redis_conn, current_user.id))
+    if count > remaining:
+        if count == 1:
+            return jsonify({"status": "error", "message": f"Daily upload limit reached ({user_max_tries}). Upgrade or try again tomorrow."}), 403
+        return jsonify({"status": "error", "message": f"This batch has {count} videos but only {remaining} of your daily {user_max_tries} remain."}), 403
+    return None
+
+def reserve_upload_tries(count=1):
+    """Atomically take `count` tries from the current user's daily quota; False if they do not fit."""
+    # Counts from before the Redis counter existed still apply today
+    seed = (current_user.daily_tries_count or 0) if current_user.last_try_date == date.today() else 0
+    return reserve_daily_tries(redis_conn, current_user.id, current_user.get_max_daily_tries(), count=count, seed=seed) is not None
+
+def quota_exceeded_response():
+    return jsonify({"status": "error", "message": f"Daily upload limit reached ({current_user.get_max_daily_tries()}). Upgrade or try again tomorrow."}), 403
+
+def prepare_video_job(filepath, filename, content_hash, resolution, language, batch=None):
+    """
+    Claim a fully written upload for dedup, publish the original and build its
+    VideoProcessingJob and pipeline params without committing anything.
+    Returns (job_id, job_entry, params); job_entry is None when the same video
+    is already in flight for this user and job_id is that job.
+    """
+    # The same video with the same options already in flight for this user: attach to it
+    job_id = str(uuid.uuid4())
+    dedup_key = submission_key('upload', current_user.id, fingerprint(content_hash, resolution, language))
+    existing_job_id = claim_submission(redis_conn, dedup_key, job_id)
+    if existing_job_id:
+        app.logger.info(f"Duplicate upload attached to in-flight job {existing_job_id}")
+        os.remove(filepath)
+        return existing_job_id, None, None
+
+    # Publish the original where every worker node can read it (a no-op with local storage)
+    storage.put(media_key(filepath), filepath, move=True)
+    track_artifact(redis_conn, job_id, media_key(filepath), 'original')
+
+    job_entry = VideoProcessingJob(
+        id=job_id,
+        user_id=current_user.id,
+        original_video_filepath=filepath,
+        original_filename=filename,
+        status='pending',
+        resolution=resolution, # Store resolution from upload form
+        language=language, # Store language from upload form
+        batch_id=batch.id if batch else None
+    )
+    params = {
+        "user_id": current_user.id,
+        "original_filepath": filepath,
+        "filename": filename,
+        "language": language,
+        "user_max_duration": current_user.get_max_duration(),
+        "dedup_key": dedup_key,
+        # The day whose quota counter the job's try is taken from, for refunds
+        "reserved_on": date.today().isoformat()
+    }
+    if batch and batch.auto_export:
+        params["batch_id"] = batch.id
+        params["auto_export"] = {
+            "style": json.loads(batch.style_json) if batch.style_json else {},
+            "settings": json.loads(batch.export_settings_json) if batch.export_settings_json else {}
+        }
+    return job_id, job_entry, params
+
+def enqueue_video_job(job_id, params):
+    """Enqueue the whole post-upload pipeline (probe -> audio -> transcribe -> effects [-> export])."""
+    stages = AUTO_EXPORT_PIPELINE if params.get('auto_export') else TRANSCRIPTION_PIPELINE
+    enqueue_pipeline(q, job_id, params, stages)
+    app.logger.info(f"Video processing pipeline enqueued for job ID: {job_id}")
+
+def start_video_job(filepath, filename, content_hash, resolution, language, idem_key=None):
+    """
+    Turn a fully written upload into a VideoProcessingJob and enqueue its
+    pipeline, or attach to an identical upload already in flight.
+    """
+    job_id, job_entry, params = prepare_video_job(filepath, filename, content_hash, resolution, language)
+    if job_entry is None:
+        remember_idempotency_key(redis_conn, idem_key, job_id)
+        return jsonify({"status": "success", "job_id": job_id, "duplicate": True})
+
+    # Attaching to a duplicate is free; a new job takes a try, atomically
+    if not reserve_upload_tries():
+        delete_job_artifacts(redis_conn, job_id)
+        release_submission(redis_conn, params['dedup_key'], job_id)
+        return quota_exceeded_response()
+
+    # Create the VideoProcessingJob entry before any stage can run
+    try:
+        db.session.add(job_entry)
+        db.session.commit()
+    except Exception:
+        # Undo everything prepare_video_job claimed, so a retry starts clean
+        # instead of attaching to a job id that was never written
+        db.session.rollback()
+        refund_daily_tries(redis_conn, current_user.id)
+        release_submission(redis_conn, params['dedup_key'], job_id)
+        delete_job_artifacts(redis_conn, job_id)
+        raise
+
+    enqueue_video_job(job_id, params)
+    remember_idempotency_key(redis_conn, idem_key, job_id)
+
+    return jsonify({"status": "success", "job_id": job_id})
+
 @app.route('/upload', methods=['POST'])
 @login_required # This decorator requires user to be logged in to upload
 def upload_file():
-    # Determine user limits
-    user_max_duration = current_user.get_max_duration()
-    user_max_tries = current_user.get_max_daily_tries()
-    
-    # Reset daily tries if date changed
-    if current_user.last_try_date != date.today():
-        current_user.daily_tries_count = 0
-        current_user.last_try_date = date.today()
-        db.session.commit()
+    limit_error = check_daily_upload_limit()
+    if limit_error:
+        return limit_error
 
-    if user_max_tries != -1 and current_user.daily_tries_count >= user_max_tries:
-        return jsonify({"status": "error", "message": f"Daily upload limit reached ({user_max_tries}). Upgrade or try again tomorrow."}), 403
+    # A retried request carrying the same Idempotency-Key attaches to the job it already started
+    client_key = request.headers.get('Idempotency-Key')
+    idem_key = idempotency_key('upload', current_user.id, client_key) if client_key else None
+    existing_job_id = lookup_idempotency_key(redis_conn, idem_key)
+    if existing_job_id:
+        return jsonify({"status": "success", "job_id": existing_job_id, "duplicate": True})
 
     if 'video_file' not in request.files:
         return redirect(url_for('index', message="Error: No file part in the request."))
@@ -1067,7 +1598,7 @@ def upload_file():
             else:
                 app.logger.info(f"Upload folder '{upload_folder}' exists.")
             
-            file.save(filepath)
+            content_hash = save_upload_with_hash(file, filepath)
 
             # ==> DIAGNOSTIC LOGGING <==
             if os.path.exists(filepath):
@@ -1075,33 +1606,7 @@ def upload_file():
             else:
                 app.logger.error(f"FAILURE: File not found at {filepath} immediately after save.")
 
-
-            # Enqueue the video processing task
-            job = q.enqueue(
-                'app.transcribe_video_task', # Enqueue the new transcription task
-                current_user.id,
-                filepath,
-                filename, # Pass original filename for output naming
-                language,
-                user_max_duration,
-                job_timeout='1h' # Allow up to 1 hour for video processing
-            )
-            app.logger.info(f"Video transcription task enqueued with job ID: {job.id}")
-
-            # Create a new VideoProcessingJob entry
-            new_job_entry = VideoProcessingJob(
-                id=job.id,
-                user_id=current_user.id,
-                original_video_filepath=filepath,
-                original_filename=filename,
-                status='pending',
-                resolution=resolution, # Store resolution from upload form
-                language=language # Store language from upload form
-            )
-            db.session.add(new_job_entry)
-            db.session.commit()
-
-            return jsonify({"status": "success", "job_id": job.id})
+            return start_video_job(filepath, filename, content_hash, resolution, language, idem_key)
 
         except Exception as e:
             app.logger.error(f"An error occurred during file upload or enqueue: {e}")
@@ -1109,10 +1614,433 @@ def upload_file():
                 os.remove(filepath)
             return jsonify({"status": "error", "message": f"An unexpected error occurred: {e}"}), 500
 
+# Resumable chunked uploads (see uploads.py)
+@app.route('/api/uploads', methods=['POST'])
+@login_required
+def create_upload():
+    limit_error = check_daily_upload_limit()
+    if limit_error:
+        return limit_error
+
+    data = request.get_json() or {}
+    filename = secure_filename(data.get('filename') or '')
+    size = data.get('size')
+    if not filename or not isinstance(size, int) or size < 0:
+        return jsonify({"status": "error", "message": "filename and a non-negative integer size are required."}), 400
+
+    upload_id = os.urandom(16).hex()
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{upload_id}_{filename}")
+    try:
+        session = create_upload_session(
+            redis_conn, upload_id, current_user.id, filename, filepath, size,
+            data.get('resolution', 'original'), data.get('language')
+        )
+    except UploadError as e:
+        return jsonify({"status": "error", "message": str(e)}), e.status_code
+    return jsonify({"status": "success", **upload_progress(redis_conn, upload_id, session)}), 201
+
+@app.route('/api/uploads/<upload_id>', methods=['GET'])
+@login_required
+def get_upload(upload_id):
+    try:
+        session = load_upload_session(redis_conn, upload_id, current_user.id)
+    except UploadError as e:
+        return jsonify({"status": "error", "message": str(e)}), e.status_code
+    return jsonify({"status": "success", **upload_progress(redis_conn, upload_id, session)})
+
+@app.route('/api/uploads/<upload_id>/chunks/<int:index>', methods=['PUT'])
+@login_required
+def put_upload_chunk(upload_id, index):
+    try:
+        session = load_upload_session(redis_conn, upload_id, current_user.id)
+        digest = write_chunk(redis_conn, upload_id, session, index, request.stream, request.content_length or 0)
+    except UploadError as e:
+        return jsonify({"status": "error", "message": str(e)}), e.status_code
+    return jsonify({"status": "success", "index": index, "sha256": digest})
+
+@app.route('/api/uploads/<upload_id>/complete', methods=['POST'])
+@login_required
+def complete_upload(upload_id):
+    try:
+        session = load_upload_session(redis_conn, upload_id, current_user.id)
+        content_hash = finish_upload_session(redis_conn, upload_id, session)
+    except UploadError as e:
+        return jsonify({"status": "error", "message": str(e)}), e.status_code
+
+    try:
+        return start_video_job(
+            session['filepath'], session['filename'], content_hash,
+            session['resolution'] or 'original', session['language'] or None
+        )
+    except Exception as e:
+        app.logger.error(f"An error occurred while finalizing upload {upload_id}: {e}")
+        if os.path.exists(session['filepath']):
+            os.remove(session['filepath'])
+        return jsonify({"status": "error", "message": f"An unexpected error occurred: {e}"}), 500
+
+@app.route('/api/uploads/<upload_id>', methods=['DELETE'])
+@login_required
+def abort_upload(upload_id):
+    try:
+        session = load_upload_session(redis_conn, upload_id, current_user.id)
+    except UploadError as e:
+        return jsonify({"status": "error", "message": str(e)}), e.status_code
+    abort_upload_session(redis_conn, upload_id, session)
+    return jsonify({"status": "success"})
+
+
+# Batch processing: many videos, one style template, one transaction
+MAX_BATCH_SIZE = 50
+BATCH_DONE_STATUSES = ('transcribed', 'editing', 'completed')
+
+@app.route('/api/batches', methods=['POST'])
+@login_required
+def create_batch():
+    """
+    Start processing many videos at once: either uploaded with this request
+    (multipart `videos`) or a manifest of finished /api/uploads sessions
+    (JSON `uploads`). Every video shares the batch's style template; with
+    `auto_export` each one is rendered as soon as it is transcribed.
+    """
+    data = (request.get_json(silent=True) or {}) if request.is_json else request.form
+    files = request.files.getlist('videos')
+    upload_ids = (data.get('uploads') or []) if request.is_json else []
+    count = len(files) + len(upload_ids)
+    if not count:
+        return jsonify({"status": "error", "message": "Send videos or a list of uploads."}), 400
+    if count > MAX_BATCH_SIZE:
+        return jsonify({"status": "error", "message": f"A batch holds at most {MAX_BATCH_SIZE} videos."}), 400
+    limit_error = check_daily_upload_limit(count)
+    if limit_error:
+        return limit_error
+    if any(not secure_filename(file.filename or '') for file in files):
+        return jsonify({"status": "error", "message": "Every video needs a filename."}), 400
+
+    style_template_id = data.get('style_template_id')
+    style_json = None
+    if style_template_id:
+        template = UserStyleTemplate.query.filter_by(id=style_template_id, user_id=current_user.id).first()
+        if not template:
+            return jsonify({"status": "error", "message": "Style template not found."}), 404
+        style_json = template.style_json
+
+    export_settings = data.get('export_settings') or {}
+    if isinstance(export_settings, str):
+        try:
+            export_settings = json.loads(export_settings)
+        except json.JSONDecodeError:
+            return jsonify({"status": "error", "message": "export_settings must be a JSON object."}), 400
+    resolution = data.get('resolution', 'original')
+    language = data.get('language') or None
+
+    # Check the whole manifest before consuming any of it
+    sessions = []
+    for upload_id in upload_ids:
+        try:
+            session = load_upload_session(redis_conn, upload_id, current_user.id)
+        except UploadError as e:
+            return jsonify({"status": "error", "message": f"Upload {upload_id}: {e}"}), e.status_code
+        if not upload_progress(redis_conn, upload_id, session)['complete']:
+            return jsonify({"status": "error", "message": f"Upload {upload_id} still has missing chunks."}), 409
+        sessions.append((upload_id, session))
+
+    batch = ProcessingBatch(
+        id=str(uuid.uuid4()),
+        user_id=current_user.id,
+        style_template_id=style_template_id or None,
+        style_json=style_json,
+        auto_export=str(data.get('auto_export', '')).lower() in ('1', 'true', 'yes', 'on'),
+        export_settings_json=json.dumps(export_settings)
+    )
+    db.session.add(batch)
+
+    written, prepared, jobs = [], [], []
+    reserved = 0
+
+    def discard_batch():
+        db.session.rollback()
+        if reserved:
+            refund_daily_tries(redis_conn, current_user.id, reserved)
+        for job_id, params in prepared:
+            delete_job_artifacts(redis_conn, job_id)
+            release_submission(redis_conn, params['dedup_key'], job_id)
+        for filepath in written:
+            if os.path.exists(filepath):
+                os.remove(filepath)
+
+    try:
+        items = []
+        for upload_id, session in sessions:
+            content_hash = finish_upload_session(redis_conn, upload_id, session)
+            written.append(session['filepath'])
+            items.append((session['filepath'], session['filename'], content_hash,
+                          session['resolution'] or resolution, session['language'] or language))
+        for file in files:
+            filename = secure_filename(file.filename)
+            filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{os.urandom(16).hex()}_{filename}")
+            written.append(filepath)
+            content_hash = save_upload_with_hash(file, filepath)
+            items.append((filepath, filename, content_hash, resolution, language))
+
+        for filepath, filename, content_hash, item_resolution, item_language in items:
+            job_id, job_entry, params = prepare_video_job(filepath, filename, content_hash, item_resolution, item_language, batch)
+            if job_entry is None:
+                jobs.append({"job_id": job_id, "filename": filename, "duplicate": True})
+                continue
+            db.session.add(job_entry)
+            prepared.append((job_id, params))
+            jobs.append({"job_id": job_id, "filename": filename})
+
+        # Every new job takes a try; duplicates are free. All of them fit or none are taken.
+        if prepared:
+            if not reserve_upload_tries(len(prepared)):
+                discard_batch()
+                return quota_exceeded_response()
+            reserved = len(prepared)
+
+        # The batch row and every job row land together or not at all
+        db.session.commit()
+    except Exception as e:
+        app.logger.error(f"An error occurred while creating batch {batch.id}: {e}")
+        discard_batch()
+        return jsonify({"status": "error", "message": f"An unexpected error occurred: {e}"}), 500
+
+    for job_id, params in prepared:
+        enqueue_video_job(job_id, params)
+    app.logger.info(f"Batch {batch.id} enqueued {len(prepared)} pipelines ({len(jobs) - len(prepared)} duplicates)")
+
+    return jsonify({
+        "status": "success",
+        "batch_id": batch.id,
+        "auto_export": batch.auto_export,
+        "jobs": jobs,
+        "progress_url": url_for('get_batch', batch_id=batch.id)
+    }), 201
+
+@app.route('/api/batches/<batch_id>')
+@login_required
+def get_batch(batch_id):
+    """Aggregated progress of a batch: transcription, then (with auto_export) rendering."""
+    batch = ProcessingBatch.query.filter_by(id=batch_id, user_id=current_user.id).first()
+    if not batch:
+        return jsonify({"status": "error", "message": "Batch not found."}), 404
+
+    # Only the columns needed here; the caption JSON columns stay in the database
+    rows = VideoProcessingJob.query.with_entities(
+        VideoProcessingJob.id, VideoProcessingJob.status, VideoProcessingJob.original_filename
+    ).filter_by(batch_id=batch_id).order_by(VideoProcessingJob.created_at).all()
+
+    export_ids, export_statuses = {}, {}
+    if batch.auto_export:
+        export_ids = {k.decode(): v.decode() for k, v in redis_conn.hgetall(batch_exports_key(batch_id)).items()}
+        if export_ids:
+            raw = redis_conn.mget([f"export_status:{export_id}" for export_id in export_ids.values()])
+            export_statuses = {export_id: json.loads(value) for export_id, value in zip(export_ids.values(), raw) if value}
+
+    jobs, done, failed, progress_sum = [], 0, 0, 0.0
+    for row in rows:
+        entry = {"job_id": row.id, "filename": row.original_filename, "status": row.status}
+        jobs.append(entry)
+        if row.status in ('failed', 'cancelled'):
+            failed += 1
+            progress_sum += 1
+        elif row.status not in BATCH_DONE_STATUSES:
+            pass # Still transcribing
+        elif not batch.auto_export:
+            done += 1
+            progress_sum += 1
+        else:
+            export_id = export_ids.get(row.id)
+            export = export_statuses.get(export_id) if export_id else None
+            if export is None and export_id and media_exists(os.path.join(app.config['UPLOAD_FOLDER'], f"{export_id}.mp4")):
+                # The status snapshot expired but the render is there
+                export = {"status": "completed", "progress": 100, "download_url": f"/uploads/{export_id}.mp4"}
+            if export:
+                entry["export"] = {"export_id": export_id, **{k: export.get(k) for k in ('status', 'progress', 'download_url')}}
+            export_state = export.get('status') if export else None
+            if export_state == 'completed':
+                done += 1
+                progress_sum += 1
+            elif export_state in ('failed', 'cancelled'):
+                failed += 1
+                progress_sum += 1
+            else:
+                # Transcription is the first half, rendering the second
+                progress_sum += 0.5 + (export.get('progress', 0) / 200 if export else 0)
+
+    total = len(rows)
+    finished = done + failed
+    return jsonify({
+        "status": "success",
+        "batch_id": batch_id,
+        "auto_export": batch.auto_export,
+        "batch_status": "processing" if finished < total else ("completed" if not failed else "completed_with_errors"),
+        "total": total,
+        "completed": done,
+        "failed": failed,
+        "in_progress": total - finished,
+        "progress": round(100 * progress_sum / total, 1) if total else 100.0,
+        "jobs": jobs
+    })
+
+# Job history: newest first, keyset-paginated on (created_at, id) so a page
+# deep into thousands of jobs costs the same as the first one
+JOB_HISTORY_PAGE_SIZE = 50
+JOB_HISTORY_MAX_PAGE_SIZE = 200
+JOB_HISTORY_COLUMNS = ('id', 'status', 'original_filename', 'created_at', 'updated_at', 'resolution', 'language', 'batch_id')
+
+def encode_history_cursor(created_at, job_id):
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{job_id}".encode()).decode().rstrip('=')
+
+def decode_history_cursor(cursor):
+    raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+    created_at, job_id = raw.split('|', 1)
+    return datetime.fromisoformat(created_at), job_id
+
+def job_history_statement(user_id, statuses=None, since=None, until=None, cursor=None, limit=JOB_HISTORY_PAGE_SIZE):
+    """
+    One page of a user's jobs, served entirely by the (user_id[, status],
+    created_at, id) indexes. Selects only the listing columns, never captions.
+    Fetches limit + 1 rows so the caller can tell whether another page exists.
+    """
+    columns = [getattr(VideoProcessingJob, name) for name in JOB_HISTORY_COLUMNS]
+    stmt = db.select(*columns).where(VideoProcessingJob.user_id == user_id)
+    if statuses:
+        stmt = stmt.where(VideoProcessingJob.status.in_(statuses))
+    if since:
+        stmt = stmt.where(VideoProcessingJob.created_at >= since)
+    if until:
+        stmt = stmt.where(VideoProcessingJob.created_at < until)
+    if cursor:
+        stmt = stmt.where(tuple_(VideoProcessingJob.created_at, VideoProcessingJob.id) < tuple_(*cursor))
+    return stmt.order_by(VideoProcessingJob.created_at.desc(), VideoProcessingJob.id.desc()).limit(limit + 1)
+
+TRANSCRIPT_SEARCH_PAGE_SIZE = 20
+TRANSCRIPT_SEARCH_MAX_PAGE_SIZE = 100
+
+@app.route('/api/jobs')
+@login_required
+def list_jobs():
+    """
+    The current user's jobs, newest first. Filters: ?status= (comma-separated),
+    ?since= / ?until= (ISO dates or datetimes, UTC), ?limit=. Pass the returned
+    next_cursor as ?cursor= for the following page.
+    """
+    statuses = [status for status in request.args.get('status', '').split(',') if status]
+    limit = min(max(request.args.get('limit', JOB_HISTORY_PAGE_SIZE, type=int), 1), JOB_HISTORY_MAX_PAGE_SIZE)
+    try:
+        since = datetime.fromisoformat(request.args['since']) if request.args.get('since') else None
+        until = datetime.fromisoformat(request.args['until']) if request.args.get('until') else None
+        cursor = decode_history_cursor(request.args['cursor']) if request.args.get('cursor') else None
+    except (ValueError, UnicodeDecodeError):
+        return jsonify({"status": "error", "message": "Invalid since, until or cursor."}), 400
+
+    rows = db.session.execute(job_history_statement(current_user.id, statuses, since, until, cursor, limit)).all()
+    page = rows[:limit]
+    next_cursor = encode_history_cursor(page[-1].created_at, page[-1].id) if len(rows) > limit else None
+    return jsonify({
+        "status": "success",
+        "jobs": [{
+            "job_id": row.id,
+            "status": row.status,
+            "filename": row.original_filename,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+            "resolution": row.resolution,
+            "language": row.language,
+            "batch_id": row.batch_id,
+            "editor_url": url_for('edit_video', job_id=row.id) if row.status in ('transcribed', 'editing') else None
+        } for row in page],
+        "next_cursor": next_cursor
+    })
+
+@app.route('/api/search')
+@login_required
+def search_jobs():
+    """
+    Full-text search over the current user's transcripts: ?q=, ?limit=.
+    Each hit names the job and segment and carries the matching words with
+    their timestamps, so the editor can seek straight to them.
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"status": "error", "message": "Missing search query."}), 400
+    limit = min(max(request.args.get('limit', TRANSCRIPT_SEARCH_PAGE_SIZE, type=int), 1), TRANSCRIPT_SEARCH_MAX_PAGE_SIZE)
+    try:
+        hits = search_transcripts(db.session, current_user.id, query, limit=limit)
+    except SearchUnavailable as e:
+        return jsonify({"status": "error", "message": str(e)}), 501
+
+    filenames = dict(
+        db.session.query(VideoProcessingJob.id, VideoProcessingJob.original_filename)
+        .filter(VideoProcessingJob.id.in_({hit['job_id'] for hit in hits})).all()
+    ) if hits else {}
+    for hit in hits:
+        hit["filename"] = filenames.get(hit["job_id"])
+        hit["editor_url"] = url_for('edit_video', job_id=hit["job_id"])
+    return jsonify({"status": "success", "query": query, "results": hits})
+
+# Uploads (random hex prefix), exports (content-fingerprinted id), preview
+# proxies and thumbnail sprites (published once, atomically) are never
+# rewritten under the same name, so browsers may cache them forever.
+IMMUTABLE_MEDIA_PATTERN = re.compile(r'^(export_[\w-]+\.mp4|proxy_[\w-]+\.mp4|sprite_\d+s_\d+\.jpg|[0-9a-f]{32}_.+)$')
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+def serve_media(directory, filename):
+    """
+    Serve a media file with byte ranges (206), a strong ETag and
+    If-None-Match / If-Modified-Since handling. If MEDIA_ACCEL_REDIRECT_PREFIX
+    is set, the bytes are handed to nginx via X-Accel-Redirect; with
+    USE_X_SENDFILE, Flask emits X-Sendfile. Either way no Python worker
+    streams the file.
+    """
+    filepath = safe_join(os.path.abspath(directory), filename)
+    if filepath is None:
+        abort(404)
+    if storage.remote and not os.path.isfile(filepath):
+        # Not on this node: the browser fetches it straight from the object store
+        if not storage.exists(filename):
+            abort(404)
+        touch_artifact(redis_conn, filename)
+        return redirect(storage.presigned_url(filename))
+    if not os.path.isfile(filepath):
+        abort(404)
+    # Keeps files people are still watching at the back of the eviction queue
+    touch_artifact(redis_conn, filename)
+
+    immutable = bool(IMMUTABLE_MEDIA_PATTERN.match(os.path.basename(filename)))
+    cache_control = f"private, max-age={IMMUTABLE_MAX_AGE}, immutable" if immutable else "private, no-cache"
+
+    accel_prefix = app.config.get('MEDIA_ACCEL_REDIRECT_PREFIX')
+    if accel_prefix:
+        # nginx serves the internal location itself, including Range and conditional requests
+        response = make_response('')
+        response.headers['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{filename}"
+        response.headers['Content-Type'] = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        response.headers['Cache-Control'] = cache_control
+        return response
+
+    stat = os.stat(filepath)
+    response = send_file(
+        filepath,
+        conditional=True, # Range/206, If-None-Match, If-Modified-Since, If-Range
+        etag=f"{stat.st_ino:x}-{stat.st_size:x}-{stat.st_mtime_ns:x}",
+        last_modified=stat.st_mtime,
+        max_age=IMMUTABLE_MAX_AGE if immutable else 0
+    )
+    response.headers['Cache-Control'] = cache_control
+    return response
 
 @app.route('/download/<filename>')
 def download_file(filename):
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    return serve_media(app.config['UPLOAD_FOLDER'], filename)
+
+@app.route('/storage/<path:key>')
+def serve_presigned(key):
+    """Presigned URLs handed out by LocalStorage; the signature stands in for a login."""
+    if storage.remote or not storage.verify_presigned(key, request.args.get('expires'), request.args.get('signature')):
+        abort(403)
+    return serve_media(app.config['UPLOAD_FOLDER'], key)
 
 @app.route('/api/job_status/<job_id>')
 @login_required
@@ -1122,13 +2050,20 @@ def job_status(job_id):
     if not job_entry:
         return jsonify({"status": "error", "message": "Job not found or unauthorized access."}), 404
 
-    # Fetch real-time status from RQ for jobs that are still processing
+    # Fetch real-time status from RQ for jobs that are still processing.
+    # Jobs uploaded before the pipeline existed are a single RQ job keyed by job_id.
     rq_job = q.fetch_job(job_id)
-    rq_status = rq_job.get_status() if rq_job else 'unknown' # Get status from RQ, fallback to unknown
+    if rq_job:
+        rq_status, rq_stage = rq_job.get_status(), None
+    else:
+        rq_status, rq_stage = pipeline_status(q, job_id, pipeline_stages(pipeline_params(q, job_id)))
+        failed_stage = q.fetch_job(stage_job_id(job_id, rq_stage)) if rq_status == 'failed' else None
+        if failed_stage:
+            rq_job = failed_stage
 
     # Prefer DB status for 'transcribed', 'burning', 'completed', 'failed' states
     # Use RQ status for 'queued', 'started', 'deferred'
-    if job_entry.status in ['transcribed', 'burning', 'completed', 'failed', 'editing']:
+    if job_entry.status in ['transcribed', 'burning', 'completed', 'failed', 'editing', 'cancelled']:
         status_to_report = job_entry.status
     else:
         status_to_report = rq_status
@@ -1141,7 +2076,7 @@ def job_status(job_id):
             "redirect_url": url_for('edit_video', job_id=job_id)
         })
     elif status_to_report == 'completed':
-        if job_entry.output_video_filepath and os.path.exists(job_entry.output_video_filepath):
+        if media_exists(job_entry.output_video_filepath):
             return jsonify({
                 "status": "completed",
                 "result": {"video_url": url_for('download_file', filename=os.path.basename(job_entry.output_video_filepath))},
@@ -1163,12 +2098,57 @@ def job_status(job_id):
             "error": error_message,
             "progress_message": "Processing failed."
         })
+    elif status_to_report == 'cancelled':
+        return jsonify({
+            "status": "cancelled",
+            "progress_message": "Processing was cancelled."
+        })
     else: # pending, started, deferred, unknown, etc.
+        progress_message = f"Job is currently {status_to_report}."
+        if rq_stage:
+            progress_message = f"Job is currently {status_to_report} ({rq_stage.replace('_', ' ')})."
         return jsonify({
             "status": status_to_report,
-            "progress_message": f"Job is currently {status_to_report}."
+            "stage": rq_stage,
+            "progress_message": progress_message
         })
 
+@app.route('/api/job_cancel/<job_id>', methods=['POST'])
+@login_required
+def cancel_job(job_id):
+    job_entry = VideoProcessingJob.query.filter_by(id=job_id, user_id=current_user.id).first()
+
+    if not job_entry:
+        return jsonify({"status": "error", "message": "Job not found or unauthorized access."}), 404
+
+    if job_entry.status not in ['pending']:
+        return jsonify({"status": "error", "message": f"Job can no longer be cancelled (current status: {job_entry.status})."}), 409
+
+    # Running stages watch this flag, kill their ffmpeg process group / stop the
+    # Whisper segment loop and clean up after themselves.
+    request_cancel(redis_conn, job_id)
+
+    legacy_job = q.fetch_job(job_id)
+    params = pipeline_params(q, job_id)
+    if legacy_job:
+        still_running = legacy_job.get_status() == 'started'
+        if not still_running:
+            legacy_job.cancel()
+    else:
+        still_running = cancel_pipeline(q, job_id, pipeline_stages(params))
+        # A batch job's auto_export stage may already have handed off to the exports queue
+        cancel_auto_export(redis_conn, job_id, params)
+
+    job_entry.status = 'cancelled'
+    db.session.commit()
+
+    if not still_running:
+        # Nothing picked the job up yet, so nobody else will clean up after it
+        discard_cancelled_job(redis_conn, job_id, job_entry.original_video_filepath, params)
+
+    app.logger.info(f"Cancellation requested for job {job_id} (still running: {still_running})")
+    return jsonify({"status": "cancelled", "job_id": job_id})
+
 @app.route('/api/editor_data/<job_id>')
 @login_required
 def get_editor_data(job_id):
@@ -1183,33 +2163,161 @@ def get_editor_data(job_id):
     video_url = url_for('download_file', filename=os.path.basename(job_entry.original_video_filepath))
     app.logger.info(f"Generated video_url for job {job_id}: {video_url}")
     
+    # The editor plays the low-res proxy once it exists; exports keep using the original
+    preview_url = None
+    if media_exists(job_entry.preview_proxy_filepath):
+        preview_url = url_for('download_file', filename=os.path.basename(job_entry.preview_proxy_filepath))
+    
     # Now we fetch word-level captions directly from the DB
-    word_level_captions = []
-    if job_entry.word_level_captions_json:
-        try:
-            word_level_captions = json.loads(job_entry.word_level_captions_json)
-        except json.JSONDecodeError:
-            app.logger.error(f"Failed to decode word_level_captions_json for job {job_id}")
-            return jsonify({"status": "error", "message": "Failed to load word-level captions."}), 500
-    else:
-        app.logger.warning(f"No word_level_captions_json for job {job_id}. This should not happen in new flow.")
-        # If no word-level data, try to fall back to old SRT if it exists and parse it.
-        # For now, we assume word_level_captions_json will always be present for new jobs.
+    # ?start=&end= (seconds) limits them to one window of a long video
+    if not job_entry.has_captions():
+        app.logger.warning(f"No word-level captions for job {job_id}. This should not happen in new flow.")
         return jsonify({"status": "error", "message": "Word-level captions not available."}), 404
+    try:
+        word_level_captions = job_entry.get_captions(
+            start=request.args.get('start', type=float),
+            end=request.args.get('end', type=float)
+        )
+    except (ValueError, json.JSONDecodeError):
+        app.logger.error(f"Failed to decode word-level captions for job {job_id}")
+        return jsonify({"status": "error", "message": "Failed to load word-level captions."}), 500
 
     job_entry.status = 'editing' # Update status to indicate it's being edited
     db.session.commit()
+    touch_job_artifacts(redis_conn, job_id)
 
     return jsonify({
         "status": "success",
         "job_id": job_id,
         "video_url": video_url,
+        "preview_url": preview_url,
+        "thumbnails_url": url_for('get_editor_thumbnails', job_id=job_id) if media_exists(os.path.join(sprites_dir(job_id), 'index.json')) else None,
+        "waveform_url": url_for('get_editor_waveform', job_id=job_id) if media_exists(waveform_path(job_id)) else None,
         "captions": word_level_captions, # New: directly provide parsed captions
+        "captions_version": job_entry.captions_version, # Base version for PATCH /captions and exports
+        "zoom_effects": json.loads(job_entry.zoom_effects_json) if job_entry.zoom_effects_json else [],
+        "sound_effects": json.loads(job_entry.sound_effects_json) if job_entry.sound_effects_json else [],
+        "style": json.loads(job_entry.batch.style_json) if job_entry.batch and job_entry.batch.style_json else None, # Batch style template
         "original_filename": job_entry.original_filename,
         "resolution": job_entry.resolution,
         "language": job_entry.language
     })
 
+@app.route('/api/editor_data/<job_id>/captions', methods=['PATCH'])
+@login_required
+def patch_captions(job_id):
+    """Apply caption edit ops on top of the version the editor last saw."""
+    data = request.get_json() or {}
+    base_version = data.get('version')
+    ops = data.get('ops')
+    if not isinstance(base_version, int) or not isinstance(ops, list):
+        return jsonify({"status": "error", "message": "Expected a base version and a list of ops."}), 400
+
+    job_entry = VideoProcessingJob.query.filter_by(id=job_id, user_id=current_user.id).first()
+    if not job_entry:
+        return jsonify({"status": "error", "message": "Job not found or unauthorized."}), 404
+    if not job_entry.has_captions():
+        return jsonify({"status": "error", "message": "Word-level captions not available."}), 404
+    if base_version != job_entry.captions_version:
+        return jsonify({"status": "error", "message": "Captions were changed elsewhere, reload them.", "version": job_entry.captions_version}), 409
+
+    try:
+        captions = apply_caption_ops(job_entry.get_captions(), ops)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    # Compare-and-set: if another patch landed on the same base version since
+    # the check above, this matches no row and the editor has to rebase
+    updated = VideoProcessingJob.query.filter_by(id=job_id, captions_version=base_version).update({
+        VideoProcessingJob.word_level_captions_blob: encode_captions(captions),
+        VideoProcessingJob.word_level_captions_json: None,
+        VideoProcessingJob.captions_version: base_version + 1
+    }, synchronize_session=False)
+    if updated:
+        # Only the segments the ops touched are re-indexed, in the same transaction
+        touched = {op['segment']['id'] if op.get('op') == 'insert_segment' else op.get('id') for op in ops}
+        index_transcript(db.session, job_id, job_entry.user_id, captions, segment_ids=touched)
+    db.session.commit()
+    if not updated:
+        return jsonify({"status": "error", "message": "Captions were changed elsewhere, reload them.", "version": job_entry.captions_version}), 409
+    return jsonify({"status": "success", "version": base_version + 1})
+
+@app.route('/api/editor_data/<job_id>/thumbnails')
+@login_required
+def get_editor_thumbnails(job_id):
+    """Sprite sheet index for the timeline; sheets themselves are served from /uploads."""
+    job_entry = VideoProcessingJob.query.filter_by(id=job_id, user_id=current_user.id).first()
+    if not job_entry:
+        return jsonify({"status": "error", "message": "Job not found or unauthorized."}), 404
+
+    index_path = os.path.join(sprites_dir(job_id), 'index.json')
+    if not media_exists(index_path):
+        return jsonify({"status": "error", "message": "Thumbnails not available."}), 404
+
+    with open(storage.local_path(media_key(index_path)), encoding='utf-8') as f:
+        index = json.load(f)
+    index["base_url"] = url_for('serve_upload', filename=f"sprites/{job_id}/")
+
+    response = jsonify({"status": "success", **index})
+    response.headers['Cache-Control'] = f"private, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    return response
+
+@app.route('/api/editor_data/<job_id>/waveform')
+@login_required
+def get_editor_waveform(job_id):
+    """Waveform peak levels available for the timeline."""
+    job_entry = VideoProcessingJob.query.filter_by(id=job_id, user_id=current_user.id).first()
+    if not job_entry:
+        return jsonify({"status": "error", "message": "Job not found or unauthorized."}), 404
+
+    peaks_path = waveform_path(job_id)
+    if not media_exists(peaks_path):
+        return jsonify({"status": "error", "message": "Waveform not available."}), 404
+    # Peaks are memory-mapped, so remote storage goes through this node's read-through cache
+    peaks_path = storage.local_path(media_key(peaks_path))
+
+    from waveform import read_peaks_header
+    header = read_peaks_header(peaks_path)
+    for i, level in enumerate(header["levels"]):
+        level.pop("offset")
+        level["url"] = url_for('get_editor_waveform_window', job_id=job_id, level=i)
+    response = jsonify({"status": "success", **header})
+    response.headers['Cache-Control'] = f"private, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    return response
+
+@app.route('/api/editor_data/<job_id>/waveform/<int:level>')
+@login_required
+def get_editor_waveform_window(job_id, level):
+    """
+    Raw int8 [min, max] peak pairs of one level, optionally limited to the
+    ?start=&end= window in seconds, so the timeline only fetches what is on screen.
+    """
+    job_entry = VideoProcessingJob.query.filter_by(id=job_id, user_id=current_user.id).first()
+    if not job_entry:
+        return jsonify({"status": "error", "message": "Job not found or unauthorized."}), 404
+
+    peaks_path = waveform_path(job_id)
+    if not media_exists(peaks_path):
+        return jsonify({"status": "error", "message": "Waveform not available."}), 404
+    # Peaks are memory-mapped, so remote storage goes through this node's read-through cache
+    peaks_path = storage.local_path(media_key(peaks_path))
+
+    from waveform import read_peaks_window
+    try:
+        first_index, data = read_peaks_window(
+            peaks_path, level,
+            request.args.get('start', 0.0, type=float),
+            request.args.get('end', None, type=float)
+        )
+    except IndexError:
+        return jsonify({"status": "error", "message": f"Unknown waveform level {level}."}), 404
+
+    response = make_response(data)
+    response.headers['Content-Type'] = 'application/octet-stream'
+    response.headers['X-Waveform-Start-Index'] = str(first_index)
+    response.headers['Cache-Control'] = f"private, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    return response
+
 @app.route('/edit/<job_id>')
 @login_required
 def edit_video(job_id):
@@ -1224,7 +2332,7 @@ def edit_video(job_id):
         return redirect(url_for('index'))
 
     # Check if word-level captions exist in database
-    if not job_entry.word_level_captions_json:
+    if not job_entry.has_captions():
         flash('Transcription data not found.', 'error')
         return redirect(url_for('index'))
 
@@ -1256,27 +2364,45 @@ def save_and_burn():
     data = request.get_json()
     job_id = data.get('job_id')
     srt_content = data.get('srt_content')
+    caption_version = data.get('caption_version') # Burn the saved captions instead of an uploaded SRT
     positional_data = data.get('positional_data') # Not directly used for burning, but good to store if needed later
     resolution = data.get('resolution')
     # language = data.get('language') # Language is already stored in VideoProcessingJob or passed to transcribe_video_task
 
-    if not all([job_id, srt_content, resolution]):
+    if not all([job_id, srt_content or caption_version is not None, resolution]):
         return jsonify({"status": "error", "message": "Missing required data."}), 400
 
     job_entry = VideoProcessingJob.query.filter_by(id=job_id, user_id=current_user.id).first()
 
     if not job_entry:
         return jsonify({"status": "error", "message": "Job not found or unauthorized."}), 404
+
+    if not srt_content:
+        if caption_version != job_entry.captions_version:
+            return jsonify({"status": "error", "message": "Captions were changed elsewhere, reload them.", "version": job_entry.captions_version}), 409
+        srt_content = captions_to_srt(job_entry.get_captions())
     
+    # A repeated click while the burn is queued or running attaches to it
+    if job_entry.status == 'burning':
+        return jsonify({"status": "success", "job_id": job_id, "duplicate": True, "message": "Burning process already started."})
+
     # Ensure the job is in a state that allows saving/burning
     if job_entry.status not in ['transcribed', 'editing']:
         return jsonify({"status": "error", "message": f"Job is not in a state to be edited or burned ({job_entry.status})."}), 400
 
+    # Two concurrent requests can both see 'editing'; only one of them may enqueue the burn.
+    # burn_subtitles_task releases the claim when the burn ends.
+    burn_claim = submission_key('burn', current_user.id, job_id)
+    if claim_submission(redis_conn, burn_claim, job_id):
+        return jsonify({"status": "success", "job_id": job_id, "duplicate": True, "message": "Burning process already started."})
+
     try:
         # Overwrite the generated SRT file with the edited content
         edited_srt_filepath = job_entry.generated_srt_filepath # Use the same file for now
         with open(edited_srt_filepath, "w", encoding="utf-8") as f:
             f.write(srt_content)
+        # The burn may run on another node; publish the SRT like the original
+        storage.put(media_key(edited_srt_filepath), edited_srt_filepath)
         
         # Store subtitle position if provided
         if positional_data:
@@ -1287,6 +2413,8 @@ def save_and_burn():
         job_entry.status = 'burning'
         db.session.commit()
 
+        # Retention and the disk quota leave the job's files alone until the burn ends
+        begin_job_work(redis_conn, job_id, 'burn')
         # Enqueue the burn_subtitles_task - pass the original job_id to update the correct entry
         burn_job = q.enqueue(
             'app.burn_subtitles_task',
@@ -1304,6 +2432,8 @@ def save_and_burn():
 
     except Exception as e:
         app.logger.error(f"Error saving edited SRT and enqueuing burn task for job {job_id}: {e}")
+        end_job_work(redis_conn, job_id, 'burn')
+        release_submission(redis_conn, burn_claim, job_id)
         job_entry.status = 'failed'
         db.session.commit()
         return jsonify({"status": "error", "message": f"Failed to save and burn subtitles: {e}"}), 500
@@ -1315,227 +2445,93 @@ def add_csp_header(response):
     response.headers['Content-Security-Policy'] = csp
     return response
 
-# Auto-create database tables before first request (for Railway deployment)
-@app.before_request
-def create_tables():
-    create_tables.has_run = getattr(create_tables, 'has_run', False)
-    if not create_tables.has_run:
-        try:
-            db.create_all()
-            app.logger.info("Database tables created successfully")
-            
-            # Migration: Add subtitle_pos_x and subtitle_pos_y columns if they don't exist
-            # This handles upgrading existing databases
-            try:
-                from sqlalchemy import inspect
-                inspector = inspect(db.engine)
-                columns = [col['name'] for col in inspector.get_columns('video_processing_job')]
-                
-                if 'subtitle_pos_x' not in columns:
-                    with db.engine.connect() as conn:
-                        conn.execute(db.text("ALTER TABLE video_processing_job ADD COLUMN subtitle_pos_x FLOAT DEFAULT 50.0"))
-                        conn.commit()
-                        app.logger.info("Added subtitle_pos_x column")
-                
-                if 'subtitle_pos_y' not in columns:
-                    with db.engine.connect() as conn:
-                        conn.execute(db.text("ALTER TABLE video_processing_job ADD COLUMN subtitle_pos_y FLOAT DEFAULT 15.0"))
-                        conn.commit()
-                        app.logger.info("Added subtitle_pos_y column")
-                
-                # Add new JSON columns for enhanced features
-                if 'word_level_captions_json' not in columns:
-                    with db.engine.connect() as conn:
-                        conn.execute(db.text("ALTER TABLE video_processing_job ADD COLUMN word_level_captions_json TEXT"))
-                        conn.commit()
-                        app.logger.info("Added word_level_captions_json column")
-                
-                if 'zoom_effects_json' not in columns:
-                    with db.engine.connect() as conn:
-                        conn.execute(db.text("ALTER TABLE video_processing_job ADD COLUMN zoom_effects_json TEXT"))
-                        conn.commit()
-                        app.logger.info("Added zoom_effects_json column")
-                
-                if 'sound_effects_json' not in columns:
-                    with db.engine.connect() as conn:
-                        conn.execute(db.text("ALTER TABLE video_processing_job ADD COLUMN sound_effects_json TEXT"))
-                        conn.commit()
-                        app.logger.info("Added sound_effects_json column")
-                        
-            except Exception as migration_error:
-                app.logger.warning(f"Migration warning (may already exist): {migration_error}")
-            
-            # Migration: Add subscription_tier to user table and remove old columns
-            try:
-                from sqlalchemy import inspect
-                inspector = inspect(db.engine)
-                user_columns = [col['name'] for col in inspector.get_columns('user')]
-                
-                # Add subscription_tier if it doesn't exist
-                if 'subscription_tier' not in user_columns:
-                    with db.engine.connect() as conn:
-                        conn.execute(db.text("ALTER TABLE \"user\" ADD COLUMN subscription_tier VARCHAR(50) DEFAULT 'free'"))
-                        conn.commit()
-                        app.logger.info("Added subscription_tier column to user table")
-                
-                # Set default values for existing users
-                with db.engine.connect() as conn:
-                    conn.execute(db.text("UPDATE \"user\" SET subscription_tier = 'free' WHERE subscription_tier IS NULL"))
-                    conn.commit()
-                    
-            except Exception as migration_error:
-                app.logger.warning(f"User table migration warning: {migration_error}")
-                
-        except Exception as e:
-            app.logger.error(f"Error creating database tables: {e}")
-        create_tables.has_run = True
-
 # Enhanced API Endpoints for Submagic-Style Editor
 
 @app.route('/api/ai/generate', methods=['POST'])
 @login_required
 def generate_ai_content():
-    """Generate viral hooks, descriptions, and hashtags using GPT-4o"""
+    """Generate viral hooks, descriptions, and hashtags using GPT-4o (see run_upstream_task)"""
     data = request.get_json()
     transcript = data.get('transcript', '')
     
     if not transcript:
         return jsonify({"error": "Transcript required"}), 400
     
-    try:
-        import openai
-        openai.api_key = os.environ.get('OPENAI_API_KEY')
-        
-        if not openai.api_key:
-            # Fallback mock data if no API key
-            return jsonify({
-                "hooks": [
-                    "You won't believe what happens next...",
-                    "This changed everything for me",
-                    "Stop doing this mistake right now"
-                ],
-                "descriptions": [
-                    f"An amazing video about: {transcript[:100]}..."
-                ],
-                "hashtags": ["#viral", "#trending", "#fyp", "#contentcreator", "#video"]
-            })
-        
-        response = openai.ChatCompletion.create(
-            model="gpt-4o",
-            messages=[{
-                "role": "system",
-                "content": "You are a viral content strategist. Generate engaging hooks, descriptions, and hashtags."
-            }, {
-                "role": "user",
-                "content": f"Based on this transcript, generate:\n1. Three viral hook ideas\n2. One compelling description\n3. Ten relevant hashtags\n\nTranscript: {transcript[:2000]}"
-            }]
-        )
-        
-        content = response.choices[0].message.content
-        
-        # Parse the response
-        lines = content.split('\n')
-        hooks = [l.strip('- ') for l in lines if l.strip().startswith('-') or l.strip().startswith('1.') or l.strip().startswith('2.') or l.strip().startswith('3.')][:3]
-        description = next((l for l in lines if 'description' in l.lower() or len(l) > 50), transcript[:150])
-        hashtags = [tag.strip() for tag in content.split() if tag.startswith('#')][:10]
-        
-        return jsonify({
-            "hooks": hooks if hooks else ["Amazing content!", "Don't miss this", "Watch till the end"],
-            "descriptions": [description],
-            "hashtags": hashtags if hashtags else ["#viral", "#trending"]
-        })
-        
-    except Exception as e:
-        app.logger.error(f"AI generation error: {e}")
-        return jsonify({
-            "hooks": ["Amazing content!", "Don't miss this", "Watch till the end"],
-            "descriptions": [transcript[:150] + "..."],
-            "hashtags": ["#viral", "#trending", "#fyp"]
-        })
+    return run_upstream_task('upstream.generate_ai_content', transcript)
 
 @app.route('/api/broll/search')
 @login_required
 def search_broll():
-    """Search for B-roll footage from Pexels/Pixabay"""
+    """Search for B-roll footage from Pexels/Pixabay (see run_upstream_task; cached searches answer at once)"""
     query = request.args.get('q', '')
     
     if not query:
         return jsonify({"results": []})
     
-    results = []
-    
-    # Try Pexels API
-    pexels_key = os.environ.get('PEXELS_API_KEY')
-    if pexels_key:
-        try:
-            response = requests.get(
-                'https://api.pexels.com/videos/search',
-                headers={'Authorization': pexels_key},
-                params={'query': query, 'per_page': 8, 'orientation': 'portrait'}
-            )
-            if response.status_code == 200:
-                data = response.json()
-                for video in data.get('videos', []):
-                    video_files = video.get('video_files', [])
-                    if video_files:
-                        results.append({
-                            'id': str(video['id']),
-                            'video_url': video_files[0]['link'],
-                            'thumbnail': video['image'],
-                            'source': 'pexels',
-                            'duration': video.get('duration', 15)
-                        })
-        except Exception as e:
-            app.logger.error(f"Pexels search error: {e}")
-    
-    # Try Pixabay API as fallback
-    pixabay_key = os.environ.get('PIXABAY_API_KEY')
-    if pixabay_key and len(results) < 5:
-        try:
-            response = requests.get(
-                'https://pixabay.com/api/videos/',
-                params={
-                    'key': pixabay_key,
-                    'q': query,
-                    'per_page': 8 - len(results),
-                    'orientation': 'vertical'
-                }
-            )
-            if response.status_code == 200:
-                data = response.json()
-                for video in data.get('hits', []):
-                    results.append({
-                        'id': str(video['id']),
-                        'video_url': video['videos']['medium']['url'],
-                        'thumbnail': video['videos']['medium']['thumbnail'],
-                        'source': 'pixabay',
-                        'duration': video.get('duration', 15)
-                    })
-        except Exception as e:
-            app.logger.error(f"Pixabay search error: {e}")
-    
-    # Return mock data if no APIs available
-    if not results:
-        results = [
-            {
-                'id': 'mock1',
-                'video_url': 'https://example.com/video1.mp4',
-                'thumbnail': f'https://source.unsplash.com/300x500/?{query},nature',
-                'source': 'pexels',
-                'duration': 10
-            },
-            {
-                'id': 'mock2',
-                'video_url': 'https://example.com/video2.mp4',
-                'thumbnail': f'https://source.unsplash.com/300x500/?{query},city',
-                'source': 'pixabay',
-                'duration': 15
-            }
-        ]
-    
-    return jsonify({"results": results[:8]})
+    cached = cached_stock_search(redis_conn, query)
+    if cached is not None:
+        return jsonify({"results": cached})
+    return run_upstream_task('upstream.search_stock_videos', query, result_key='results')
+
+# Word-level transcription runs inference, so it waits on the default queue with uploads
+WORD_LEVEL_TASK_TIMEOUT = '1h'
+
+def run_upstream_task(func_path, *args, result_key=None):
+    """
+    Run an upstream call (see upstream.py) for the current user: queued, with a
+    task handle (202) to poll. Scripts that cannot poll may send
+    `Prefer: wait=<seconds>` to get the result inline instead, holding a web
+    worker for up to the upstream timeouts.
+    """
+    if not re.search(r'(^|[,;\s])wait=', request.headers.get('Prefer', '')):
+        return enqueue_user_task(func_path, *args, result_key=result_key)
+    from rq.utils import import_attribute
+    result = import_attribute(func_path)(*args)
+    return jsonify({result_key: result} if result_key else result)
+
+def enqueue_user_task(func_path, *args, queue_name=INTERACTIVE_QUEUE, timeout=TASK_TIMEOUT_SECONDS, result_key=None, task_id=None):
+    """
+    Queue work for the current user and answer 202 with a handle; the client
+    polls status_url. The finished result is returned as is, or under
+    `result_key` when the endpoint always wrapped it in an object.
+    """
+    task = Queue(queue_name, connection=redis_conn).enqueue(
+        func_path,
+        *args,
+        job_id=task_id,
+        meta={"user_id": current_user.id, "result_key": result_key},
+        job_timeout=timeout,
+        result_ttl=TASK_RESULT_TTL_SECONDS,
+        failure_ttl=TASK_RESULT_TTL_SECONDS
+    )
+    return jsonify({
+        "status": "queued",
+        "task_id": task.id,
+        "status_url": url_for('get_task_status', task_id=task.id)
+    }), 202
 
-import requests # Needed for making HTTP requests to external APIs
+@app.route('/api/tasks/<task_id>')
+@login_required
+def get_task_status(task_id):
+    """Status of a queued user task; carries its result once finished."""
+    from rq.job import Job
+    from rq.exceptions import NoSuchJobError
+
+    try:
+        task = Job.fetch(task_id, connection=redis_conn)
+    except NoSuchJobError:
+        task = None
+    if not task or task.meta.get("user_id") != current_user.id:
+        return jsonify({"status": "error", "message": "Task not found or expired."}), 404
+
+    status = task.get_status()
+    if status == 'finished':
+        result_key = task.meta.get("result_key")
+        result = {result_key: task.result} if result_key else task.result
+        return jsonify({"status": "finished", "task_id": task_id, "result": result})
+    if status in ('failed', 'stopped', 'canceled'):
+        return jsonify({"status": "failed", "task_id": task_id, "message": "The request could not be completed, try again."})
+    return jsonify({"status": status, "task_id": task_id})
 
 EMOJI_MAP = {
     "love": "❤️", "heart": "❤️", "happy": "😊", "smile": "😊", "joy": "😂",
@@ -1550,6 +2546,9 @@ EMOJI_MAP = {
     "down": "⬇️", "left": "⬅️", "right": "➡️"
 }
 
+# Common words that never make useful keywords for B-roll search or auto effects
+KEYWORD_STOP_WORDS = ['the', 'and', 'for', 'that', 'with', 'this', 'have', 'from', 'they', 'about', 'just', 'like', 'what', 'your', 'when', 'all', 'out', 'one', 'get', 'you', 'can', 'not', 'but', 'how', 'want', 'don', 't', 'know', 'go', 'do', 'if', 'up', 'down', 'in', 'out', 'on', 'off', 'as', 'at', 'by', 'be', 'so', 'to', 'a', 'an', 'is', 'it', 'we', 'he', 'she', 'they', 'me', 'him', 'her', 'us', 'them']
+
 @app.route('/api/ai/generate_emojis', methods=['POST'])
 @login_required
 def generate_emojis():
@@ -1578,59 +2577,24 @@ def generate_emojis():
 @app.route('/api/ai/generate_broll', methods=['POST'])
 @login_required
 def generate_broll():
-    """Analyzes captions to generate B-roll suggestions from stock video APIs."""
+    """Analyzes captions to generate B-roll suggestions from stock video APIs (see run_upstream_task)."""
     data = request.get_json()
     captions = data.get('captions', [])
 
     if not captions:
         return jsonify({"error": "Captions required"}), 400
 
-    # Extract keywords from captions
-    keywords = set()
+    # Keywords are picked here, so only a handful of words travel through Redis
+    keywords = []
     for segment in captions:
         for word_data in segment.get('words', []):
             word_text = word_data['text'].lower()
             # Simple keyword extraction: filter out common words
-            if len(word_text) > 3 and word_text not in ['the', 'and', 'for', 'that', 'with', 'this', 'have', 'from', 'they', 'about', 'just', 'like', 'what', 'your', 'when', 'all', 'out', 'one', 'get', 'you', 'can', 'not', 'but', 'how', 'want', 'don', 't', 'know', 'go', 'do', 'if', 'up', 'down', 'in', 'out', 'on', 'off', 'as', 'at', 'by', 'be', 'so', 'to', 'a', 'an', 'is', 'it', 'we', 'he', 'she', 'they', 'me', 'him', 'her', 'us', 'them']:
-                keywords.add(word_text)
-    
-    suggested_broll = []
-    # For simplicity, let's just use the top 3 keywords to search
-    for keyword in list(keywords)[:3]:
-        # Call the existing search_broll function (or similar logic)
-        # Note: calling a route function directly is not standard Flask practice,
-        # better to refactor search_broll's core logic into a separate helper function.
-        # For this task, I'll simulate calling it by reusing its logic.
-        
-        # Simulating search_broll logic
-        pexels_key = os.environ.get('PEXELS_API_KEY')
-        if pexels_key:
-            try:
-                response = requests.get(
-                    'https://api.pexels.com/videos/search',
-                    headers={'Authorization': pexels_key},
-                    params={'query': keyword, 'per_page': 2, 'orientation': 'portrait'} # Get 2 videos per keyword
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    for video in data.get('videos', []):
-                        video_files = video.get('video_files', [])
-                        if video_files:
-                            suggested_broll.append({
-                                'id': str(video['id']),
-                                'video_url': video_files[0]['link'],
-                                'thumbnail': video['image'],
-                                'source': 'pexels',
-                                'duration': video.get('duration', 15),
-                                'keyword': keyword # To show why it was suggested
-                            })
-            except Exception as e:
-                app.logger.error(f"Pexels search error for keyword '{keyword}': {e}")
-        
-        # Optionally add Pixabay as well, or just rely on Pexels for now.
-        # For brevity, let's stick to Pexels for initial implementation.
+            if len(word_text) > 3 and word_text not in KEYWORD_STOP_WORDS and word_text not in keywords:
+                keywords.append(word_text)
 
-    return jsonify({"status": "success", "broll_clips": suggested_broll})
+    # For simplicity, just the top 3 keywords are searched
+    return run_upstream_task('upstream.suggest_broll', keywords[:3], result_key='broll_clips')
 
 @app.route('/api/ai/generate_effects', methods=['POST'])
 @login_required
@@ -1643,6 +2607,16 @@ def generate_effects():
     if not captions:
         return jsonify({"error": "Captions required"}), 400
 
+    zoom_effects, sound_effects = build_keyword_effects(captions, video_duration)
+
+    return jsonify({
+        "status": "success",
+        "zoom_effects": zoom_effects,
+        "sound_effects": sound_effects
+    })
+
+def build_keyword_effects(captions, video_duration):
+    """Suggest a zoom and a sound effect around every word flagged as a keyword."""
     zoom_effects = []
     sound_effects = []
 
@@ -1671,11 +2645,7 @@ def generate_effects():
                     "parameters": {"volume": 0.5}
                 })
 
-    return jsonify({
-        "status": "success",
-        "zoom_effects": zoom_effects,
-        "sound_effects": sound_effects
-    })
+    return zoom_effects, sound_effects
 
 @app.route('/api/export/<job_id>', methods=['POST'])
 @login_required
@@ -1684,54 +2654,103 @@ def start_export(job_id):
     data = request.get_json()
     settings = data.get('settings', {})
     style = data.get('style', {})
+    # New editors send the saved caption version; inline captions are still accepted
+    caption_version = data.get('caption_version')
     captions = data.get('captions', [])
     
     job_entry = VideoProcessingJob.query.filter_by(id=job_id, user_id=current_user.id).first()
     if not job_entry:
         return jsonify({"error": "Job not found"}), 404
+    if caption_version is not None:
+        if caption_version != job_entry.captions_version:
+            return jsonify({"error": "Captions changed since this version", "version": job_entry.captions_version}), 409
+        captions = None
     
-    # Create export job
-    export_id = f"export_{job_id}_{int(time.time())}"
+    # Verify file exists before queuing
+    if not media_exists(job_entry.original_video_filepath):
+        return jsonify({"error": f"Video file not found: {job_entry.original_video_filepath}"}), 404
     
-    # Queue the export task
+    client_key = request.headers.get('Idempotency-Key')
+    idem_key = idempotency_key('export', current_user.id, client_key) if client_key else None
+    return jsonify(queue_export(job_entry, captions, style, settings, idem_key))
+
+def queue_export(job_entry, captions, style, settings, idem_key=None):
+    """
+    Enqueue an export of a job on the exports queue, or attach to the identical
+    export already queued, running or done. Returns the export handle.
+    With captions=None the job's saved captions are rendered: their current
+    version is pinned and the worker loads it, instead of the captions
+    travelling through Redis with the job.
+    """
     from rq import Queue
     from worker import export_video_task
+
+    job_id = job_entry.id
+    # The export id is derived from what is being rendered, so an identical
+    # request (double click, retry) maps onto the same export
+    caption_version = pin_caption_revision(job_entry) if captions is None else None
+    export_id = lookup_idempotency_key(redis_conn, idem_key)
+    if not export_id:
+        caption_ref = captions if captions is not None else {"caption_version": caption_version}
+        export_id = f"export_{job_id}_{fingerprint(settings, style, caption_ref)[:16]}"
+    status_key = f"export_status:{export_id}"
     
-    # Get video file path (already absolute from upload)
-    video_path = job_entry.original_video_filepath
-    
-    # Verify file exists before queuing
-    if not os.path.exists(video_path):
-        return jsonify({"error": f"Video file not found: {video_path}"}), 404
+    # Seed the status so ownership checks work before the worker picks the job up.
+    # SET NX doubles as the in-flight claim: if a status already exists the same
+    # export is queued, running or done, and this request attaches to it.
+    seed_status = json.dumps({
+        "export_id": export_id,
+        "job_id": job_id,
+        "status": "queued",
+        "progress": 0,
+        "message": "Waiting for a worker..."
+    })
+    if not redis_conn.set(status_key, seed_status, nx=True, ex=3600):
+        existing = json.loads(redis_conn.get(status_key) or '{}')
+        if existing.get('status') not in ['failed', 'cancelled']:
+            remember_idempotency_key(redis_conn, idem_key, export_id)
+            return {
+                "export_id": export_id,
+                "job_id": export_id,
+                "status": existing.get('status', 'queued'),
+                "duplicate": True
+            }
+        # A failed or cancelled attempt may be retried
+        redis_conn.setex(status_key, 3600, seed_status)
+    clear_cancel(redis_conn, export_id)
+    remember_idempotency_key(redis_conn, idem_key, export_id)
+    # Retention and the disk quota leave the job's files alone until the export ends
+    begin_job_work(redis_conn, job_id, export_id)
     
     export_queue = Queue('exports', connection=redis_conn)
     export_job = export_queue.enqueue(
         export_video_task,
         job_id,  # Positional argument
         export_id,  # Positional argument
-        video_path,  # Absolute path to video
-        captions,  # Positional argument
+        job_entry.original_video_filepath,  # Absolute path to video
+        captions,  # Positional argument, None when rendering a pinned version
         style,  # Positional argument
         settings,  # Positional argument
+        caption_version,
+        job_id=export_id,
         job_timeout='1h'
     )
     
-    return jsonify({
+    return {
         "export_id": export_id,
         "job_id": export_job.id,
         "status": "queued"
-    })
+    }
 
 @app.route('/api/export/status/<export_id>')
 @login_required
 def get_export_status(export_id):
     """Get export job status and progress"""
-    # Check Redis for export status
-    status_key = f"export_status:{export_id}"
-    status_data = redis_conn.get(status_key)
+    # Check Redis for export status (snapshot and metrics in one round trip)
+    status_data, metrics = read_status_snapshot(redis_conn, f"export_status:{export_id}", f"export_metrics:{export_id}")
     
     if status_data:
-        return jsonify(json.loads(status_data))
+        return jsonify({**status_data, "metrics": metrics})
     
     return jsonify({
         "export_id": export_id,
@@ -1740,111 +2759,80 @@ def get_export_status(export_id):
         "message": "Initializing..."
     })
 
+@app.route('/api/export/cancel/<export_id>', methods=['POST'])
+@login_required
+def cancel_export(export_id):
+    """Cancel a queued or running export"""
+    status_data = redis_conn.get(f"export_status:{export_id}")
+    status = json.loads(status_data) if status_data else {}
+    
+    job_entry = VideoProcessingJob.query.filter_by(id=status.get('job_id'), user_id=current_user.id).first()
+    if not job_entry:
+        return jsonify({"error": "Export not found"}), 404
+    
+    if status.get('status') in ['completed', 'failed', 'cancelled']:
+        return jsonify({"error": f"Export already {status['status']}"}), 409
+    
+    abort_export(job_entry.id, export_id)
+    
+    return jsonify({"export_id": export_id, "status": "cancelled"})
+
+def abort_export(job_id, export_id):
+    """Flag an export cancelled; the worker stops a running one, a queued one is dropped here."""
+    request_cancel(redis_conn, export_id)
+    
+    export_job = Queue('exports', connection=redis_conn).fetch_job(export_id)
+    if export_job and export_job.get_status() != 'started':
+        # Never reached a worker, so there is nothing to kill or clean up
+        export_job.cancel()
+        end_job_work(redis_conn, job_id, export_id)
+        status_data = redis_conn.get(f"export_status:{export_id}")
+        redis_conn.setex(f"export_status:{export_id}", 3600, json.dumps({
+            **(json.loads(status_data) if status_data else {}),
+            "status": "cancelled",
+            "progress": 0,
+            "message": "Export cancelled."
+        }))
+
 @app.route('/uploads/<path:filename>')
 def serve_upload(filename):
     """Serve uploaded and exported video files"""
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    return serve_media(app.config['UPLOAD_FOLDER'], filename)
 
 # Enhanced transcription with word-level timestamps
 @app.route('/api/transcribe_word_level', methods=['POST'])
 @login_required
 def transcribe_word_level():
-    """Transcribe video with word-level timestamps using Whisper"""
-    if 'video' not in request.files:
-        return jsonify({"error": "No video file"}), 400
-    
-    video = request.files['video']
+    """
+    Queue a word-level transcription of one of the user's jobs (?job_id=, its
+    audio artifact is reused) or of an uploaded video. Answers 202 with a task
+    handle; the finished task carries {"status", "captions", "duration"}.
+    """
     language = request.form.get('language', None)
-    
-    try:
-        import openai
-        import tempfile
-        
-        openai.api_key = os.environ.get('OPENAI_API_KEY')
-        
-        # Save video temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as tmp:
-            video.save(tmp.name)
-            video_path = tmp.name
-        
-        if not openai.api_key:
-            # Fallback to faster-whisper without word timestamps
-            model = load_faster_whisper_model()
-            segments, info = model.transcribe(video_path, language=language)
-            
-            captions = []
-            for i, segment in enumerate(segments):
-                words = []
-                # Split text into words and estimate timestamps
-                text_words = segment.text.split()
-                duration = segment.end - segment.start
-                word_duration = duration / len(text_words) if text_words else 0
-                
-                for j, word in enumerate(text_words):
-                    words.append({
-                        "text": word,
-                        "start": segment.start + (j * word_duration),
-                        "end": segment.start + ((j + 1) * word_duration),
-                        "confidence": 0.9
-                    })
-                
-                captions.append({
-                    "id": f"caption_{i}",
-                    "text": segment.text.strip(),
-                    "start": segment.start,
-                    "end": segment.end,
-                    "words": words
-                })
-        else:
-            # Use OpenAI Whisper API with word timestamps
-            with open(video_path, 'rb') as f:
-                response = openai.Audio.transcribe(
-                    model="whisper-1",
-                    file=f,
-                    language=language,
-                    response_format="verbose_json",
-                    timestamp_granularities=["word"]
-                )
-            
-            # Parse word-level timestamps
-            words = response.words if hasattr(response, 'words') else []
-            segments = response.segments if hasattr(response, 'segments') else []
-            
-            captions = []
-            for i, segment in enumerate(segments):
-                segment_words = [
-                    w for w in words 
-                    if w.start >= segment.start and w.end <= segment.end
-                ]
-                
-                captions.append({
-                    "id": f"caption_{i}",
-                    "text": segment.text.strip(),
-                    "start": segment.start,
-                    "end": segment.end,
-                    "words": [
-                        {
-                            "text": w.word.strip(),
-                            "start": w.start,
-                            "end": w.end,
-                            "confidence": getattr(w, 'probability', 0.9)
-                        }
-                        for w in segment_words
-                    ]
-                })
-        
-        # Clean up
-        os.unlink(video_path)
-        
-        return jsonify({
-            "status": "success",
-            "captions": captions,
-            "duration": captions[-1]['end'] if captions else 0
-        })
-        
-    except Exception as e:
-        app.logger.error(f"Word-level transcription error: {e}")
-        return jsonify({"error": str(e)}), 500
+    job_id = request.form.get('job_id')
+    if job_id:
+        job_entry = VideoProcessingJob.query.filter_by(id=job_id, user_id=current_user.id).first()
+        if job_entry and media_exists(job_entry.original_video_filepath):
+            return enqueue_user_task(
+                'app.transcribe_word_level_task', language, job_entry.original_video_filepath, pcm_path(job_id),
+                queue_name='default', timeout=WORD_LEVEL_TASK_TIMEOUT
+            )
+
+    video = request.files.get('video')
+    if not video or not video.filename:
+        return jsonify({"error": "No video file"}), 400
+
+    # Published like any upload, so whichever worker picks the task up can read it;
+    # tracked under the task id, so retention removes it if the task never runs
+    task_id = str(uuid.uuid4())
+    video_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{os.urandom(16).hex()}_{secure_filename(video.filename) or 'video.mp4'}")
+    video.save(video_path)
+    storage.put(media_key(video_path), video_path, move=True)
+    track_artifact(redis_conn, task_id, media_key(video_path), 'original')
+    return enqueue_user_task(
+        'app.transcribe_word_level_task', language, video_path, None, True,
+        queue_name='default', timeout=WORD_LEVEL_TASK_TIMEOUT, task_id=task_id
+    )
 
 # Serve Svelte frontend
 @app.route('/editor-new')
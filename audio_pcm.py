@@ -0,0 +1,106 @@
+import os
+import struct
+import numpy as np
+from job_control import run_ffmpeg
+
+# Normalized audio artifact shared by every audio consumer of a job.
+#
+# The video is decoded once, by ffmpeg, into 16 kHz mono float32 PCM in a
+# plain WAV container (WAVE_FORMAT_IEEE_FLOAT). The RIFF header says where the
+# samples start, so readers map them straight from the page cache with
+# numpy.memmap: Whisper gets a float32 array it can use as is, resuming from a
+# checkpoint is a slice, and analysis (waveform peaks, silence detection)
+# never holds the whole track in memory.
+PCM_SAMPLE_RATE = 16000
+PCM_DTYPE = np.dtype('<f4')
+WAVE_FORMAT_IEEE_FLOAT = 3
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def extract_pcm(source_path, out_path, redis_conn=None, cancel_id=None):
+    """
+    Decode the audio track of `source_path` into the shared PCM format.
+    Written to a partial file and renamed, so readers never see half an artifact.
+    Returns run_ffmpeg's (returncode, output tail).
+    """
+    partial_path = f"{out_path}.partial"
+    cmd = [
+        "ffmpeg", "-i", source_path, "-y",
+        "-vn", "-ac", "1", "-ar", str(PCM_SAMPLE_RATE),
+        "-c:a", "pcm_f32le", "-f", "wav",
+        # No metadata chunks: the data chunk follows the format chunk directly
+        "-bitexact", "-map_metadata", "-1",
+        partial_path
+    ]
+    try:
+        returncode, output = run_ffmpeg(cmd, redis_conn=redis_conn, cancel_id=cancel_id)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    if returncode == 0:
+        os.replace(partial_path, out_path)
+    elif os.path.exists(partial_path):
+        os.remove(partial_path)
+    return returncode, output
+
+
+def read_pcm_header(path):
+    """Parse the RIFF header: {sample_rate, channels, data_offset, sample_count}."""
+    file_size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        riff, _, wave_id = struct.unpack('<4sI4s', f.read(12))
+        if riff not in (b'RIFF', b'RF64') or wave_id != b'WAVE':
+            raise ValueError(f"{path} is not a WAV file")
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise ValueError(f"{path} has no data chunk")
+            chunk_id, size = struct.unpack('<4sI', chunk)
+            if chunk_id == b'fmt ':
+                body = f.read(size + (size & 1))
+                format_tag, channels, sample_rate = struct.unpack('<HHI', body[:8])
+                bits_per_sample = struct.unpack('<H', body[14:16])[0]
+                if format_tag == WAVE_FORMAT_EXTENSIBLE:
+                    format_tag = struct.unpack('<H', body[24:26])[0]
+                fmt = (format_tag, channels, sample_rate, bits_per_sample)
+            elif chunk_id == b'data':
+                data_offset = f.tell()
+                break
+            else:
+                f.seek(size + (size & 1), 1)
+
+    if fmt is None or fmt[0] != WAVE_FORMAT_IEEE_FLOAT or fmt[1] != 1 or fmt[3] != 32:
+        raise ValueError(f"{path} is not mono float32 PCM")
+    # RF64 and streamed output leave 0xFFFFFFFF in the size field; the data chunk runs to the end of the file
+    data_size = file_size - data_offset if size == 0xFFFFFFFF else min(size, file_size - data_offset)
+    return {
+        "sample_rate": fmt[2],
+        "channels": fmt[1],
+        "data_offset": data_offset,
+        "sample_count": data_size // PCM_DTYPE.itemsize
+    }
+
+
+def open_pcm(path, start_seconds=0.0, end_seconds=None):
+    """
+    Memory-map the samples of a PCM artifact as a read-only float32 array,
+    optionally limited to [start_seconds, end_seconds). No samples are copied.
+    """
+    header = read_pcm_header(path)
+    if header["sample_rate"] != PCM_SAMPLE_RATE:
+        raise ValueError(f"{path} is {header['sample_rate']} Hz, expected {PCM_SAMPLE_RATE}")
+    count = header["sample_count"]
+    first = min(count, max(0, int(start_seconds * PCM_SAMPLE_RATE)))
+    last = count if end_seconds is None else min(count, int(end_seconds * PCM_SAMPLE_RATE))
+    if count == 0 or first >= last:
+        # numpy cannot map zero bytes
+        return np.zeros(0, dtype=PCM_DTYPE)
+    samples = np.memmap(path, dtype=PCM_DTYPE, mode='r', offset=header["data_offset"], shape=(count,))
+    return samples[first:last]
+
+
+def pcm_duration(path):
+    header = read_pcm_header(path)
+    return header["sample_count"] / header["sample_rate"]
@@ -0,0 +1,181 @@
+import json
+import struct
+from array import array
+from itertools import accumulate
+from bisect import bisect_left, bisect_right
+
+# Columnar binary codec for word-level captions.
+#
+# The JSON form repeats every key name for every word and spells each float
+# out in decimal. Here a transcript is stored column by column instead:
+#
+#   header   magic b'CAP1', segment count u32, word count u32, string count u32
+#   segments start ms u32[], end ms u32[], first word u32[], id str u32[], text str u32[]
+#   words    start ms u32[], end ms u32[], probability u16[], text str u32[]
+#   strings  byte offsets u32[count + 1], then the UTF-8 bytes of the table
+#   extras   JSON of any other keys (e.g. isKeyword), keyed by segment/word index
+#
+# Times are fixed-point milliseconds and probabilities fixed-point 1/10000,
+# the precision transcribe_audio_file already rounds to, so decoding is one
+# division per value and gives back exactly the floats the JSON held.
+# Identical strings (repeated words, "segment_N" ids) are interned once; ids
+# that are not strings are kept as extras so they come back with their type.
+# Segment starts are kept in a sorted column, so decode(start=, end=) bisects
+# to the segments overlapping a time window and only builds those. Edited
+# segments may overlap, so the window's left edge is found on the running
+# maximum of the end times rather than assuming ends are sorted too.
+MAGIC = b'CAP1'
+HEADER = struct.Struct('<4sIII')
+TIME_SCALE = 1000
+PROBABILITY_SCALE = 10000
+_SEGMENT_KEYS = ('id', 'text', 'start', 'end', 'words')
+_WORD_KEYS = ('text', 'start', 'end', 'probability')
+_ITEM_SIZES = {'I': 4, 'H': 2}
+
+
+def _column(typecode, values):
+    column = array(typecode, values)
+    if column.itemsize != _ITEM_SIZES[typecode]:
+        raise RuntimeError(f"array('{typecode}') is not {8 * _ITEM_SIZES[typecode]}-bit on this platform")
+    return column
+
+
+def _ms(seconds):
+    return max(0, round((seconds or 0) * TIME_SCALE))
+
+
+def encode_captions(captions):
+    """Pack a list of caption segments (the transcribe_audio_file shape) into bytes."""
+    strings, string_index = [], {}
+
+    def intern(text):
+        index = string_index.get(text)
+        if index is None:
+            index = string_index[text] = len(strings)
+            strings.append(text)
+        return index
+
+    seg_start, seg_end, seg_first, seg_id, seg_text = [], [], [], [], []
+    word_start, word_end, word_prob, word_text = [], [], [], []
+    extras = {"segments": {}, "words": {}}
+
+    # Segments are stored in time order so range lookups can bisect
+    for segment in sorted(captions, key=lambda seg: seg.get('start', 0)):
+        seg_extra = {k: v for k, v in segment.items() if k not in _SEGMENT_KEYS}
+        if 'id' in segment and not isinstance(segment['id'], str):
+            seg_extra['id'] = segment['id']
+        if seg_extra:
+            extras["segments"][len(seg_start)] = seg_extra
+        seg_start.append(_ms(segment.get('start')))
+        seg_end.append(_ms(segment.get('end')))
+        seg_first.append(len(word_start))
+        seg_id.append(intern(str(segment.get('id', ''))))
+        seg_text.append(intern(segment.get('text', '')))
+        for word in segment.get('words') or []:
+            word_extra = {k: v for k, v in word.items() if k not in _WORD_KEYS}
+            if word_extra:
+                extras["words"][len(word_start)] = word_extra
+            word_start.append(_ms(word.get('start')))
+            word_end.append(_ms(word.get('end')))
+            word_prob.append(min(PROBABILITY_SCALE, max(0, round((word.get('probability') or 0) * PROBABILITY_SCALE))))
+            word_text.append(intern(word.get('text', '')))
+
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = [0]
+    for blob in encoded:
+        offsets.append(offsets[-1] + len(blob))
+
+    parts = [HEADER.pack(MAGIC, len(seg_start), len(word_start), len(strings))]
+    for typecode, values in (
+        ('I', seg_start), ('I', seg_end), ('I', seg_first), ('I', seg_id), ('I', seg_text),
+        ('I', word_start), ('I', word_end), ('H', word_prob), ('I', word_text),
+        ('I', offsets),
+    ):
+        parts.append(_column(typecode, values).tobytes())
+    parts.append(b''.join(encoded))
+    if extras["segments"] or extras["words"]:
+        parts.append(json.dumps(extras, separators=(',', ':')).encode('utf-8'))
+    return b''.join(parts)
+
+
+def _read_columns(blob):
+    magic, n_seg, n_word, n_str = HEADER.unpack_from(blob, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a caption blob")
+    pos = HEADER.size
+    columns = []
+    for typecode, count in (
+        ('I', n_seg), ('I', n_seg), ('I', n_seg), ('I', n_seg), ('I', n_seg),
+        ('I', n_word), ('I', n_word), ('H', n_word), ('I', n_word),
+        ('I', n_str + 1),
+    ):
+        column = array(typecode)
+        size = _ITEM_SIZES[typecode] * count
+        column.frombytes(blob[pos:pos + size])
+        columns.append(column)
+        pos += size
+    offsets = columns[-1]
+    text_bytes = blob[pos:pos + offsets[-1]]
+    strings = [text_bytes[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(n_str)]
+    pos += offsets[-1]
+    extras = json.loads(blob[pos:]) if pos < len(blob) else {"segments": {}, "words": {}}
+    return columns[:-1], strings, n_word, extras
+
+
+def decode_captions(blob, start=None, end=None):
+    """
+    Unpack captions, optionally only the segments overlapping [start, end)
+    seconds. Segment ids, text and every extra key round-trip unchanged.
+    """
+    (seg_start, seg_end, seg_first, seg_id, seg_text,
+     word_start, word_end, word_prob, word_text), strings, n_word, extras = _read_columns(blob)
+
+    first, last = 0, len(seg_start)
+    if end is not None:
+        last = bisect_left(seg_start, _ms(end))
+    selected = range(first, last)
+    if start is not None:
+        start_ms = _ms(start)
+        # Every segment before the first running maximum past `start` has ended
+        # by then; after it, overlapping segments can still end earlier
+        first = bisect_right(list(accumulate(seg_end[:last], max)), start_ms)
+        selected = [i for i in range(first, last) if seg_end[i] > start_ms]
+    if not selected:
+        return []
+
+    seg_extras, word_extras = extras.get("segments", {}), extras.get("words", {})
+    captions = []
+    for i in selected:
+        # Convert whole column slices at once; per-value work is one division
+        word_first = seg_first[i]
+        word_stop = seg_first[i + 1] if i + 1 < len(seg_first) else n_word
+        words = [
+            {"text": strings[text], "start": w_start / TIME_SCALE, "end": w_end / TIME_SCALE,
+             "probability": prob / PROBABILITY_SCALE}
+            for text, w_start, w_end, prob in zip(
+                word_text[word_first:word_stop], word_start[word_first:word_stop],
+                word_end[word_first:word_stop], word_prob[word_first:word_stop])
+        ]
+        if word_extras:
+            for j in range(word_first, word_stop):
+                extra = word_extras.get(str(j))
+                if extra:
+                    words[j - word_first].update(extra)
+        segment = {
+            "id": strings[seg_id[i]],
+            "text": strings[seg_text[i]],
+            "start": seg_start[i] / TIME_SCALE,
+            "end": seg_end[i] / TIME_SCALE,
+            "words": words
+        }
+        extra = seg_extras.get(str(i))
+        if extra:
+            segment.update(extra)
+        captions.append(segment)
+    return captions
+
+
+def caption_duration(blob):
+    """End time of the last segment, without decoding any words."""
+    (_, seg_end, *_), _, _, _ = _read_columns(blob)
+    return max(seg_end) / TIME_SCALE if seg_end else 0.0
@@ -1,4 +1,5 @@
-import { writable } from 'svelte/store';
+import { writable, get } from 'svelte/store';
+import { captionOps } from '../utils';
 
 // Style Presets
 export const STYLE_PRESETS = {
@@ -92,6 +93,8 @@ function createProjectStore() {
     videoUrl: '',
     videoDuration: 0,
     captions: [],
+    savedCaptions: [], // captions as of captionsVersion on the server
+    captionsVersion: 0,
     bRollClips: [],
     zoomEffects: [], // New: to store auto-generated zoom effects
     soundEffects: [], // New: to store auto-generated sound effects
@@ -101,10 +104,27 @@ function createProjectStore() {
     updatedAt: new Date()
   });
 
+  const store = { subscribe };
+
   return {
     subscribe,
     set,
     update,
+    // Send caption edits made since the last save; resolves to the saved version
+    saveCaptions: async () => {
+      const project = get(store);
+      const ops = captionOps(project.savedCaptions || [], project.captions);
+      if (!ops.length) return project.captionsVersion;
+      const response = await fetch(`/api/editor_data/${project.id}/captions`, {
+        method: 'PATCH',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ version: project.captionsVersion, ops })
+      });
+      const data = await response.json();
+      if (!response.ok) throw new Error(data.message || 'Saving captions failed');
+      update(p => ({ ...p, savedCaptions: project.captions, captionsVersion: data.version }));
+      return data.version;
+    },
     updateCaption: (captionId, updates) => {
       update(project => {
         if (!project) return project;
@@ -29,6 +29,44 @@ export function throttle(func, limit) {
   };
 }
 
+// Ops for PATCH /api/editor_data/<id>/captions. Edits replace segment objects
+// rather than mutating them, so a segment that is still the saved object is unchanged.
+export function captionOps(saved, captions) {
+  const savedById = new Map(saved.map(segment => [segment.id, segment]));
+  const ids = new Set();
+  const ops = [];
+  for (const segment of captions) {
+    ids.add(segment.id);
+    const before = savedById.get(segment.id);
+    if (!before) {
+      ops.push({ op: 'insert_segment', segment });
+    } else if (before !== segment) {
+      ops.push({ op: 'update_segment', id: segment.id, fields: segment });
+    }
+  }
+  for (const segment of saved) {
+    if (!ids.has(segment.id)) ops.push({ op: 'delete_segment', id: segment.id });
+  }
+  return ops;
+}
+
+// Upstream calls (AI, stock search) answer 202 with a task handle; poll it
+// until the worker is done. Other responses are returned as parsed JSON.
+export const ASYNC_HEADERS = { Prefer: 'respond-async' };
+
+export async function taskResult(response, interval = 500) {
+  const data = await response.json();
+  if (response.status !== 202) return data;
+  for (;;) {
+    await new Promise(resolve => setTimeout(resolve, interval));
+    const poll = await fetch(data.status_url);
+    if (!poll.ok) throw new Error('Task expired');
+    const task = await poll.json();
+    if (task.status === 'finished') return task.result;
+    if (task.status === 'failed') throw new Error(task.message);
+  }
+}
+
 export function generateId() {
   return Math.random().toString(36).substring(2, 9);
 }
@@ -79,3 +117,20 @@ export function getAnimationCSS(animation) {
       return '';
   }
 }
+
+// Locate the thumbnail for `time` in a sprite sheet index from
+// /api/editor_data/<job_id>/thumbnails. Returns the sheet URL and the CSS
+// background-position of the cell, so no video decoding is needed.
+export function spriteCell(thumbnails, level, time) {
+  const index = Math.min(level.count - 1, Math.max(0, Math.floor(time / level.interval)));
+  const sheet = Math.floor(index / thumbnails.per_sheet);
+  const cell = index % thumbnails.per_sheet;
+  const column = cell % level.columns;
+  const row = Math.floor(cell / level.columns);
+  return {
+    url: `${thumbnails.base_url}${level.sheets[sheet]}`,
+    position: `-${column * level.thumb_width}px -${row * level.thumb_height}px`,
+    width: level.thumb_width,
+    height: level.thumb_height
+  };
+}
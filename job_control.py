@@ -0,0 +1,164 @@
+import os
+import json
+import hashlib
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+
+# Cooperative cancellation for worker jobs.
+#
+# The web process only raises a flag in Redis. Whatever is doing the work
+# (the ffmpeg wait loop, the Whisper segment loop, the start of every pipeline
+# stage) polls the flag, kills its own children and cleans up after itself, so
+# cancellation works the same whether the worker runs on this host or not.
+CANCEL_TTL_SECONDS = 24 * 3600
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker task once its job has been cancelled."""
+
+
+def cancel_key(cancel_id):
+    return f"cancel_requested:{cancel_id}"
+
+
+def request_cancel(redis_conn, cancel_id):
+    redis_conn.setex(cancel_key(cancel_id), CANCEL_TTL_SECONDS, 1)
+
+
+def clear_cancel(redis_conn, cancel_id):
+    redis_conn.delete(cancel_key(cancel_id))
+
+
+def is_cancel_requested(redis_conn, cancel_id):
+    return bool(cancel_id) and redis_conn.exists(cancel_key(cancel_id)) > 0
+
+
+def raise_if_cancelled(redis_conn, cancel_id):
+    if is_cancel_requested(redis_conn, cancel_id):
+        raise JobCancelled(f"Job {cancel_id} was cancelled")
+
+
+def terminate_process_group(process, grace_seconds=5):
+    """SIGTERM the process group of a child started with start_new_session, then SIGKILL."""
+    if process.poll() is not None:
+        return
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=grace_seconds)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+    except ProcessLookupError:
+        pass
+
+
+def run_ffmpeg(cmd, redis_conn=None, cancel_id=None, on_line=None, poll_interval=0.5, tail_lines=100):
+    """
+    Run an ffmpeg (or ffprobe) command in its own process group while watching
+    for cancellation. Output is drained on a background thread so the pipe never
+    fills up; `on_line` sees every line and the last `tail_lines` are returned.
+
+    Returns (returncode, output tail). Raises JobCancelled after killing the
+    whole process group if the job is cancelled while ffmpeg is running.
+    """
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True,
+        bufsize=1,
+        start_new_session=True
+    )
+
+    output_lines = deque(maxlen=tail_lines)
+
+    def drain():
+        for line in process.stdout:
+            output_lines.append(line)
+            if on_line:
+                on_line(line)
+
+    reader = threading.Thread(target=drain, daemon=True)
+    reader.start()
+
+    try:
+        while process.poll() is None:
+            if redis_conn is not None and is_cancel_requested(redis_conn, cancel_id):
+                terminate_process_group(process)
+                raise JobCancelled(f"Job {cancel_id} was cancelled")
+            time.sleep(poll_interval)
+    except BaseException:
+        # Covers JobCancelled as well as RQ's timeout exception in the work horse
+        terminate_process_group(process)
+        raise
+    finally:
+        reader.join(timeout=5)
+
+    return process.returncode, ''.join(output_lines)
+
+
+# Idempotent submission.
+#
+# Every submit endpoint claims a key before it enqueues anything. The key is
+# either the client's Idempotency-Key header or a fingerprint of the work
+# itself, and its value is the id of the job doing that work. A duplicate
+# request (double click, client retry) finds the claim and attaches to the
+# existing job instead of starting the same work again.
+SUBMISSION_TTL_SECONDS = 3600
+IDEMPOTENCY_KEY_TTL_SECONDS = 24 * 3600
+
+# Delete a claim only if it still points at the job releasing it
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def fingerprint(*parts):
+    """Stable hash of JSON-serialisable request parts."""
+    payload = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def submission_key(scope, user_id, digest):
+    return f"submission:{scope}:{user_id}:{digest}"
+
+
+def idempotency_key(scope, user_id, client_key):
+    return f"idempotency:{scope}:{user_id}:{client_key}"
+
+
+def claim_submission(redis_conn, key, job_id, ttl=SUBMISSION_TTL_SECONDS):
+    """
+    Atomically claim `key` for `job_id`. Returns None if the claim was won,
+    otherwise the id of the job that already holds it.
+    """
+    pipe = redis_conn.pipeline(transaction=True)
+    pipe.set(key, job_id, nx=True, ex=ttl)
+    pipe.get(key)
+    won, holder = pipe.execute()
+    if won:
+        return None
+    return holder.decode() if isinstance(holder, bytes) else holder
+
+
+def release_submission(redis_conn, key, job_id):
+    if key:
+        redis_conn.eval(_RELEASE_SCRIPT, 1, key, job_id)
+
+
+def lookup_idempotency_key(redis_conn, key):
+    existing = redis_conn.get(key) if key else None
+    if existing is None:
+        return None
+    return existing.decode() if isinstance(existing, bytes) else existing
+
+
+def remember_idempotency_key(redis_conn, key, job_id):
+    if key:
+        redis_conn.set(key, job_id, ex=IDEMPOTENCY_KEY_TTL_SECONDS)
@@ -0,0 +1,352 @@
+import os
+import re
+import json
+import time
+import shutil
+
+# Disk lifecycle for everything a job writes.
+#
+# Every artifact a job publishes is registered with its tier. A registration
+# is a storage key plus the job id, and it lives in Redis:
+#   artifact_meta      hash  key -> {"job_id", "tier", "size"}
+#   artifact_lru       zset  key -> last access (serving a file touches it)
+#   job_artifacts:{id} set   keys owned by a job
+# Periodic maintenance (the worker schedules it, `flask disk-gc` runs it by hand):
+#   1. drops artifacts older than their tier's retention,
+#   2. evicts least recently used artifacts while UPLOAD_FOLDER is over
+#      DISK_QUOTA_BYTES (never anything touched in the last
+#      QUOTA_MIN_IDLE_SECONDS),
+#   3. sweeps orphaned scratch files left by crashed or killed tasks, and
+#   4. records disk usage per tier in the `disk_metrics` hash.
+#
+# Steps 1 and 2 skip in-flight jobs. A job is in flight while an export or a
+# burn of it is queued or running: those hold an entry in job_work:{id}, with a
+# deadline so a worker killed mid-task cannot pin the job forever. A job row
+# still in an in-flight status also counts, until it has not been updated for
+# IN_FLIGHT_STALE_SECONDS (a crashed transcription, an editor left open).
+TIERS = ('original', 'export', 'editor', 'audio')
+# Tiers that only ever exist on the local disk of the node that wrote them
+LOCAL_TIERS = ('audio',)
+RETENTION_SECONDS = {
+    'original': int(os.environ.get('RETENTION_ORIGINAL_SECONDS', 30 * 24 * 3600)),
+    'export': int(os.environ.get('RETENTION_EXPORT_SECONDS', 7 * 24 * 3600)),
+    'editor': int(os.environ.get('RETENTION_EDITOR_SECONDS', 30 * 24 * 3600)),
+    'audio': int(os.environ.get('RETENTION_AUDIO_SECONDS', 7 * 24 * 3600)),
+}
+DISK_QUOTA_BYTES = int(os.environ.get('DISK_QUOTA_BYTES', 0))  # 0 disables quota eviction
+QUOTA_MIN_IDLE_SECONDS = 3600
+# Longer than any task's job_timeout plus a long wait in the queue
+JOB_WORK_TTL_SECONDS = int(os.environ.get('JOB_WORK_TTL_SECONDS', 6 * 3600))
+IN_FLIGHT_STALE_SECONDS = int(os.environ.get('IN_FLIGHT_STALE_SECONDS', 6 * 3600))
+ORPHAN_GRACE_SECONDS = int(os.environ.get('ORPHAN_GRACE_SECONDS', 6 * 3600))
+MAINTENANCE_INTERVAL_SECONDS = int(os.environ.get('DISK_MAINTENANCE_INTERVAL_SECONDS', 15 * 60))
+
+ARTIFACT_META_KEY = 'artifact_meta'
+ARTIFACT_LRU_KEY = 'artifact_lru'
+DISK_METRICS_KEY = 'disk_metrics'
+MAINTENANCE_SCHEDULED_KEY = 'disk_maintenance_scheduled'
+# Statuses of a job a worker (or the editor) is still busy with, while recent
+IN_FLIGHT_STATUSES = ('pending', 'editing', 'burning')
+# tempfile.mkdtemp() directories created by the legacy transcription task
+MKDTEMP_PATTERN = re.compile(r'^tmp[\w]{8}$')
+# Uploads written straight into UPLOAD_FOLDER: `{upload id or random hex}_{filename}`
+UPLOAD_FILE_PATTERN = re.compile(r'^([0-9a-f]{32})_.+$')
+
+
+def job_artifacts_key(job_id):
+    return f"job_artifacts:{job_id}"
+
+
+def job_work_key(job_id):
+    return f"job_work:{job_id}"
+
+
+def begin_job_work(redis_conn, job_id, work_id, ttl=JOB_WORK_TTL_SECONDS):
+    """Protect a job's artifacts while `work_id` (an export, a burn) is queued or running."""
+    key = job_work_key(job_id)
+    pipe = redis_conn.pipeline(transaction=True)
+    pipe.zadd(key, {work_id: time.time() + ttl})
+    pipe.expire(key, ttl)
+    pipe.execute()
+
+
+def end_job_work(redis_conn, job_id, work_id):
+    redis_conn.zrem(job_work_key(job_id), work_id)
+
+
+def _local_path(key):
+    from app import app
+    return os.path.join(app.config['UPLOAD_FOLDER'], key)
+
+
+def _path_size(path):
+    if os.path.isdir(path):
+        total = 0
+        for dirpath, _, filenames in os.walk(path):
+            for name in filenames:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, name))
+                except FileNotFoundError:
+                    pass
+        return total
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+def track_artifact(redis_conn, job_id, key, tier, size=None):
+    """Register a published artifact so retention, quota and metrics see it."""
+    if tier not in TIERS:
+        raise ValueError(f"Unknown artifact tier '{tier}'")
+    if size is None:
+        size = _path_size(_local_path(key))
+    pipe = redis_conn.pipeline(transaction=True)
+    pipe.hset(ARTIFACT_META_KEY, key, json.dumps({"job_id": job_id, "tier": tier, "size": size}))
+    pipe.zadd(ARTIFACT_LRU_KEY, {key: time.time()})
+    pipe.sadd(job_artifacts_key(job_id), key)
+    pipe.execute()
+
+
+def touch_artifact(redis_conn, key):
+    """Mark an artifact as just used. Untracked keys are ignored (XX)."""
+    redis_conn.zadd(ARTIFACT_LRU_KEY, {key: time.time()}, xx=True)
+
+
+def touch_job_artifacts(redis_conn, job_id):
+    """Mark everything a job owns as just used (the job was opened in the editor)."""
+    keys = redis_conn.smembers(job_artifacts_key(job_id))
+    if keys:
+        now = time.time()
+        redis_conn.zadd(ARTIFACT_LRU_KEY, {key: now for key in keys}, xx=True)
+
+
+def _load_meta(redis_conn, keys):
+    if not keys:
+        return {}
+    raw = redis_conn.hmget(ARTIFACT_META_KEY, keys)
+    return {key: json.loads(value) for key, value in zip(keys, raw) if value}
+
+
+def delete_artifact(redis_conn, key, meta=None):
+    """Delete an artifact wherever it lives and forget it. Returns the bytes it was using."""
+    from app import storage
+    meta = meta or _load_meta(redis_conn, [key]).get(key) or {}
+    if meta.get('tier') in LOCAL_TIERS:
+        path = _local_path(key)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        elif os.path.exists(path):
+            os.remove(path)
+    else:
+        storage.delete(key)
+    pipe = redis_conn.pipeline(transaction=True)
+    pipe.hdel(ARTIFACT_META_KEY, key)
+    pipe.zrem(ARTIFACT_LRU_KEY, key)
+    if meta.get('job_id'):
+        pipe.srem(job_artifacts_key(meta['job_id']), key)
+    pipe.execute()
+    return meta.get('size', 0)
+
+
+def delete_job_artifacts(redis_conn, job_id):
+    keys = [key.decode() for key in redis_conn.smembers(job_artifacts_key(job_id))]
+    meta = _load_meta(redis_conn, keys)
+    for key in keys:
+        delete_artifact(redis_conn, key, meta.get(key))
+    redis_conn.delete(job_artifacts_key(job_id))
+
+
+def _in_flight_jobs(redis_conn, job_ids, now):
+    from datetime import datetime
+    from app import VideoProcessingJob
+    job_ids = list(job_ids)
+    if not job_ids:
+        return set()
+    pipe = redis_conn.pipeline()
+    for job_id in job_ids:
+        pipe.zcount(job_work_key(job_id), now, '+inf')
+    busy = {job_id for job_id, running in zip(job_ids, pipe.execute()) if running}
+    rows = VideoProcessingJob.query.with_entities(VideoProcessingJob.id).filter(
+        VideoProcessingJob.id.in_(job_ids),
+        VideoProcessingJob.status.in_(IN_FLIGHT_STATUSES),
+        VideoProcessingJob.updated_at >= datetime.utcfromtimestamp(now - IN_FLIGHT_STALE_SECONDS)
+    ).all()
+    return busy | {row.id for row in rows}
+
+
+def enforce_retention(redis_conn, now=None):
+    """Delete artifacts not used within their tier's retention window."""
+    now = now or time.time()
+    oldest = now - min(RETENTION_SECONDS.values())
+    scores = {key.decode(): score for key, score in redis_conn.zrangebyscore(ARTIFACT_LRU_KEY, 0, oldest, withscores=True)}
+    candidates = list(scores)
+    meta = _load_meta(redis_conn, candidates)
+    busy = _in_flight_jobs(redis_conn, {m['job_id'] for m in meta.values()}, now)
+    removed = []
+    for key in candidates:
+        info = meta.get(key)
+        if not info:
+            redis_conn.zrem(ARTIFACT_LRU_KEY, key)
+            continue
+        if info['job_id'] in busy or scores[key] > now - RETENTION_SECONDS[info['tier']]:
+            continue
+        delete_artifact(redis_conn, key, info)
+        removed.append(key)
+    return removed
+
+
+def enforce_quota(redis_conn, quota_bytes=DISK_QUOTA_BYTES, now=None):
+    """Evict least recently used artifacts from local disk until usage is under the quota."""
+    from app import app, storage
+    if not quota_bytes:
+        return []
+    now = now or time.time()
+    used = _path_size(app.config['UPLOAD_FOLDER'])
+    if used <= quota_bytes:
+        return []
+
+    removed = []
+    start = 0
+    while used > quota_bytes:
+        batch = [key.decode() for key in redis_conn.zrangebyscore(
+            ARTIFACT_LRU_KEY, 0, now - QUOTA_MIN_IDLE_SECONDS, start=start, num=100)]
+        if not batch:
+            app.logger.warning(f"Disk quota exceeded ({used} > {quota_bytes} bytes) with nothing left to evict")
+            break
+        meta = _load_meta(redis_conn, batch)
+        busy = _in_flight_jobs(redis_conn, {m['job_id'] for m in meta.values()}, now)
+        for key in batch:
+            info = meta.get(key)
+            # With remote storage only the node-local tiers count against this disk
+            if not info or info['job_id'] in busy or (storage.remote and info['tier'] not in LOCAL_TIERS):
+                start += 1
+                continue
+            used -= delete_artifact(redis_conn, key, info)
+            removed.append(key)
+            if used <= quota_bytes:
+                break
+    return removed
+
+
+def _orphan_candidates(redis_conn):
+    """
+    Scratch paths that a finished task should already have removed, each with
+    the Redis key (or None) whose existence means its owner is still alive.
+    """
+    from app import app
+    from pipeline import artifacts_key
+    from uploads import session_key
+    upload_folder = app.config['UPLOAD_FOLDER']
+    work_root = os.path.join(upload_folder, 'work')
+    if os.path.isdir(work_root):
+        for name in os.listdir(work_root):
+            # A pipeline still holding artifacts owns its work dir, however old
+            yield os.path.join(work_root, name), artifacts_key(name)
+    for name in os.listdir(upload_folder):
+        path = os.path.join(upload_folder, name)
+        if MKDTEMP_PATTERN.match(name) and os.path.isdir(path):
+            yield path, None
+            continue
+        # An upload that never became a job: a chunked upload abandoned until
+        # its session expired (preallocated to full size), or a request that
+        # died between writing the file and registering it
+        match = UPLOAD_FILE_PATTERN.match(name)
+        if match and os.path.isfile(path) and not redis_conn.hexists(ARTIFACT_META_KEY, name):
+            yield path, session_key(match.group(1))
+    # Export scratch (.ass subtitles, unfinished encodes)
+    export_tmp = os.path.join(os.getcwd(), 'tmp')
+    if os.path.isdir(export_tmp):
+        for name in os.listdir(export_tmp):
+            yield os.path.join(export_tmp, name), None
+    # Half-written files from interrupted atomic writes
+    for dirpath, _, filenames in os.walk(upload_folder):
+        for name in filenames:
+            if name.endswith('.partial'):
+                yield os.path.join(dirpath, name), None
+
+
+def sweep_orphans(redis_conn, grace_seconds=ORPHAN_GRACE_SECONDS, now=None):
+    """Remove scratch files older than the grace period whose owner is gone."""
+    now = now or time.time()
+    removed = []
+    for path, owner_key in _orphan_candidates(redis_conn):
+        try:
+            if now - os.path.getmtime(path) < grace_seconds:
+                continue
+        except FileNotFoundError:
+            continue
+        if owner_key and redis_conn.exists(owner_key):
+            continue
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        elif os.path.exists(path):
+            os.remove(path)
+        removed.append(path)
+    return removed
+
+
+def collect_disk_metrics(redis_conn):
+    """Disk usage per tier plus filesystem totals, stored in the disk_metrics hash."""
+    from app import app
+    upload_folder = app.config['UPLOAD_FOLDER']
+    tier_bytes = {tier: 0 for tier in TIERS}
+    tier_count = {tier: 0 for tier in TIERS}
+    for value in redis_conn.hvals(ARTIFACT_META_KEY):
+        info = json.loads(value)
+        tier_bytes[info['tier']] += info.get('size', 0)
+        tier_count[info['tier']] += 1
+    scratch_bytes = sum(_path_size(path) for path, _ in _orphan_candidates(redis_conn))
+    disk = shutil.disk_usage(upload_folder)
+
+    metrics = {
+        "collected_at": int(time.time()),
+        "upload_folder_bytes": _path_size(upload_folder),
+        "scratch_bytes": scratch_bytes,
+        "quota_bytes": DISK_QUOTA_BYTES,
+        "disk_total_bytes": disk.total,
+        "disk_free_bytes": disk.free,
+    }
+    for tier in TIERS:
+        metrics[f"{tier}_bytes"] = tier_bytes[tier]
+        metrics[f"{tier}_count"] = tier_count[tier]
+    redis_conn.hset(DISK_METRICS_KEY, mapping=metrics)
+    return metrics
+
+
+def run_disk_maintenance(redis_conn):
+    from app import app
+    expired = enforce_retention(redis_conn)
+    evicted = enforce_quota(redis_conn)
+    orphans = sweep_orphans(redis_conn)
+    metrics = collect_disk_metrics(redis_conn)
+    app.logger.info(f"Disk maintenance: {len(expired)} expired, {len(evicted)} evicted, {len(orphans)} orphans removed")
+    return {"expired": expired, "evicted": evicted, "orphans": orphans, "metrics": metrics}
+
+
+def schedule_disk_maintenance(redis_conn, queue, force=False):
+    """
+    Keep exactly one maintenance run scheduled. Every worker calls this on
+    start; the marker key makes all but the first a no-op, and it expires if
+    the chain ever breaks so the next worker start picks it up again.
+    """
+    from datetime import timedelta
+    marker_ttl = MAINTENANCE_INTERVAL_SECONDS * 2
+    if force:
+        redis_conn.set(MAINTENANCE_SCHEDULED_KEY, 1, ex=marker_ttl)
+    elif not redis_conn.set(MAINTENANCE_SCHEDULED_KEY, 1, nx=True, ex=marker_ttl):
+        return None
+    return queue.enqueue_in(timedelta(seconds=MAINTENANCE_INTERVAL_SECONDS), 'lifecycle.disk_maintenance_task')
+
+
+def disk_maintenance_task():
+    """RQ task: run maintenance, then schedule the next run (needs a worker started with_scheduler)."""
+    from rq import Queue
+    from app import app, redis_conn
+
+    with app.app_context():
+        try:
+            summary = run_disk_maintenance(redis_conn)
+        finally:
+            schedule_disk_maintenance(redis_conn, Queue(connection=redis_conn), force=True)
+    return {"expired": len(summary["expired"]), "evicted": len(summary["evicted"]), "orphans": len(summary["orphans"])}
@@ -0,0 +1,164 @@
+from datetime import datetime
+from sqlalchemy import inspect, text
+
+# Versioned schema migrations, run once per deploy instead of on the request path:
+# `flask db-upgrade` is the release step (Procfile `release:`), never part of
+# web or worker startup.
+#
+# Applied versions are recorded in the schema_migrations table, so a repeat run
+# with nothing pending only reads that table. Steps still check the live schema
+# before altering it: databases that predate this runner were upgraded piecemeal
+# by the old before_request hook, so the first run over them replays every step
+# and each one skips what is already there.
+#
+# To change the schema, update the model and append a step here; never edit or
+# reorder a step that has shipped.
+MIGRATIONS_TABLE = 'schema_migrations'
+# Arbitrary key for pg_advisory_lock: serializes runners started by several web replicas
+MIGRATION_LOCK_ID = 727100441
+
+
+def _columns(conn, table):
+    return {col['name'] for col in inspect(conn).get_columns(table)}
+
+
+def _add_column(conn, table, column, ddl):
+    if column not in _columns(conn, table):
+        conn.exec_driver_sql(f'ALTER TABLE "{table}" ADD COLUMN {column} {ddl}')
+        return True
+    return False
+
+
+def _baseline(conn):
+    from app import db
+    # Creates every table that is missing, at the current model schema
+    db.metadata.create_all(conn)
+
+
+def _subtitle_position(conn):
+    _add_column(conn, 'video_processing_job', 'subtitle_pos_x', 'FLOAT DEFAULT 50.0')
+    _add_column(conn, 'video_processing_job', 'subtitle_pos_y', 'FLOAT DEFAULT 15.0')
+
+
+def _editor_json_columns(conn):
+    for column in ('word_level_captions_json', 'zoom_effects_json', 'sound_effects_json'):
+        _add_column(conn, 'video_processing_job', column, 'TEXT')
+
+
+def _preview_proxy(conn):
+    _add_column(conn, 'video_processing_job', 'preview_proxy_filepath', 'VARCHAR(256)')
+
+
+def _batch_id(conn):
+    if _add_column(conn, 'video_processing_job', 'batch_id', 'VARCHAR(36) REFERENCES processing_batch (id)'):
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_video_processing_job_batch_id ON video_processing_job (batch_id)")
+
+
+def _caption_blob(conn):
+    blob_type = 'BYTEA' if conn.dialect.name == 'postgresql' else 'BLOB'
+    _add_column(conn, 'video_processing_job', 'word_level_captions_blob', blob_type)
+
+
+def _captions_version(conn):
+    _add_column(conn, 'video_processing_job', 'captions_version', 'INTEGER NOT NULL DEFAULT 0')
+
+
+def _subscription_tier(conn):
+    _add_column(conn, 'user', 'subscription_tier', "VARCHAR(50) DEFAULT 'free'")
+    conn.exec_driver_sql("UPDATE \"user\" SET subscription_tier = 'free' WHERE subscription_tier IS NULL")
+
+
+def _job_history_indexes(conn):
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_video_processing_job_user_created ON video_processing_job (user_id, created_at, id)")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_video_processing_job_user_status_created ON video_processing_job (user_id, status, created_at, id)")
+
+
+def _transcript_search(conn):
+    # Same column names on both dialects; see transcript_search.py. Existing
+    # transcripts are backfilled with `flask reindex-transcripts`.
+    if conn.dialect.name == 'postgresql':
+        conn.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS transcript_segment ("
+            "job_id VARCHAR(36) NOT NULL REFERENCES video_processing_job (id) ON DELETE CASCADE, "
+            "segment_id TEXT NOT NULL, user_id INTEGER NOT NULL, "
+            "start_time FLOAT, end_time FLOAT, text TEXT NOT NULL, words TEXT, "
+            "tsv tsvector GENERATED ALWAYS AS (to_tsvector('simple', text)) STORED, "
+            "PRIMARY KEY (job_id, segment_id))"
+        )
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_transcript_segment_tsv ON transcript_segment USING GIN (tsv)")
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_transcript_segment_user ON transcript_segment (user_id)")
+    elif conn.dialect.name == 'sqlite':
+        conn.exec_driver_sql(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS transcript_segment USING fts5("
+            "text, job_id UNINDEXED, segment_id UNINDEXED, user_id UNINDEXED, "
+            "start_time UNINDEXED, end_time UNINDEXED, words UNINDEXED)"
+        )
+
+
+MIGRATIONS = [
+    (1, 'baseline tables', _baseline),
+    (2, 'subtitle position columns', _subtitle_position),
+    (3, 'editor JSON columns', _editor_json_columns),
+    (4, 'preview proxy column', _preview_proxy),
+    (5, 'processing batch link', _batch_id),
+    (6, 'columnar caption blob', _caption_blob),
+    (7, 'caption version counter', _captions_version),
+    (8, 'user subscription tier', _subscription_tier),
+    (9, 'job history indexes', _job_history_indexes),
+    (10, 'transcript search index', _transcript_search),
+]
+
+
+def _ensure_migrations_table(conn):
+    conn.exec_driver_sql(
+        f"CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} ("
+        "version INTEGER PRIMARY KEY, name VARCHAR(128) NOT NULL, applied_at TIMESTAMP NOT NULL)"
+    )
+
+
+def applied_versions(conn):
+    _ensure_migrations_table(conn)
+    return {row[0] for row in conn.exec_driver_sql(f"SELECT version FROM {MIGRATIONS_TABLE}")}
+
+
+def pending_migrations(conn):
+    applied = applied_versions(conn)
+    return [m for m in MIGRATIONS if m[0] not in applied]
+
+
+def run_migrations(logger=None):
+    """
+    Apply pending migrations, each in its own transaction together with its
+    schema_migrations row. Returns the versions applied by this run.
+    """
+    from app import app, db
+
+    log = logger or app.logger
+    applied_now = []
+    try:
+        with app.app_context(), db.engine.connect() as lock_conn:
+            postgres = lock_conn.dialect.name == 'postgresql'
+            if postgres:
+                # Held for the whole run; a concurrent runner waits, then finds nothing pending
+                lock_conn.exec_driver_sql(f"SELECT pg_advisory_lock({MIGRATION_LOCK_ID})")
+            try:
+                with db.engine.begin() as conn:
+                    pending = pending_migrations(conn)
+                for version, name, step in pending:
+                    with db.engine.begin() as conn:
+                        step(conn)
+                        conn.execute(
+                            text(f"INSERT INTO {MIGRATIONS_TABLE} (version, name, applied_at) VALUES (:version, :name, :applied_at)"),
+                            {"version": version, "name": name, "applied_at": datetime.utcnow()}
+                        )
+                    log.info(f"Applied migration {version}: {name}")
+                    applied_now.append(version)
+            finally:
+                if postgres:
+                    lock_conn.exec_driver_sql(f"SELECT pg_advisory_unlock({MIGRATION_LOCK_ID})")
+                    lock_conn.commit()
+    finally:
+        # Don't leave pooled sockets behind for whatever process runs next (or forks)
+        with app.app_context():
+            db.engine.dispose()
+    return applied_now
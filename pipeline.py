@@ -0,0 +1,579 @@
+import os
+import json
+import shutil
+import functools
+from datetime import date
+from rq import Retry, get_current_job
+from redis_pool import redis_round_trips
+from job_control import JobCancelled, run_ffmpeg, is_cancel_requested, raise_if_cancelled, release_submission
+from lifecycle import track_artifact, delete_artifact, delete_job_artifacts
+from transcript_search import index_transcript
+from quota import refund_job_try
+
+# Declarative post-upload pipeline layered over RQ job dependencies.
+#
+# Each stage is (name, task path, [stages it depends on]) with an optional
+# fourth element of enqueue options (currently `retries`). Stages whose
+# dependencies are all satisfied are released by RQ at the same time, so
+# independent branches run in parallel on however many workers are listening.
+#
+# Stages never hand large payloads to each other through job return values.
+# Anything a downstream stage needs is written to disk (or the DB) and only a
+# small reference is recorded in the job's artifact hash in Redis.
+TRANSCRIPTION_PIPELINE = [
+    ('probe', 'pipeline.probe_stage', []),
+    ('extract_audio', 'pipeline.extract_audio_stage', ['probe']),
+    # Transcription checkpoints as it goes, so retries resume instead of restarting
+    ('transcribe', 'pipeline.transcribe_stage', ['extract_audio'], {'retries': 2}),
+    ('auto_effects', 'pipeline.auto_effects_stage', ['transcribe']),
+    # Runs alongside audio extraction and transcription once probing passed
+    ('preview_proxy', 'pipeline.preview_proxy_stage', ['probe']),
+    ('thumbnails', 'pipeline.thumbnails_stage', ['probe']),
+    ('waveform', 'pipeline.waveform_stage', ['extract_audio']),
+    ('finalize', 'pipeline.finalize_stage', ['auto_effects', 'preview_proxy', 'thumbnails', 'waveform']),
+]
+
+# Batch auto-export: render with the batch's style as soon as captions and effects exist
+AUTO_EXPORT_PIPELINE = TRANSCRIPTION_PIPELINE + [
+    ('auto_export', 'pipeline.auto_export_stage', ['auto_effects']),
+]
+
+STAGES_BY_NAME = {stage[0]: stage for stage in AUTO_EXPORT_PIPELINE}
+
+# Editor preview proxy: small H.264 with a keyframe every 0.5 s so seeking and
+# scrubbing land on a keyframe almost immediately. Exports keep using the original.
+PROXY_SHORT_SIDE = 540
+PROXY_KEYFRAME_INTERVAL = 0.5
+
+# Timeline thumbnail sprite sheets: one decode pass, one sheet series per zoom
+# level (seconds between thumbnails), TILE_COLUMNS x TILE_ROWS cells per sheet.
+SPRITE_LEVELS = [1, 5, 20]
+SPRITE_THUMB_WIDTH = 160
+SPRITE_TILE_COLUMNS = 10
+SPRITE_TILE_ROWS = 10
+
+ARTIFACT_TTL_SECONDS = 24 * 3600
+BATCH_EXPORTS_TTL_SECONDS = 7 * 24 * 3600
+
+
+def stage_job_id(job_id, stage_name):
+    return f"{job_id}_{stage_name}"
+
+
+def batch_exports_key(batch_id):
+    """job id -> export id of every auto-export a batch has queued."""
+    return f"batch_exports:{batch_id}"
+
+
+def artifacts_key(job_id):
+    return f"pipeline_artifacts:{job_id}"
+
+
+def pcm_path(job_id):
+    """The job's normalized audio artifact; it lives as long as the job, not just the pipeline run."""
+    from app import app
+    return os.path.join(app.config['UPLOAD_FOLDER'], 'audio', f"{job_id}.wav")
+
+
+def job_work_dir(job_id):
+    """Per-job scratch directory shared by all stages of a pipeline run."""
+    from app import app
+    work_dir = os.path.join(app.config['UPLOAD_FOLDER'], 'work', job_id)
+    os.makedirs(work_dir, exist_ok=True)
+    return work_dir
+
+
+def enqueue_pipeline(queue, job_id, params, stages=TRANSCRIPTION_PIPELINE, job_timeout='1h'):
+    """
+    Enqueue every stage of a pipeline up front, wiring them together with
+    depends_on. Returns a dict of stage name -> RQ job.
+    The stage names are recorded in the params every stage receives, so status
+    and cancel calls can later find the exact set of stages that was enqueued.
+    """
+    params = {**params, 'stages': [name for name, *_ in stages]}
+    enqueued = {}
+    for name, func, depends_on, *options in stages:
+        options = options[0] if options else {}
+        missing = [dep for dep in depends_on if dep not in enqueued]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown or later stages: {missing}")
+        enqueued[name] = queue.enqueue(
+            func,
+            job_id,
+            params,
+            job_id=stage_job_id(job_id, name),
+            depends_on=[enqueued[dep] for dep in depends_on] or None,
+            job_timeout=job_timeout,
+            retry=Retry(max=options['retries'], interval=[10, 60]) if options.get('retries') else None,
+            description=f"{name} for job {job_id}"
+        )
+    return enqueued
+
+
+def pipeline_status(queue, job_id, stages=TRANSCRIPTION_PIPELINE):
+    """
+    Summarise the RQ state of a pipeline run as (status, stage). The stage is
+    the one currently doing work, or the first one that failed.
+    """
+    statuses = []
+    for name, *_ in stages:
+        rq_job = queue.fetch_job(stage_job_id(job_id, name))
+        statuses.append((name, rq_job.get_status() if rq_job else None))
+
+    for wanted in ('failed', 'started', 'queued', 'deferred'):
+        for name, status in statuses:
+            if status == wanted:
+                return status, name
+    if statuses and all(status == 'finished' for _, status in statuses):
+        return 'finished', statuses[-1][0]
+    return 'unknown', None
+
+
+def save_artifact(redis_conn, job_id, name, value):
+    key = artifacts_key(job_id)
+    pipe = redis_conn.pipeline()
+    pipe.hset(key, name, json.dumps(value))
+    pipe.expire(key, ARTIFACT_TTL_SECONDS)
+    pipe.execute()
+
+
+def load_artifact(redis_conn, job_id, name):
+    raw = redis_conn.hget(artifacts_key(job_id), name)
+    if raw is None:
+        raise RuntimeError(f"Artifact '{name}' missing for job {job_id}")
+    return json.loads(raw)
+
+
+def metrics_key(job_id):
+    return f"pipeline_metrics:{job_id}"
+
+
+def record_stage_metrics(redis_conn, job_id, stage_func_name, round_trips):
+    """Record how many Redis round trips a stage made (this write included)."""
+    key = metrics_key(job_id)
+    pipe = redis_conn.pipeline(transaction=True)
+    pipe.hset(key, f"{stage_func_name}_redis_round_trips", round_trips + 1)
+    pipe.hincrby(key, 'redis_round_trips', round_trips + 1)
+    pipe.expire(key, ARTIFACT_TTL_SECONDS)
+    pipe.execute()
+
+
+def cleanup_pipeline(redis_conn, job_id):
+    from app import app
+    redis_conn.delete(artifacts_key(job_id))
+    shutil.rmtree(os.path.join(app.config['UPLOAD_FOLDER'], 'work', job_id), ignore_errors=True)
+
+
+def cancel_pipeline(queue, job_id, stages=TRANSCRIPTION_PIPELINE):
+    """
+    Drop every stage that has not started yet. Returns True if a stage is still
+    running; that stage sees the cancel flag itself and cleans up on its way out.
+    """
+    running = False
+    for name, *_ in stages:
+        rq_job = queue.fetch_job(stage_job_id(job_id, name))
+        if not rq_job:
+            continue
+        status = rq_job.get_status()
+        if status == 'started':
+            running = True
+        elif status in ('queued', 'deferred', 'scheduled'):
+            rq_job.cancel()
+    return running
+
+
+def pipeline_params(queue, job_id, stages=TRANSCRIPTION_PIPELINE):
+    """The params dict a pipeline was enqueued with, read back from its first stage."""
+    rq_job = queue.fetch_job(stage_job_id(job_id, stages[0][0]))
+    return rq_job.args[1] if rq_job and len(rq_job.args) > 1 else {}
+
+
+def pipeline_stages(params):
+    """The stages a pipeline was enqueued with, from its params (see enqueue_pipeline)."""
+    if params.get('stages'):
+        return [STAGES_BY_NAME[name] for name in params['stages'] if name in STAGES_BY_NAME]
+    # Enqueued before the stage names were recorded
+    return AUTO_EXPORT_PIPELINE if params.get('auto_export') else TRANSCRIPTION_PIPELINE
+
+
+def cancel_auto_export(redis_conn, job_id, params):
+    """Cancel the export a batch job's auto_export stage already queued, if any."""
+    from app import abort_export
+    if not params.get('batch_id'):
+        return
+    export_id = redis_conn.hget(batch_exports_key(params['batch_id']), job_id)
+    if export_id:
+        abort_export(job_id, export_id.decode())
+
+
+def refund_pipeline_try(redis_conn, job_id, params):
+    """A job that never produced a transcript does not count against the daily quota."""
+    if params and params.get('user_id') is not None:
+        day = date.fromisoformat(params['reserved_on']) if params.get('reserved_on') else None
+        refund_job_try(redis_conn, job_id, params['user_id'], day)
+
+
+def discard_cancelled_job(redis_conn, job_id, original_filepath, params=None):
+    """
+    Remove everything a cancelled job left behind: scratch files, checkpoint,
+    dedup claim and the upload. With the pipeline params its daily try is
+    refunded too.
+    """
+    from app import storage, media_key, clear_transcribe_checkpoint
+    params = params or {}
+    cleanup_pipeline(redis_conn, job_id)
+    clear_transcribe_checkpoint(job_id)
+    release_submission(redis_conn, params.get('dedup_key'), job_id)
+    refund_pipeline_try(redis_conn, job_id, params)
+    delete_job_artifacts(redis_conn, job_id)
+    # Anything left untracked (the job was cancelled before it was registered)
+    if os.path.exists(pcm_path(job_id)):
+        os.remove(pcm_path(job_id))
+    for path in (original_filepath, proxy_path(job_id), sprites_dir(job_id), waveform_path(job_id)):
+        if path:
+            storage.delete(media_key(path))
+
+
+def local_original(params):
+    """A local file for the job's original upload, fetched through the storage read-through cache."""
+    from app import storage, media_key
+    return storage.local_path(media_key(params['original_filepath']))
+
+
+def publish_media(path):
+    """Hand a finished file or directory to storage (a no-op for local storage, where it already sits)."""
+    from app import storage, media_key
+    if os.path.isdir(path):
+        # Index files go last so their presence means the whole set is published
+        names = sorted(os.listdir(path), key=lambda name: name == 'index.json')
+        for name in names:
+            storage.put(media_key(os.path.join(path, name)), os.path.join(path, name), move=True)
+        if not os.listdir(path):
+            os.rmdir(path)
+    else:
+        storage.put(media_key(path), path, move=True)
+
+
+def _stage(func):
+    """Skip a stage whose job was cancelled and tidy up if it is cancelled mid-run."""
+    @functools.wraps(func)
+    def wrapper(job_id, params):
+        from app import app, db, redis_conn, VideoProcessingJob
+        round_trips_at_start = redis_round_trips()
+        try:
+            raise_if_cancelled(redis_conn, job_id)
+            return func(job_id, params)
+        except JobCancelled:
+            with app.app_context():
+                app.logger.info(f"Pipeline for job {job_id} cancelled during {func.__name__}")
+                job_entry = VideoProcessingJob.query.get(job_id)
+                if job_entry and job_entry.status != 'cancelled':
+                    job_entry.status = 'cancelled'
+                    db.session.commit()
+                discard_cancelled_job(redis_conn, job_id, params.get('original_filepath'), params)
+            raise
+        finally:
+            record_stage_metrics(redis_conn, job_id, func.__name__, redis_round_trips() - round_trips_at_start)
+    return wrapper
+
+
+def _fail_job(job_id, params, message):
+    """Mark the DB row failed and raise so RQ keeps dependent stages from running."""
+    from app import app, db, VideoProcessingJob, redis_conn
+    app.logger.error(f"Pipeline failed for job {job_id}: {message}")
+    job_entry = VideoProcessingJob.query.get(job_id)
+    if job_entry:
+        job_entry.status = 'failed'
+        db.session.commit()
+    cleanup_pipeline(redis_conn, job_id)
+    # A failed job is never transcribed again, so nothing will read its audio
+    from app import media_key
+    delete_artifact(redis_conn, media_key(pcm_path(job_id)), {"job_id": job_id, "tier": "audio"})
+    release_submission(redis_conn, params.get('dedup_key'), job_id)
+    refund_pipeline_try(redis_conn, job_id, params)
+    raise RuntimeError(message)
+
+
+@_stage
+def probe_stage(job_id, params):
+    from app import app, redis_conn, get_video_duration, get_video_dimensions
+
+    with app.app_context():
+        filepath = local_original(params)
+        video_duration = get_video_duration(filepath)
+        if video_duration is None:
+            _fail_job(job_id, params, "Could not determine video duration. Is ffprobe installed?")
+
+        max_duration = params['user_max_duration']
+        if video_duration > max_duration * 60:
+            _fail_job(job_id, params, f"Video duration ({video_duration / 60:.1f} min) exceeds your limit of {max_duration} minutes.")
+
+        dimensions = get_video_dimensions(filepath)
+        width, height = dimensions if dimensions else (None, None)
+
+        probe = {"duration": video_duration, "width": width, "height": height}
+        save_artifact(redis_conn, job_id, 'probe', probe)
+        return probe
+
+
+@_stage
+def extract_audio_stage(job_id, params):
+    from app import app, redis_conn, media_key
+    from audio_pcm import extract_pcm
+
+    with app.app_context():
+        audio_filepath = pcm_path(job_id)
+        os.makedirs(os.path.dirname(audio_filepath), exist_ok=True)
+        # The only decode of the audio track: transcription, word-level
+        # transcription and waveform analysis all map this one file.
+        app.logger.info(f"Extracting normalized audio for job {job_id}")
+        returncode, output = extract_pcm(local_original(params), audio_filepath, redis_conn=redis_conn, cancel_id=job_id)
+        if returncode != 0:
+            _fail_job(job_id, params, f"FFmpeg audio extraction error: {output}")
+
+        track_artifact(redis_conn, job_id, media_key(audio_filepath), 'audio')
+        save_artifact(redis_conn, job_id, 'audio', {"path": audio_filepath})
+        return {"audio": audio_filepath}
+
+
+@_stage
+def transcribe_stage(job_id, params):
+    from app import app, db, redis_conn, VideoProcessingJob, transcribe_audio_file, clear_transcribe_checkpoint
+
+    with app.app_context():
+        audio_filepath = load_artifact(redis_conn, job_id, 'audio')['path']
+        try:
+            word_level_captions = transcribe_audio_file(audio_filepath, params.get('language'), checkpoint_id=job_id, cancel_id=job_id)
+        except JobCancelled:
+            raise
+        except Exception as e:
+            rq_job = get_current_job()
+            if rq_job and rq_job.retries_left:
+                # Keep the audio, artifacts and checkpoint; the retry resumes from them.
+                app.logger.warning(f"Transcription for job {job_id} failed, will retry from checkpoint: {e}")
+                raise
+            clear_transcribe_checkpoint(job_id)
+            _fail_job(job_id, params, f"An unexpected error occurred during transcription: {e}")
+
+        job_entry = VideoProcessingJob.query.get(job_id)
+        if not job_entry:
+            _fail_job(job_id, params, "VideoProcessingJob not found after transcription.")
+        job_entry.set_captions(word_level_captions)
+        # Indexed in the same transaction, so a transcribed job is always searchable
+        index_transcript(db.session, job_id, job_entry.user_id, word_level_captions)
+        job_entry.generated_srt_filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{job_id}_word_level_data.json")
+        job_entry.status = 'transcribed'
+        db.session.commit()
+        clear_transcribe_checkpoint(job_id)
+        # Transcription is what duplicates would have waited for; new uploads of the same file start fresh
+        release_submission(redis_conn, params.get('dedup_key'), job_id)
+
+        # Captions live in the DB row; downstream stages only need to know they exist.
+        save_artifact(redis_conn, job_id, 'captions', {"segments": len(word_level_captions)})
+        return {"status": "transcribed", "segments": len(word_level_captions)}
+
+
+def _clean_word(text):
+    return text.strip().strip('.,!?;:"\'').lower()
+
+
+@_stage
+def auto_effects_stage(job_id, params):
+    from app import app, db, redis_conn, VideoProcessingJob, KEYWORD_STOP_WORDS, build_keyword_effects
+
+    with app.app_context():
+        job_entry = VideoProcessingJob.query.get(job_id)
+        if not job_entry or not job_entry.has_captions():
+            return {"zoom_effects": 0, "sound_effects": 0}
+
+        captions = job_entry.get_captions()
+        video_duration = load_artifact(redis_conn, job_id, 'probe')['duration']
+
+        # Flag the longest meaningful word of each segment as its keyword.
+        for segment in captions:
+            candidates = [
+                word for word in segment.get('words', [])
+                if len(_clean_word(word['text'])) > 3 and _clean_word(word['text']) not in KEYWORD_STOP_WORDS
+            ]
+            if candidates:
+                max(candidates, key=lambda w: len(_clean_word(w['text'])))['isKeyword'] = True
+
+        zoom_effects, sound_effects = build_keyword_effects(captions, video_duration)
+        job_entry.zoom_effects_json = json.dumps(zoom_effects)
+        job_entry.sound_effects_json = json.dumps(sound_effects)
+        db.session.commit()
+
+        return {"zoom_effects": len(zoom_effects), "sound_effects": len(sound_effects)}
+
+
+def proxy_path(job_id):
+    from app import app
+    return os.path.join(app.config['UPLOAD_FOLDER'], f"proxy_{job_id}.mp4")
+
+
+@_stage
+def preview_proxy_stage(job_id, params):
+    from app import app, db, redis_conn, media_key, VideoProcessingJob
+
+    with app.app_context():
+        final_path = proxy_path(job_id)
+        partial_path = os.path.join(job_work_dir(job_id), 'proxy.mp4')
+        # Scale the short side down to PROXY_SHORT_SIDE (never up), keep the aspect ratio
+        scale = (
+            f"scale='if(gt(iw,ih),-2,min({PROXY_SHORT_SIDE},iw))':"
+            f"'if(gt(iw,ih),min({PROXY_SHORT_SIDE},ih),-2)'"
+        )
+        cmd = [
+            "ffmpeg", "-y", "-threads", "2",
+            "-i", local_original(params),
+            "-vf", scale,
+            "-c:v", "libx264", "-preset", "veryfast", "-crf", "28",
+            "-pix_fmt", "yuv420p",
+            "-force_key_frames", f"expr:gte(t,n_forced*{PROXY_KEYFRAME_INTERVAL})",
+            "-sc_threshold", "0",
+            "-c:a", "aac", "-b:a", "96k", "-ac", "2",
+            "-movflags", "+faststart",
+            partial_path
+        ]
+        returncode, output = run_ffmpeg(cmd, redis_conn=redis_conn, cancel_id=job_id)
+        if returncode != 0:
+            # The editor falls back to the original, so a failed proxy never fails the job
+            app.logger.warning(f"Preview proxy failed for job {job_id}: {output}")
+            return {"preview_proxy": None}
+
+        # Publish under the final name only once it is complete
+        os.replace(partial_path, final_path)
+        track_artifact(redis_conn, job_id, media_key(final_path), 'editor')
+        publish_media(final_path)
+        job_entry = VideoProcessingJob.query.get(job_id)
+        if job_entry:
+            job_entry.preview_proxy_filepath = final_path
+            db.session.commit()
+        save_artifact(redis_conn, job_id, 'preview_proxy', {"path": final_path})
+        return {"preview_proxy": final_path}
+
+
+def sprites_dir(job_id):
+    from app import app
+    return os.path.join(app.config['UPLOAD_FOLDER'], 'sprites', job_id)
+
+
+@_stage
+def thumbnails_stage(job_id, params):
+    from app import app, redis_conn, media_key
+
+    with app.app_context():
+        probe = load_artifact(redis_conn, job_id, 'probe')
+        width, height, duration = probe['width'], probe['height'], probe['duration']
+        if not width or not height:
+            app.logger.warning(f"Skipping thumbnails for job {job_id}: unknown video dimensions")
+            return {"thumbnails": None}
+        thumb_height = max(2, int(round(SPRITE_THUMB_WIDTH * height / width / 2)) * 2)
+
+        partial_dir = os.path.join(job_work_dir(job_id), 'sprites')
+        shutil.rmtree(partial_dir, ignore_errors=True)
+        os.makedirs(partial_dir)
+
+        # Decode once, split the frames and sample/tile each branch at its own rate
+        branches = [f"[v{i}]" for i in range(len(SPRITE_LEVELS))]
+        filter_graph = f"[0:v]scale={SPRITE_THUMB_WIDTH}:{thumb_height},split={len(SPRITE_LEVELS)}{''.join(branches)}"
+        cmd = ["ffmpeg", "-y", "-threads", "2", "-i", local_original(params)]
+        outputs = []
+        for i, interval in enumerate(SPRITE_LEVELS):
+            filter_graph += f";{branches[i]}fps=1/{interval},tile={SPRITE_TILE_COLUMNS}x{SPRITE_TILE_ROWS}[s{i}]"
+            outputs += ["-map", f"[s{i}]", "-q:v", "5", os.path.join(partial_dir, f"sprite_{interval}s_%03d.jpg")]
+        cmd += ["-filter_complex", filter_graph] + outputs
+
+        returncode, output = run_ffmpeg(cmd, redis_conn=redis_conn, cancel_id=job_id)
+        if returncode != 0:
+            # Thumbnails are cosmetic; the timeline works without them
+            app.logger.warning(f"Thumbnail sprites failed for job {job_id}: {output}")
+            return {"thumbnails": None}
+
+        per_sheet = SPRITE_TILE_COLUMNS * SPRITE_TILE_ROWS
+        levels = []
+        for interval in SPRITE_LEVELS:
+            count = max(1, int(duration // interval) + 1)
+            sheets = sorted(name for name in os.listdir(partial_dir) if name.startswith(f"sprite_{interval}s_"))
+            levels.append({
+                "interval": interval,
+                "count": count,
+                "sheets": sheets,
+                "columns": SPRITE_TILE_COLUMNS,
+                "rows": SPRITE_TILE_ROWS,
+                "thumb_width": SPRITE_THUMB_WIDTH,
+                "thumb_height": thumb_height
+            })
+        # Cell for time t at a level: i = floor(t / interval); sheet = i // (columns * rows);
+        # cell = i % (columns * rows); column = cell % columns; row = cell // columns
+        index = {"duration": duration, "per_sheet": per_sheet, "levels": levels}
+        with open(os.path.join(partial_dir, 'index.json'), 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+
+        final_dir = sprites_dir(job_id)
+        shutil.rmtree(final_dir, ignore_errors=True)
+        os.makedirs(os.path.dirname(final_dir), exist_ok=True)
+        os.replace(partial_dir, final_dir)
+        track_artifact(redis_conn, job_id, media_key(final_dir), 'editor')
+        publish_media(final_dir)
+        save_artifact(redis_conn, job_id, 'thumbnails', {"path": final_dir})
+        return {"thumbnails": final_dir}
+
+
+def waveform_path(job_id):
+    from app import app
+    return os.path.join(app.config['UPLOAD_FOLDER'], 'waveforms', f"{job_id}.peaks")
+
+
+@_stage
+def waveform_stage(job_id, params):
+    from app import app, redis_conn, media_key
+    from waveform import write_peaks_file
+
+    with app.app_context():
+        audio_filepath = load_artifact(redis_conn, job_id, 'audio')['path']
+        out_path = waveform_path(job_id)
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        try:
+            header = write_peaks_file(audio_filepath, out_path)
+        except Exception as e:
+            # The timeline simply has no waveform; captions are unaffected
+            app.logger.warning(f"Waveform peaks failed for job {job_id}: {e}")
+            return {"waveform": None}
+        track_artifact(redis_conn, job_id, media_key(out_path), 'editor')
+        publish_media(out_path)
+        save_artifact(redis_conn, job_id, 'waveform', {"path": out_path})
+        return {"waveform": out_path, "levels": len(header["levels"])}
+
+
+@_stage
+def auto_export_stage(job_id, params):
+    from app import app, redis_conn, VideoProcessingJob, queue_export, abort_export
+
+    with app.app_context():
+        job_entry = VideoProcessingJob.query.get(job_id)
+        if not job_entry or not job_entry.has_captions():
+            return {"export_id": None}
+
+        auto_export = params['auto_export']
+        export = queue_export(job_entry, None, auto_export['style'], auto_export['settings'])
+        key = batch_exports_key(params['batch_id'])
+        pipe = redis_conn.pipeline(transaction=True)
+        pipe.hset(key, job_id, export['export_id'])
+        pipe.expire(key, BATCH_EXPORTS_TTL_SECONDS)
+        pipe.execute()
+        # Cancelled while the export was being queued: the cancel route may have
+        # looked for it before it was recorded
+        if is_cancel_requested(redis_conn, job_id):
+            abort_export(job_id, export['export_id'])
+            raise_if_cancelled(redis_conn, job_id)
+        return export
+
+
+@_stage
+def finalize_stage(job_id, params):
+    from app import app, redis_conn
+
+    with app.app_context():
+        cleanup_pipeline(redis_conn, job_id)
+        return {"status": "finished"}
@@ -0,0 +1,158 @@
+import redis
+from datetime import date, datetime, timedelta
+
+# Daily upload quota and usage accounting.
+#
+# The per-user, per-day try counter lives in Redis and is checked and bumped by
+# one Lua script, so concurrent uploads can never both squeeze under the limit
+# and no request does a read-modify-write on the User row. The key is named
+# after the day and expires just after it ends, which is the daily reset.
+#
+# UsageLog rows are durable history, not part of the request path: increments
+# accumulate in a Redis hash and a scheduled job folds them into the table in
+# one transaction per flush.
+USAGE_FLUSH_INTERVAL_SECONDS = 60
+USAGE_PENDING_KEY = 'usage_pending'
+USAGE_FLUSHING_KEY = 'usage_flushing'
+USAGE_FLUSH_SCHEDULED_KEY = 'usage_flush_scheduled'
+# A job's try is refunded at most once, however many failure paths it takes
+JOB_REFUND_MARKER_TTL_SECONDS = 2 * 24 * 3600
+
+# KEYS[1] counter; ARGV: count, limit (-1 = unlimited), expire-at, seed for a fresh counter.
+# Returns the new count, or -1 if it would exceed the limit (nothing is reserved then).
+_RESERVE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  redis.call('SET', KEYS[1], ARGV[4])
+end
+local used = redis.call('INCRBY', KEYS[1], ARGV[1])
+redis.call('EXPIREAT', KEYS[1], ARGV[3])
+local limit = tonumber(ARGV[2])
+if limit >= 0 and used > limit then
+  redis.call('DECRBY', KEYS[1], ARGV[1])
+  return -1
+end
+return used
+"""
+
+# KEYS[1] counter; ARGV[1] count. Never goes below zero.
+_REFUND_SCRIPT = """
+local used = tonumber(redis.call('GET', KEYS[1]) or '0')
+if used <= 0 then
+  return 0
+end
+local refunded = math.min(used, tonumber(ARGV[1]))
+return redis.call('DECRBY', KEYS[1], refunded)
+"""
+
+
+def daily_tries_key(user_id, day=None):
+    return f"quota:daily_tries:{user_id}:{(day or date.today()).isoformat()}"
+
+
+def _day_end_timestamp(day):
+    # An hour of slack past midnight, so a counter never vanishes while its day is still current
+    return int(datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp()) + 3600
+
+
+def daily_tries_used(redis_conn, user_id):
+    return int(redis_conn.get(daily_tries_key(user_id)) or 0)
+
+
+def reserve_daily_tries(redis_conn, user_id, limit, count=1, seed=0):
+    """
+    Atomically take `count` tries from today's quota. Returns the number used
+    today including these, or None if that would exceed `limit` (-1 means no
+    limit). `seed` initializes a counter Redis has not seen yet today, e.g.
+    from the legacy User columns.
+    """
+    day = date.today()
+    used = redis_conn.eval(_RESERVE_SCRIPT, 1, daily_tries_key(user_id, day), count, limit, _day_end_timestamp(day), seed)
+    return None if used < 0 else used
+
+
+def refund_daily_tries(redis_conn, user_id, count=1, day=None):
+    """Give back tries reserved for work that never started."""
+    return redis_conn.eval(_REFUND_SCRIPT, 1, daily_tries_key(user_id, day), count)
+
+
+def refund_job_try(redis_conn, job_id, user_id, day=None):
+    """
+    Give back the try a job reserved when its upload was accepted, because the
+    job failed or was cancelled. Only the first call per job refunds anything.
+    """
+    if not redis_conn.set(f"quota:refunded:{job_id}", 1, nx=True, ex=JOB_REFUND_MARKER_TTL_SECONDS):
+        return None
+    return refund_daily_tries(redis_conn, user_id, day=day)
+
+
+def record_usage(redis_conn, user_id, count=1, day=None):
+    """Count processed videos; flush_usage() writes them to UsageLog later."""
+    redis_conn.hincrby(USAGE_PENDING_KEY, f"{user_id}:{(day or date.today()).isoformat()}", count)
+
+
+def pending_usage(redis_conn, user_id, day=None):
+    """Processed videos counted but not yet flushed to UsageLog."""
+    field = f"{user_id}:{(day or date.today()).isoformat()}"
+    values = redis_conn.pipeline().hget(USAGE_PENDING_KEY, field).hget(USAGE_FLUSHING_KEY, field).execute()
+    return sum(int(value or 0) for value in values)
+
+
+def flush_usage(redis_conn):
+    """
+    Fold pending usage into UsageLog in one transaction. The pending hash is
+    renamed aside first, so increments arriving meanwhile start a new batch;
+    a batch left behind by a crashed flush is retried before a new one is taken.
+    Returns the number of (user, day) rows written.
+    """
+    from app import db, UsageLog
+
+    if not redis_conn.exists(USAGE_FLUSHING_KEY):
+        try:
+            redis_conn.rename(USAGE_PENDING_KEY, USAGE_FLUSHING_KEY)
+        except redis.ResponseError:
+            return 0  # Nothing pending
+    raw = redis_conn.hgetall(USAGE_FLUSHING_KEY)
+    counts = {}
+    for field, value in raw.items():
+        user_id, day = field.decode().split(':')
+        counts[(int(user_id), date.fromisoformat(day))] = int(value)
+
+    if counts:
+        user_ids = {user_id for user_id, _ in counts}
+        days = {day for _, day in counts}
+        existing = {
+            (row.user_id, row.date): row
+            for row in UsageLog.query.filter(UsageLog.user_id.in_(user_ids), UsageLog.date.in_(days))
+        }
+        for (user_id, day), count in counts.items():
+            row = existing.get((user_id, day))
+            if row:
+                row.videos_processed = (row.videos_processed or 0) + count
+            else:
+                db.session.add(UsageLog(user_id=user_id, date=day, videos_processed=count))
+        db.session.commit()
+    redis_conn.delete(USAGE_FLUSHING_KEY)
+    return len(counts)
+
+
+def schedule_usage_flush(redis_conn, queue, force=False):
+    """Keep exactly one flush scheduled, like lifecycle.schedule_disk_maintenance."""
+    marker_ttl = USAGE_FLUSH_INTERVAL_SECONDS * 2
+    if force:
+        redis_conn.set(USAGE_FLUSH_SCHEDULED_KEY, 1, ex=marker_ttl)
+    elif not redis_conn.set(USAGE_FLUSH_SCHEDULED_KEY, 1, nx=True, ex=marker_ttl):
+        return None
+    return queue.enqueue_in(timedelta(seconds=USAGE_FLUSH_INTERVAL_SECONDS), 'quota.usage_flush_task')
+
+
+def usage_flush_task():
+    """RQ task: flush usage, then schedule the next flush."""
+    from rq import Queue
+    from app import app, redis_conn
+
+    with app.app_context():
+        try:
+            rows = flush_usage(redis_conn)
+        finally:
+            schedule_usage_flush(redis_conn, Queue(connection=redis_conn), force=True)
+    return {"rows": rows}
@@ -0,0 +1,76 @@
+import os
+import json
+import redis
+from urllib.parse import urlparse
+
+# One explicitly sized connection pool per process, shared by the Flask app and
+# every task running in the worker. redis-py resets a pool whose pid changed,
+# so RQ's forked work horses get fresh sockets automatically. The RQ worker
+# loop itself gets a separate connection without a socket timeout (see
+# worker.py): its idle BLPOP blocks for minutes, far past REDIS_SOCKET_TIMEOUT.
+REDIS_MAX_CONNECTIONS = int(os.environ.get('REDIS_MAX_CONNECTIONS', 20))
+REDIS_POOL_TIMEOUT = float(os.environ.get('REDIS_POOL_TIMEOUT', 5))  # seconds to wait for a free connection
+REDIS_SOCKET_TIMEOUT = float(os.environ.get('REDIS_SOCKET_TIMEOUT', 10))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.environ.get('REDIS_HEALTH_CHECK_INTERVAL', 30))
+
+_round_trips = 0
+
+
+class _RoundTripCounter:
+    """Counts every packet sent to Redis; a pipeline is sent as one packet."""
+
+    def send_packed_command(self, command, check_health=True):
+        global _round_trips
+        _round_trips += 1
+        return super().send_packed_command(command, check_health)
+
+
+class CountingConnection(_RoundTripCounter, redis.Connection):
+    pass
+
+
+class CountingSSLConnection(_RoundTripCounter, redis.SSLConnection):
+    pass
+
+
+def redis_round_trips():
+    """Round trips made by this process so far. Diff two readings to measure a job."""
+    return _round_trips
+
+
+def create_redis_connection(url, socket_timeout=REDIS_SOCKET_TIMEOUT):
+    connection_class = CountingSSLConnection if urlparse(url).scheme == 'rediss' else CountingConnection
+    pool = redis.BlockingConnectionPool.from_url(
+        url,
+        connection_class=connection_class,
+        max_connections=REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_POOL_TIMEOUT,
+        socket_timeout=socket_timeout,
+        socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+        health_check_interval=REDIS_HEALTH_CHECK_INTERVAL
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+def write_status_snapshot(redis_conn, status_key, status, metrics_key, metrics, ttl=3600):
+    """
+    Write a job's status snapshot and its metrics hash atomically in a single
+    round trip (MULTI/EXEC pipeline), so readers never see one without the other.
+    """
+    pipe = redis_conn.pipeline(transaction=True)
+    pipe.setex(status_key, ttl, json.dumps(status))
+    pipe.hset(metrics_key, mapping=metrics)
+    pipe.hincrby(metrics_key, 'status_writes', 1)
+    pipe.expire(metrics_key, ttl)
+    pipe.execute()
+
+
+def read_status_snapshot(redis_conn, status_key, metrics_key):
+    """Read a status snapshot and its metrics back in one round trip."""
+    pipe = redis_conn.pipeline(transaction=False)
+    pipe.get(status_key)
+    pipe.hgetall(metrics_key)
+    raw_status, raw_metrics = pipe.execute()
+    status = json.loads(raw_status) if raw_status else None
+    metrics = {k.decode(): v.decode() for k, v in raw_metrics.items()}
+    return status, metrics
@@ -0,0 +1,379 @@
+import os
+import sys
+import json
+import subprocess
+
+import click
+
+# Benchmarks and load tests. Not part of the app: they create users, drop
+# tables and flood queues, so every run needs its own scratch database and
+# Redis, passed explicitly and never read from DATABASE_URL / REDIS_URL.
+#
+#   python scripts/bench.py --database-url sqlite:////tmp/bench.db \
+#       --redis-url redis://localhost:6390/15 startup-bench
+#
+# app.py reads its configuration at import time, so the scratch URLs are put
+# into the environment before anything imports it (here or in the gunicorn
+# and RQ processes a command starts).
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+# What app.py falls back to without DATABASE_URL / REDIS_URL
+APP_DEFAULTS = {'DATABASE_URL': 'sqlite:///app.db', 'REDIS_URL': 'redis://localhost:6379'}
+
+# Modules a web worker should never load; importing app must not pull them in
+ML_MODULES = ('faster_whisper', 'ctranslate2', 'onnxruntime', 'av', 'numpy')
+
+
+@click.group()
+@click.option('--database-url', required=True, help='Scratch database. Tables in it may be dropped.')
+@click.option('--redis-url', required=True, help='Scratch Redis. Queues in it will be flooded.')
+def cli(database_url, redis_url):
+    for name, scratch_url in (('DATABASE_URL', database_url), ('REDIS_URL', redis_url)):
+        if scratch_url == (os.environ.get(name) or APP_DEFAULTS[name]):
+            raise click.UsageError(f"The scratch {name.lower().replace('_', ' ')} is the one the app is configured with")
+    os.environ.pop('DATABASE_PUBLIC_URL', None)
+    os.environ['DATABASE_URL'] = database_url
+    os.environ['REDIS_URL'] = redis_url
+
+
+# Loaded by the gunicorn that startup-bench starts (`-c`): each hook appends one
+# JSON line to the report file named in the environment
+STARTUP_HOOKS = """
+import json, os, sys, time
+
+def _memory_mb():
+    fields = {}
+    with open('/proc/self/smaps_rollup') as smaps:
+        for line in smaps:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    return {
+        'rss_mb': fields.get('Rss'), 'pss_mb': fields.get('Pss'),
+        'private_mb': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+    }
+
+def _report(event, **fields):
+    with open(os.environ['STARTUP_BENCH_REPORT'], 'a') as report:
+        report.write(json.dumps({'event': event, 'pid': os.getpid(), **_memory_mb(), **fields}) + '\\n')
+
+def when_ready(server):
+    _report('master_ready', seconds=time.time() - float(os.environ['STARTUP_BENCH_STARTED']))
+
+def post_fork(server, worker):
+    worker.bench_forked_at = time.time()
+
+def post_worker_init(worker):
+    _report(
+        'worker_ready',
+        boot_seconds=time.time() - worker.bench_forked_at,
+        seconds=time.time() - float(os.environ['STARTUP_BENCH_STARTED']),
+        ml_modules=[m for m in %r if m in sys.modules]
+    )
+""" % (ML_MODULES,)
+
+
+@cli.command("startup-bench")
+@click.option('--workers', default=4, help='Gunicorn web workers to start.')
+@click.option('--preload/--no-preload', default=True, help='Import the app once in the master before forking (gunicorn --preload).')
+@click.option('--timeout', default=120, help='Seconds to wait for every worker to boot.')
+def startup_bench_command(workers, preload, timeout):
+    """
+    Starts `gunicorn app:app` (GUNICORN_CMD_ARGS is honoured, as in production)
+    and reports how long the master and each worker took to boot, each worker's
+    memory, and whether the ML stack got imported. Linux only (reads smaps_rollup).
+    RSS counts pages shared with the master; with --preload, private_mb is what
+    each extra worker really costs.
+    """
+    import time
+    import shutil
+    import socket
+    import tempfile
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    scratch = tempfile.mkdtemp(prefix='startup_bench_')
+    config_path, report_path = os.path.join(scratch, 'hooks.py'), os.path.join(scratch, 'report.jsonl')
+    with open(config_path, 'w') as config:
+        config.write(STARTUP_HOOKS)
+
+    command = [sys.executable, '-m', 'gunicorn', 'app:app', '-c', config_path, '-w', str(workers), '-b', f"127.0.0.1:{port}"]
+    if preload:
+        command.append('--preload')
+    env = {**os.environ, "STARTUP_BENCH_REPORT": report_path, "STARTUP_BENCH_STARTED": repr(time.time())}
+    process = subprocess.Popen(command, env=env, cwd=REPO_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    try:
+        deadline = time.time() + timeout
+        events = []
+        while time.time() < deadline:
+            if process.poll() is not None:
+                lines = process.stderr.read().strip().splitlines()
+                raise click.ClickException(lines[-1] if lines else "gunicorn exited on startup")
+            if os.path.exists(report_path):
+                with open(report_path) as report:
+                    events = [json.loads(line) for line in report if line.strip()]
+                if sum(1 for event in events if event['event'] == 'worker_ready') >= workers:
+                    break
+            time.sleep(0.2)
+        else:
+            raise click.ClickException(f"not every gunicorn worker booted within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    master = next((event for event in events if event['event'] == 'master_ready'), {})
+    booted = [event for event in events if event['event'] == 'worker_ready']
+    leaked = sorted({m for event in booted for m in event['ml_modules']})
+    print(json.dumps({
+        "workers": workers,
+        "preload": preload,
+        "master_ready_seconds": round(master.get('seconds', 0), 3),
+        "master_rss_mb": round(master.get('rss_mb') or 0, 1),
+        "all_workers_ready_seconds": round(max(event['seconds'] for event in booted), 3),
+        "per_worker": [{
+            "pid": event['pid'],
+            "boot_seconds": round(event['boot_seconds'], 3),
+            "rss_mb": round(event['rss_mb'] or 0, 1),
+            "pss_mb": round(event['pss_mb'] or 0, 1),
+            "private_mb": round(event['private_mb'], 1)
+        } for event in booted],
+        "ml_modules_loaded": leaked
+    }, indent=2))
+    if leaked:
+        raise click.ClickException(f"gunicorn workers loaded ML modules: {', '.join(leaked)}")
+
+
+@cli.command("jobs-bench")
+@click.option('--rows', default=1_000_000, help='Jobs to generate.')
+@click.option('--users', default=1000, help='Users the jobs are spread over.')
+def jobs_bench_command(rows, users):
+    """Times job-history pages (keyset vs OFFSET) on a generated table of `rows` jobs."""
+    import time
+    import uuid
+    import random
+    from datetime import datetime, timedelta
+    from sqlalchemy import create_engine, text
+    from app import db, User, ProcessingBatch, VideoProcessingJob, job_history_statement, JOB_HISTORY_PAGE_SIZE
+
+    engine = create_engine(os.environ['DATABASE_URL'])
+    tables = [User.__table__, ProcessingBatch.__table__, VideoProcessingJob.__table__]
+    db.metadata.drop_all(engine, tables=tables)
+    db.metadata.create_all(engine, tables=tables)
+
+    # A tenth of the jobs belong to one heavy user, the rest are spread evenly
+    heavy_user = 1
+    statuses = ['transcribed', 'editing', 'completed', 'failed']
+    started_at, now = time.time(), datetime.utcnow()
+    caption_filler = json.dumps([{"id": "segment_1", "text": "x" * 200, "words": []}])
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [{"id": i, "email": f"bench{i}@example.com", "subscription_tier": "free"} for i in range(1, users + 1)])
+        for chunk_start in range(0, rows, 10_000):
+            conn.execute(VideoProcessingJob.__table__.insert(), [{
+                "id": str(uuid.uuid4()),
+                "user_id": heavy_user if i % 10 == 0 else random.randint(2, users),
+                "original_video_filepath": f"uploads/{i}.mp4",
+                "original_filename": f"video_{i}.mp4",
+                "status": random.choice(statuses),
+                "created_at": now - timedelta(seconds=rows - i),
+                "updated_at": now,
+                "captions_version": 0,
+                "word_level_captions_json": caption_filler
+            } for i in range(chunk_start, min(rows, chunk_start + 10_000))])
+    print(f"Generated {rows} jobs in {time.time() - started_at:.1f}s")
+
+    def timed(label, stmt):
+        with engine.connect() as conn:
+            started = time.perf_counter()
+            result = conn.execute(stmt).all()
+            print(f"{label:<48} {1000 * (time.perf_counter() - started):8.2f} ms  ({len(result)} rows)")
+            return result
+
+    timed("first page", job_history_statement(heavy_user))
+    cursor = None
+    for _ in range(100):
+        page = job_history_statement(heavy_user, cursor=cursor)
+        with engine.connect() as conn:
+            last = conn.execute(page).all()[JOB_HISTORY_PAGE_SIZE - 1]
+        cursor = (last.created_at, last.id)
+    timed("page 101 by keyset cursor", job_history_statement(heavy_user, cursor=cursor))
+    timed("page 101 by OFFSET (for comparison)", job_history_statement(heavy_user).offset(100 * JOB_HISTORY_PAGE_SIZE))
+    timed("first page, status=failed", job_history_statement(heavy_user, statuses=['failed']))
+    timed("first page, last 7 days", job_history_statement(heavy_user, since=now - timedelta(days=7)))
+
+    if engine.dialect.name == 'sqlite':
+        with engine.connect() as conn:
+            plan = conn.execute(text("EXPLAIN QUERY PLAN " + str(job_history_statement(heavy_user).compile(engine, compile_kwargs={"literal_binds": True})))).all()
+        print("Plan:", "; ".join(row[-1] for row in plan))
+    engine.dispose()
+
+
+@cli.command("upstream-loadtest")
+@click.option('--requests', 'total', default=200, help='B-roll searches to send.')
+@click.option('--concurrency', default=50, help='Searches in flight at once.')
+@click.option('--upstream-delay', default=2.0, help='Seconds the stub upstream takes to answer.')
+@click.option('--web-workers', default=4, help='Sync gunicorn workers to start.')
+@click.option('--rq-workers', default=4, help='RQ workers to start.')
+@click.option('--respond-async/--sync', default=True, help='Poll the queued task, or send `Prefer: wait` and wait inline.')
+def upstream_loadtest_command(total, concurrency, upstream_delay, web_workers, rq_workers, respond_async):
+    """
+    Floods /api/broll/search while the stock API (a local stub) is slow, and
+    measures how fast gunicorn still accepts searches and serves other requests.
+    Migrates the scratch database and starts its own gunicorn and RQ workers on it.
+    """
+    import time
+    import uuid
+    import socket
+    import threading
+    import statistics
+    import requests as http
+    from concurrent.futures import ThreadPoolExecutor
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    from app import app, db, User
+    from migrations import run_migrations
+    from upstream import TASK_TIMEOUT_SECONDS
+
+    class StubUpstream(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(upstream_delay)
+            body = json.dumps({"videos": [{
+                "id": i, "image": "https://example.com/thumb.jpg", "duration": 5,
+                "video_files": [{"link": "https://example.com/clip.mp4"}]
+            } for i in range(8)]}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    def free_port():
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            return sock.getsockname()[1]
+
+    run_migrations()
+    stub = ThreadingHTTPServer(('127.0.0.1', 0), StubUpstream)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    env = {
+        **os.environ,
+        "PEXELS_API_KEY": "stub",
+        "PEXELS_API_URL": f"http://127.0.0.1:{stub.server_port}/videos/search",
+        "PIXABAY_API_KEY": ""
+    }
+    web_port = free_port()
+    base_url = f"http://127.0.0.1:{web_port}"
+    processes = [subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'app:app', '-w', str(web_workers), '-b', f"127.0.0.1:{web_port}"],
+        env=env, cwd=REPO_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )]
+    if respond_async:
+        processes += [
+            subprocess.Popen([sys.executable, 'worker.py'], env=env, cwd=REPO_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            for _ in range(rq_workers)
+        ]
+
+    email, password = f"loadtest-{uuid.uuid4().hex[:12]}@example.com", uuid.uuid4().hex
+    with app.app_context():
+        user = User(email=email, username=email.split('@')[0])
+        user.set_password(password)
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+    try:
+        session = http.Session()
+        session.mount('http://', http.adapters.HTTPAdapter(pool_maxsize=concurrency + 1))
+        for _ in range(120):
+            try:
+                if http.get(f"{base_url}/login", timeout=1).status_code == 200:
+                    break
+            except http.RequestException:
+                pass
+            time.sleep(0.5)
+        else:
+            raise click.ClickException("gunicorn did not come up")
+        session.post(f"{base_url}/login", data={"email": email, "password": password})
+        headers = {"Prefer": "respond-async"} if respond_async else {"Prefer": f"wait={TASK_TIMEOUT_SECONDS}"}
+        if respond_async:
+            # Give the RQ workers time to import the ML stack and start listening
+            time.sleep(5)
+            if any(process.poll() is not None for process in processes[1:]):
+                raise click.ClickException("an RQ worker exited on startup; run worker.py by hand to see why")
+
+        def search(i):
+            started = time.perf_counter()
+            # Unique queries, so the stock search cache never answers
+            response = session.get(f"{base_url}/api/broll/search", params={"q": f"loadtest {uuid.uuid4().hex} {i}"}, headers=headers)
+            accepted = time.perf_counter() - started
+            if response.status_code == 200:
+                return accepted, accepted, response.status_code
+            if response.status_code != 202:
+                return accepted, None, response.status_code
+            status_url = base_url + response.json()["status_url"]
+            # Past the task timeout a result is never coming
+            while time.perf_counter() - started < TASK_TIMEOUT_SECONDS + 30:
+                task = session.get(status_url).json()
+                if task["status"] in ('finished', 'failed'):
+                    return accepted, time.perf_counter() - started, task["status"]
+                time.sleep(0.2)
+            return accepted, None, 'timed out'
+
+        probe_latencies, done = [], threading.Event()
+
+        def probe():
+            # A cheap authenticated request competing for the same web workers
+            while not done.is_set():
+                started = time.perf_counter()
+                session.get(f"{base_url}/api/user_usage")
+                probe_latencies.append(time.perf_counter() - started)
+                time.sleep(0.1)
+
+        probe_thread = threading.Thread(target=probe, daemon=True)
+        probe_thread.start()
+        started_at = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            results = list(pool.map(search, range(total)))
+        elapsed = time.perf_counter() - started_at
+        done.set()
+        probe_thread.join()
+
+        def summary(values):
+            values = sorted(values)
+            if not values:
+                return None
+            return {
+                "p50_ms": round(1000 * statistics.median(values), 1),
+                "p95_ms": round(1000 * values[int(0.95 * (len(values) - 1))], 1),
+                "max_ms": round(1000 * values[-1], 1)
+            }
+
+        print(json.dumps({
+            "mode": "respond-async" if respond_async else "sync",
+            "requests": total,
+            "concurrency": concurrency,
+            "upstream_delay_seconds": upstream_delay,
+            "web_workers": web_workers,
+            "rq_workers": rq_workers if respond_async else 0,
+            "elapsed_seconds": round(elapsed, 1),
+            "accept_latency": summary([accepted for accepted, _, _ in results]),
+            "result_latency": summary([finished for _, finished, _ in results if finished is not None]),
+            "other_request_latency": summary(probe_latencies),
+            "outcomes": {str(outcome): sum(1 for *_, o in results if o == outcome) for outcome in {o for *_, o in results}}
+        }, indent=2))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=30)
+        stub.shutdown()
+        with app.app_context():
+            db.session.delete(db.session.get(User, user_id))
+            db.session.commit()
+
+
+if __name__ == '__main__':
+    cli()
@@ -0,0 +1,332 @@
+import os
+import errno
+import hmac
+import time
+import shutil
+import hashlib
+from urllib.parse import urlencode
+
+# Storage backends for originals, exports and editor media.
+#
+# Objects are addressed by key: their path relative to UPLOAD_FOLDER (e.g.
+# "3f2a..._clip.mp4", "sprites/<job_id>/index.json"), so the filepaths already
+# stored in the database map onto keys with storage_key().
+#
+# LocalStorage keeps today's single-host layout: the key *is* the file under
+# UPLOAD_FOLDER and every call is a plain filesystem operation. S3Storage
+# talks to any S3-compatible service (AWS, MinIO, or a local stand-in such as
+# `moto_server` via S3_ENDPOINT_URL), so web and worker nodes no longer need
+# a shared disk. Workers that need a real file for ffmpeg go through
+# CachedStorage, which keeps a size-bounded read-through copy on local disk.
+STORAGE_PRESIGN_EXPIRES = 3600
+MULTIPART_THRESHOLD = 16 * 1024 * 1024
+MULTIPART_CHUNK_SIZE = 16 * 1024 * 1024
+MULTIPART_CONCURRENCY = 8
+
+
+def storage_key(filepath, root):
+    """Key of a file under `root` (UPLOAD_FOLDER)."""
+    return os.path.relpath(os.path.abspath(filepath), os.path.abspath(root)).replace(os.sep, '/')
+
+
+class StorageBackend:
+    """put / get / ranged get / presigned URL / delete over keys."""
+
+    remote = False
+
+    def put(self, key, src_path, move=False):
+        raise NotImplementedError
+
+    def get(self, key, dest_path):
+        raise NotImplementedError
+
+    def staging_path(self, key):
+        """
+        Where a producer should write an object it will put() with move=True so
+        that the put is a rename, or None if any local scratch path will do.
+        """
+        return None
+
+    def get_range(self, key, start, end):
+        """Bytes [start, end] (inclusive, like an HTTP Range) of an object."""
+        raise NotImplementedError
+
+    def presigned_url(self, key, expires_in=STORAGE_PRESIGN_EXPIRES):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def exists(self, key):
+        raise NotImplementedError
+
+    def local_path(self, key):
+        """A local file holding the object, for tools like ffmpeg that need a path."""
+        raise NotImplementedError
+
+
+class LocalStorage(StorageBackend):
+    def __init__(self, root, secret_key, url_prefix='/storage'):
+        self.root = os.path.abspath(root)
+        self.secret_key = secret_key
+        self.url_prefix = url_prefix.rstrip('/')
+
+    def path(self, key):
+        path = os.path.abspath(os.path.join(self.root, key))
+        if os.path.commonpath([path, self.root]) != self.root:
+            raise ValueError(f"Storage key escapes the storage root: {key}")
+        return path
+
+    def put(self, key, src_path, move=False):
+        dest = self.path(key)
+        if os.path.abspath(src_path) == dest:
+            return  # Already written in place (the single-host case)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        if move:
+            try:
+                # Same filesystem: no bytes copied, and readers see the old name or the whole file
+                os.replace(src_path, dest)
+                return
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+        # Across filesystems: copy next to the destination, then rename into place
+        partial_path = f"{dest}.{os.getpid()}.partial"
+        try:
+            shutil.copyfile(src_path, partial_path)
+            os.replace(partial_path, dest)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        if move:
+            os.remove(src_path)
+
+    def staging_path(self, key):
+        # Same directory as the destination, hence the same filesystem
+        dest = self.path(key)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        return f"{dest}.{os.getpid()}.partial"
+
+    def get(self, key, dest_path):
+        if os.path.abspath(dest_path) != self.path(key):
+            shutil.copyfile(self.path(key), dest_path)
+
+    def get_range(self, key, start, end):
+        with open(self.path(key), 'rb') as f:
+            f.seek(start)
+            return f.read(end - start + 1)
+
+    def _signature(self, key, expires):
+        return hmac.new(self.secret_key.encode(), f"{key}:{expires}".encode(), hashlib.sha256).hexdigest()
+
+    def presigned_url(self, key, expires_in=STORAGE_PRESIGN_EXPIRES):
+        expires = int(time.time()) + expires_in
+        return f"{self.url_prefix}/{key}?" + urlencode({"expires": expires, "signature": self._signature(key, expires)})
+
+    def verify_presigned(self, key, expires, signature):
+        try:
+            expires = int(expires)
+        except (TypeError, ValueError):
+            return False
+        return expires >= time.time() and hmac.compare_digest(self._signature(key, expires), signature or '')
+
+    def delete(self, key):
+        path = self.path(key)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        elif os.path.exists(path):
+            os.remove(path)
+
+    def exists(self, key):
+        return os.path.exists(self.path(key))
+
+    def local_path(self, key):
+        return self.path(key)
+
+
+class S3Storage(StorageBackend):
+    """S3-compatible object storage. Large transfers are multipart and parallel."""
+
+    remote = True
+
+    def __init__(self, bucket, prefix='', endpoint_url=None, region=None, access_key_id=None, secret_access_key=None):
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+        self.client = boto3.client(
+            's3',
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key
+        )
+        # boto3 splits anything over the threshold into parts and moves them on a thread pool
+        self.transfer_config = TransferConfig(
+            multipart_threshold=MULTIPART_THRESHOLD,
+            multipart_chunksize=MULTIPART_CHUNK_SIZE,
+            max_concurrency=MULTIPART_CONCURRENCY,
+            use_threads=True
+        )
+
+    def object_key(self, key):
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def put(self, key, src_path, move=False):
+        content_type = 'video/mp4' if key.endswith('.mp4') else None
+        self.client.upload_file(
+            src_path, self.bucket, self.object_key(key),
+            ExtraArgs={"ContentType": content_type} if content_type else None,
+            Config=self.transfer_config
+        )
+        if move:
+            os.remove(src_path)
+
+    def get(self, key, dest_path):
+        partial_path = f"{dest_path}.{os.getpid()}.partial"
+        try:
+            self.client.download_file(self.bucket, self.object_key(key), partial_path, Config=self.transfer_config)
+            os.replace(partial_path, dest_path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+    def get_range(self, key, start, end):
+        response = self.client.get_object(Bucket=self.bucket, Key=self.object_key(key), Range=f"bytes={start}-{end}")
+        return response['Body'].read()
+
+    def presigned_url(self, key, expires_in=STORAGE_PRESIGN_EXPIRES):
+        return self.client.generate_presigned_url(
+            'get_object',
+            Params={"Bucket": self.bucket, "Key": self.object_key(key)},
+            ExpiresIn=expires_in
+        )
+
+    def delete(self, key):
+        # The object itself, plus everything under it when the key names a
+        # "directory" (sprites/<job_id>). The trailing slash keeps a key from
+        # matching its siblings: deleting `abc` must not touch `abc_proxy.mp4`.
+        object_key = self.object_key(key)
+        self.client.delete_object(Bucket=self.bucket, Key=object_key)
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=object_key.rstrip('/') + '/'):
+            objects = [{"Key": obj['Key']} for obj in page.get('Contents', [])]
+            if objects:
+                self.client.delete_objects(Bucket=self.bucket, Delete={"Objects": objects})
+
+    def exists(self, key):
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.object_key(key))
+            return True
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+
+    def local_path(self, key):
+        raise NotImplementedError("Wrap S3Storage in CachedStorage to get local files")
+
+
+class CachedStorage(StorageBackend):
+    """
+    Read-through local cache in front of a remote backend. local_path() fetches
+    an object once and serves later calls from disk; the least recently used
+    files are evicted once the cache grows past `max_bytes`.
+    """
+
+    remote = True
+
+    def __init__(self, backend, cache_dir, max_bytes):
+        self.backend = backend
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def cache_path(self, key):
+        path = os.path.abspath(os.path.join(self.cache_dir, key))
+        if os.path.commonpath([path, self.cache_dir]) != self.cache_dir:
+            raise ValueError(f"Storage key escapes the cache dir: {key}")
+        return path
+
+    def put(self, key, src_path, move=False):
+        self.backend.put(key, src_path, move=move)
+        self._drop(key)
+
+    def get(self, key, dest_path):
+        shutil.copyfile(self.local_path(key), dest_path)
+
+    def get_range(self, key, start, end):
+        cached = self.cache_path(key)
+        if os.path.exists(cached):
+            with open(cached, 'rb') as f:
+                f.seek(start)
+                return f.read(end - start + 1)
+        return self.backend.get_range(key, start, end)
+
+    def presigned_url(self, key, expires_in=STORAGE_PRESIGN_EXPIRES):
+        return self.backend.presigned_url(key, expires_in)
+
+    def delete(self, key):
+        self.backend.delete(key)
+        self._drop(key)
+
+    def exists(self, key):
+        return os.path.exists(self.cache_path(key)) or self.backend.exists(key)
+
+    def local_path(self, key):
+        cached = self.cache_path(key)
+        if os.path.exists(cached):
+            os.utime(cached)  # mtime doubles as the LRU clock
+            return cached
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+        self.backend.get(key, cached)
+        self.evict(keep=cached)
+        return cached
+
+    def _drop(self, key):
+        cached = self.cache_path(key)
+        if os.path.isdir(cached):
+            shutil.rmtree(cached, ignore_errors=True)
+        elif os.path.exists(cached):
+            os.remove(cached)
+
+    def evict(self, keep=None):
+        entries, total = [], 0
+        for dirpath, _, filenames in os.walk(self.cache_dir):
+            for name in filenames:
+                if name.endswith('.partial'):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+
+
+def create_storage(config):
+    """Build the storage backend described by the app config."""
+    if config.get('STORAGE_BACKEND', 'local') == 's3':
+        backend = S3Storage(
+            config['S3_BUCKET'],
+            prefix=config.get('S3_PREFIX') or '',
+            endpoint_url=config.get('S3_ENDPOINT_URL'),
+            region=config.get('S3_REGION'),
+            access_key_id=config.get('S3_ACCESS_KEY_ID'),
+            secret_access_key=config.get('S3_SECRET_ACCESS_KEY')
+        )
+        return CachedStorage(backend, config['STORAGE_CACHE_DIR'], config['STORAGE_CACHE_MAX_BYTES'])
+    return LocalStorage(config['UPLOAD_FOLDER'], config['SECRET_KEY'])
@@ -0,0 +1,76 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# app.py reads its configuration at import time: point it at throwaway
+# locations before any test imports it.
+_scratch = tempfile.mkdtemp(prefix='autoai_tests_')
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(_scratch, 'app.db')}")
+os.environ.setdefault('UPLOAD_FOLDER', os.path.join(_scratch, 'uploads'))
+os.environ.setdefault('STORAGE_CACHE_DIR', os.path.join(_scratch, 'storage_cache'))
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def fake_redis():
+    fakeredis = pytest.importorskip('fakeredis')
+    return fakeredis.FakeRedis()
+
+
+@pytest.fixture
+def app_module(monkeypatch, fake_redis):
+    """The app module on a migrated scratch database, with fake_redis as its Redis."""
+    import app as app_module
+    from migrations import run_migrations
+
+    monkeypatch.setattr(app_module, 'redis_conn', fake_redis)
+    os.makedirs(app_module.app.config['UPLOAD_FOLDER'], exist_ok=True)
+    run_migrations()
+    return app_module
+
+
+@pytest.fixture
+def make_job(app_module):
+    """Create a user's job row: make_job(status=..., **columns) -> job id."""
+    import uuid
+
+    created = []
+
+    def make(status='transcribed', **columns):
+        with app_module.app.app_context():
+            user = app_module.User(email=f"{uuid.uuid4().hex}@example.com")
+            app_module.db.session.add(user)
+            app_module.db.session.flush()
+            job = app_module.VideoProcessingJob(
+                id=str(uuid.uuid4()), user_id=user.id, status=status,
+                original_video_filepath=os.path.join(app_module.app.config['UPLOAD_FOLDER'], f"{uuid.uuid4().hex}_in.mp4"),
+                original_filename='in.mp4', **columns
+            )
+            app_module.db.session.add(job)
+            app_module.db.session.commit()
+            created.append((job.id, user.id))
+            return job.id
+
+    yield make
+    with app_module.app.app_context():
+        for job_id, user_id in created:
+            app_module.VideoProcessingJob.query.filter_by(id=job_id).delete()
+            app_module.User.query.filter_by(id=user_id).delete()
+        app_module.db.session.commit()
+
+
+@pytest.fixture
+def login(app_module):
+    """A test client logged in as the owner of a job: login(job_id) -> client."""
+    def client_for(job_id):
+        with app_module.app.app_context():
+            user_id = app_module.db.session.get(app_module.VideoProcessingJob, job_id).user_id
+        client = app_module.app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = str(user_id)
+            session['_fresh'] = True
+        return client
+    return client_for
@@ -0,0 +1,41 @@
+import struct
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from audio_pcm import PCM_SAMPLE_RATE, WAVE_FORMAT_IEEE_FLOAT, open_pcm, pcm_duration, read_pcm_header
+
+
+def _write_wav(path, samples, format_tag=WAVE_FORMAT_IEEE_FLOAT, channels=1, extra_chunk=b''):
+    data = np.asarray(samples, dtype='<f4').tobytes()
+    fmt = struct.pack('<HHIIHH', format_tag, channels, PCM_SAMPLE_RATE, PCM_SAMPLE_RATE * 4 * channels, 4 * channels, 32)
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<4sI4s', b'RIFF', 4 + 8 + len(fmt) + len(extra_chunk) + 8 + len(data), b'WAVE'))
+        f.write(struct.pack('<4sI', b'fmt ', len(fmt)) + fmt)
+        f.write(extra_chunk)
+        f.write(struct.pack('<4sI', b'data', len(data)) + data)
+
+
+def test_window_is_a_memory_mapped_view(tmp_path):
+    path = tmp_path / 'audio.wav'
+    samples = np.arange(2 * PCM_SAMPLE_RATE, dtype=np.float32) / PCM_SAMPLE_RATE
+    # Chunks before the data chunk (odd-sized, so padded) are skipped
+    _write_wav(path, samples, extra_chunk=struct.pack('<4sI', b'LIST', 3) + b'abc\0')
+
+    header = read_pcm_header(str(path))
+    assert header['sample_count'] == 2 * PCM_SAMPLE_RATE and header['data_offset'] == 12 + 24 + 12 + 8
+
+    window = open_pcm(str(path), start_seconds=0.5, end_seconds=1.0)
+    assert isinstance(window, np.memmap) and not window.flags.writeable
+    np.testing.assert_array_equal(window, samples[PCM_SAMPLE_RATE // 2:PCM_SAMPLE_RATE])
+    assert len(open_pcm(str(path), start_seconds=5.0)) == 0
+    assert pcm_duration(str(path)) == 2.0
+
+
+@pytest.mark.parametrize('format_tag, channels', [(1, 1), (WAVE_FORMAT_IEEE_FLOAT, 2)])
+def test_only_mono_float32_is_accepted(tmp_path, format_tag, channels):
+    path = tmp_path / 'audio.wav'
+    _write_wav(path, np.zeros(16, dtype=np.float32), format_tag=format_tag, channels=channels)
+    with pytest.raises(ValueError):
+        open_pcm(str(path))
@@ -0,0 +1,75 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from job_control import submission_key
+from lifecycle import job_work_key
+
+
+class FlakyQueue:
+    def __init__(self, fail):
+        self.fail = fail
+        self.enqueued = []
+
+    def enqueue(self, func, *args, **kwargs):
+        if self.fail:
+            raise RuntimeError('redis went away')
+        self.enqueued.append((func, args))
+        return SimpleNamespace(id='burn-rq-job')
+
+
+@pytest.fixture
+def editing_job(app_module, make_job):
+    srt_path = os.path.join(app_module.app.config['UPLOAD_FOLDER'], 'burn_test.srt')
+    job_id = make_job(status='editing', generated_srt_filepath=srt_path)
+    yield job_id
+    if os.path.exists(srt_path):
+        os.remove(srt_path)
+
+
+def _burn(client, job_id):
+    return client.post('/save_and_burn', json={"job_id": job_id, "srt_content": "1\n00:00:00,000 --> 00:00:01,000\nhi\n", "resolution": "original"})
+
+
+def _user_id(app_module, job_id):
+    with app_module.app.app_context():
+        return app_module.db.session.get(app_module.VideoProcessingJob, job_id).user_id
+
+
+def test_failed_enqueue_releases_the_claim(app_module, fake_redis, editing_job, login, monkeypatch):
+    client = login(editing_job)
+    monkeypatch.setattr(app_module, 'q', FlakyQueue(fail=True))
+    assert _burn(client, editing_job).status_code == 500
+    assert not fake_redis.exists(submission_key('burn', _user_id(app_module, editing_job), editing_job))
+    assert not fake_redis.zcard(job_work_key(editing_job))
+
+    # The user retries once the job is editable again: the burn is queued, not reported as a duplicate
+    with app_module.app.app_context():
+        app_module.db.session.get(app_module.VideoProcessingJob, editing_job).status = 'editing'
+        app_module.db.session.commit()
+    queue = FlakyQueue(fail=False)
+    monkeypatch.setattr(app_module, 'q', queue)
+    response = _burn(client, editing_job).get_json()
+    assert not response.get('duplicate') and len(queue.enqueued) == 1
+    assert fake_redis.zscore(job_work_key(editing_job), 'burn')
+
+
+def test_finished_burn_releases_the_claim(app_module, fake_redis, editing_job, login, monkeypatch):
+    import rq
+
+    client = login(editing_job)
+    monkeypatch.setattr(app_module, 'q', FlakyQueue(fail=False))
+    assert _burn(client, editing_job).get_json()['status'] == 'success'
+    claim = submission_key('burn', _user_id(app_module, editing_job), editing_job)
+    assert fake_redis.exists(claim)
+    assert _burn(client, editing_job).get_json()['duplicate']
+
+    # The burn fails in the worker (the original is gone)
+    monkeypatch.setattr(rq, 'get_current_job', lambda: SimpleNamespace(id='burn-rq-job'))
+    with app_module.app.app_context():
+        job = app_module.db.session.get(app_module.VideoProcessingJob, editing_job)
+        result = app_module.burn_subtitles_task(editing_job, job.user_id, job.original_video_filepath, job.edited_srt_filepath, 'in.mp4', 'original')
+    assert result['status'] == 'failed'
+    assert not fake_redis.exists(claim)
+    assert not fake_redis.zcard(job_work_key(editing_job))
@@ -0,0 +1,74 @@
+import pytest
+
+from caption_codec import encode_captions, decode_captions, caption_duration
+
+
+def _captions():
+    return [
+        {"id": "segment_2", "text": "second one", "start": 2.5, "end": 4.0, "isKeyword": True, "words": [
+            {"text": " second", "start": 2.5, "end": 3.1, "probability": 0.8731},
+            {"text": " one", "start": 3.1, "end": 4.0, "probability": 1.0, "isKeyword": True},
+        ]},
+        {"id": "segment_1", "text": "héllo wörld", "start": 0.0, "end": 2.5, "words": [
+            {"text": " héllo", "start": 0.0, "end": 1.2, "probability": 0.5},
+            {"text": " wörld", "start": 1.2, "end": 2.5, "probability": 0.0},
+        ]},
+        {"id": "segment_3", "text": "", "start": 5.0, "end": 6.25, "words": []},
+    ]
+
+
+def test_round_trip_sorts_by_start_and_keeps_extras():
+    decoded = decode_captions(encode_captions(_captions()))
+    assert decoded == sorted(_captions(), key=lambda seg: seg['start'])
+
+
+def test_round_trip_is_stable():
+    blob = encode_captions(_captions())
+    assert encode_captions(decode_captions(blob)) == blob
+
+
+def test_range_decode_returns_overlapping_segments():
+    blob = encode_captions(_captions())
+    assert [seg['id'] for seg in decode_captions(blob, start=3.0, end=5.5)] == ['segment_2', 'segment_3']
+    assert [seg['id'] for seg in decode_captions(blob, start=0.0, end=2.5)] == ['segment_1']
+    assert decode_captions(blob, start=4.2, end=4.8) == []
+    # Words, extras included, come back for the segments in the window only
+    window = decode_captions(blob, start=3.0, end=3.5)
+    assert window == [seg for seg in _captions() if seg['id'] == 'segment_2']
+
+
+def test_empty_and_duration():
+    assert decode_captions(encode_captions([])) == []
+    assert caption_duration(encode_captions(_captions())) == 6.25
+
+
+def test_rejects_other_blobs():
+    with pytest.raises(ValueError):
+        decode_captions(b'JSON' + bytes(12))
+
+
+def test_range_decode_keeps_overlapping_segments():
+    # An edited long segment overlaps the ones after it, so ends are not sorted
+    captions = [
+        {"id": "long", "text": "a", "start": 0.0, "end": 10.0, "words": []},
+        {"id": "short", "text": "b", "start": 1.0, "end": 2.0, "words": []},
+        {"id": "inside", "text": "c", "start": 3.0, "end": 6.0, "words": [
+            {"text": " c", "start": 3.0, "end": 6.0, "probability": 0.9}]},
+        {"id": "later", "text": "d", "start": 7.0, "end": 8.0, "words": []},
+    ]
+    blob = encode_captions(captions)
+    assert [seg['id'] for seg in decode_captions(blob, start=5.0, end=7.5)] == ['long', 'inside', 'later']
+    assert [seg['id'] for seg in decode_captions(blob, start=2.5, end=3.0)] == ['long']
+    assert decode_captions(blob, start=4.0, end=5.0)[1] == captions[2]
+
+
+def test_non_string_ids_round_trip():
+    captions = [
+        {"id": 7, "text": "a", "start": 0.0, "end": 1.0, "words": []},
+        {"id": "segment_2", "text": "b", "start": 1.0, "end": 2.0, "words": []},
+        {"id": None, "text": "c", "start": 2.0, "end": 3.0, "words": []},
+    ]
+    blob = encode_captions(captions)
+    assert decode_captions(blob) == captions
+    assert [seg['id'] for seg in decode_captions(blob, start=0.5, end=1.5)] == [7, 'segment_2']
+    assert encode_captions(decode_captions(blob)) == blob
@@ -0,0 +1,57 @@
+import pytest
+
+from app import apply_caption_ops
+from caption_codec import encode_captions, decode_captions
+
+
+def _captions():
+    return [
+        {"id": "segment_1", "text": "hello world", "start": 0.0, "end": 1.0, "words": [
+            {"text": " hello", "start": 0.0, "end": 0.5, "probability": 0.9},
+            {"text": " world", "start": 0.5, "end": 1.0, "probability": 0.8},
+        ]},
+        {"id": "segment_2", "text": "bye", "start": 1.0, "end": 2.0, "words": []},
+    ]
+
+
+def test_update_insert_delete():
+    captions = _captions()
+    result = apply_caption_ops(captions, [
+        {"op": "update_segment", "id": "segment_1", "fields": {"text": "hi world", "id": "ignored"}},
+        {"op": "update_word", "id": "segment_1", "index": 0, "fields": {"text": " hi"}},
+        {"op": "insert_segment", "segment": {"id": "segment_new", "start": 0.5, "text": "inserted"}},
+        {"op": "delete_segment", "id": "segment_2"},
+    ])
+    assert [seg['id'] for seg in result] == ['segment_1', 'segment_new']
+    assert result[0]['text'] == 'hi world'
+    assert result[0]['words'][0] == {"text": " hi", "start": 0.0, "end": 0.5, "probability": 0.9}
+    assert result[1] == {"id": "segment_new", "text": "inserted", "start": 0.5, "end": 0.0, "words": []}
+    # The input document is left alone
+    assert captions == _captions()
+
+
+
+def test_int_id_still_matches_after_saving():
+    # Saved captions go through the codec between two edits
+    saved = decode_captions(encode_captions(apply_caption_ops(_captions(), [
+        {"op": "insert_segment", "segment": {"id": 42, "start": 3.0, "text": "new"}},
+    ])))
+    result = apply_caption_ops(saved, [{"op": "update_segment", "id": 42, "fields": {"text": "edited"}}])
+    assert result[-1]['id'] == 42 and result[-1]['text'] == 'edited'
+
+def test_result_is_ordered_by_start():
+    result = apply_caption_ops(_captions(), [{"op": "update_segment", "id": "segment_1", "fields": {"start": 3.0}}])
+    assert [seg['id'] for seg in result] == ['segment_2', 'segment_1']
+
+
+@pytest.mark.parametrize('op', [
+    {"op": "update_segment", "id": "missing", "fields": {}},
+    {"op": "update_word", "id": "segment_1", "index": 2, "fields": {}},
+    {"op": "update_word", "id": "segment_1", "index": "0", "fields": {}},
+    {"op": "insert_segment", "segment": {"id": "segment_1"}},
+    {"op": "insert_segment", "segment": {"text": "no id"}},
+    {"op": "split_segment", "id": "segment_1"},
+])
+def test_invalid_ops_raise(op):
+    with pytest.raises(ValueError):
+        apply_caption_ops(_captions(), [op])
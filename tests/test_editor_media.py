@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+import pipeline
+
+
+@pytest.fixture
+def ffmpeg_calls(monkeypatch):
+    """Stands in for ffmpeg: records each command and writes its outputs."""
+    calls = []
+
+    def run_ffmpeg(cmd, redis_conn=None, cancel_id=None, **kwargs):
+        calls.append(cmd)
+        outputs = [arg for arg in cmd[1:] if arg.endswith(('.mp4', '.jpg'))]
+        for output in outputs:
+            with open(output.replace('%03d', '000'), 'wb') as f:
+                f.write(b'media')
+        return 0, ''
+
+    monkeypatch.setattr(pipeline, 'run_ffmpeg', run_ffmpeg)
+    return calls
+
+
+@pytest.fixture
+def job_with_captions(app_module, make_job):
+    job_id = make_job(status='transcribed')
+    with app_module.app.app_context():
+        job = app_module.db.session.get(app_module.VideoProcessingJob, job_id)
+        job.set_captions([{"id": "segment_1", "text": "hi", "start": 0.0, "end": 1.0, "words": []}])
+        app_module.db.session.commit()
+        params = {"original_filepath": job.original_video_filepath}
+    yield job_id, params
+    if os.path.exists(pipeline.proxy_path(job_id)):
+        os.remove(pipeline.proxy_path(job_id))
+
+
+def test_preview_proxy_is_short_gop_540p_and_only_for_the_editor(app_module, ffmpeg_calls, job_with_captions, login):
+    job_id, params = job_with_captions
+    with app_module.app.app_context():
+        assert pipeline.preview_proxy_stage(job_id, params) == {"preview_proxy": pipeline.proxy_path(job_id)}
+
+    cmd = ffmpeg_calls[0]
+    assert cmd[cmd.index('-i') + 1] == params['original_filepath']
+    assert 'min(540,ih)' in cmd[cmd.index('-vf') + 1]
+    assert cmd[cmd.index('-force_key_frames') + 1] == 'expr:gte(t,n_forced*0.5)'
+    assert cmd[cmd.index('-c:v') + 1] == 'libx264'
+    assert os.path.exists(pipeline.proxy_path(job_id))
+
+    data = login(job_id).get(f'/api/editor_data/{job_id}').get_json()
+    assert data['preview_url'].endswith(f"proxy_{job_id}.mp4")
+    # Playback switches to the proxy, exports keep rendering the original
+    assert data['video_url'].endswith(os.path.basename(params['original_filepath']))
+    with app_module.app.app_context():
+        job = app_module.db.session.get(app_module.VideoProcessingJob, job_id)
+        assert job.original_video_filepath == params['original_filepath']
+
+
+def test_failed_proxy_leaves_the_editor_on_the_original(app_module, monkeypatch, job_with_captions, login):
+    job_id, params = job_with_captions
+    monkeypatch.setattr(pipeline, 'run_ffmpeg', lambda cmd, **kwargs: (1, 'Invalid data found'))
+    with app_module.app.app_context():
+        assert pipeline.preview_proxy_stage(job_id, params) == {"preview_proxy": None}
+    assert login(job_id).get(f'/api/editor_data/{job_id}').get_json()['preview_url'] is None
+
+
+def test_thumbnail_sprites_are_one_pass_with_a_cacheable_index(app_module, fake_redis, ffmpeg_calls, job_with_captions, login):
+    import shutil
+
+    job_id, params = job_with_captions
+    pipeline.save_artifact(fake_redis, job_id, 'probe', {"width": 1920, "height": 1080, "duration": 250.0})
+    try:
+        with app_module.app.app_context():
+            assert pipeline.thumbnails_stage(job_id, params) == {"thumbnails": pipeline.sprites_dir(job_id)}
+
+        # The video is decoded once and split into one fps/tile branch per zoom level
+        (cmd,) = ffmpeg_calls
+        assert cmd.count('-i') == 1
+        graph = cmd[cmd.index('-filter_complex') + 1]
+        assert f"split={len(pipeline.SPRITE_LEVELS)}" in graph
+        for interval in pipeline.SPRITE_LEVELS:
+            assert f"fps=1/{interval},tile=10x10" in graph
+
+        response = login(job_id).get(f'/api/editor_data/{job_id}/thumbnails')
+        assert 'immutable' in response.headers['Cache-Control']
+        index = response.get_json()
+        assert index['base_url'].endswith(f"sprites/{job_id}/")
+        assert index['per_sheet'] == 100
+        levels = {level['interval']: level for level in index['levels']}
+        assert levels[1]['count'] == 251 and levels[20]['count'] == 13
+        assert levels[1]['thumb_height'] == 90
+        assert levels[5]['sheets'] == ['sprite_5s_000.jpg']
+        assert login(job_id).get(f'/api/editor_data/{job_id}').get_json()['thumbnails_url']
+    finally:
+        shutil.rmtree(pipeline.sprites_dir(job_id), ignore_errors=True)
@@ -0,0 +1,72 @@
+import json
+import os
+
+import pytest
+
+
+@pytest.fixture
+def worker(app_module, fake_redis, monkeypatch, tmp_path):
+    import worker
+    # Subtitle files go to ./tmp
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(worker, 'redis_conn', fake_redis)
+    return worker
+
+
+@pytest.fixture
+def original(app_module):
+    path = os.path.join(app_module.app.config['UPLOAD_FOLDER'], 'export_test_original.mp4')
+    with open(path, 'wb') as f:
+        f.write(b'original')
+    yield path
+    os.remove(path)
+
+
+def _export(worker, original, export_id):
+    captions = [{"id": "segment_1", "text": "hi", "start": 0.0, "end": 1.0, "words": []}]
+    return worker.export_video_task('job-1', export_id, original, captions, {}, {"resolution": "720x1280"})
+
+
+def _status(fake_redis, export_id):
+    return json.loads(fake_redis.get(f"export_status:{export_id}"))
+
+
+def test_export_is_encoded_in_place_with_faststart_and_renamed(app_module, fake_redis, worker, original, monkeypatch):
+    upload_folder = app_module.app.config['UPLOAD_FOLDER']
+    commands = []
+
+    def run_ffmpeg(cmd, **kwargs):
+        commands.append(cmd)
+        with open(cmd[-1], 'wb') as f:
+            f.write(b'\0' * 4096)
+        return 0, ''
+
+    monkeypatch.setattr(worker, 'run_ffmpeg', run_ffmpeg)
+    assert _export(worker, original, 'export_ok')['status'] == 'success'
+
+    (cmd,) = commands
+    assert cmd[cmd.index('-movflags') + 1] == '+faststart'
+    # The encoder writes next to the destination, not to tmp/ on another filesystem
+    assert os.path.dirname(cmd[-1]) == upload_folder and cmd[-1].endswith('.partial')
+    final_path = os.path.join(upload_folder, 'export_ok.mp4')
+    assert os.path.getsize(final_path) == 4096
+    assert not os.path.exists(cmd[-1])
+    assert _status(fake_redis, 'export_ok')['download_url'] == '/uploads/export_ok.mp4'
+    os.remove(final_path)
+
+
+def test_failed_encode_publishes_nothing(app_module, fake_redis, worker, original, monkeypatch):
+    partials = []
+
+    def run_ffmpeg(cmd, **kwargs):
+        partials.append(cmd[-1])
+        with open(cmd[-1], 'wb') as f:
+            f.write(b'half an mp4')
+        return 1, 'Conversion failed!'
+
+    monkeypatch.setattr(worker, 'run_ffmpeg', run_ffmpeg)
+    with pytest.raises(Exception):
+        _export(worker, original, 'export_bad')
+    assert not os.path.exists(partials[0])
+    assert not os.path.exists(os.path.join(app_module.app.config['UPLOAD_FOLDER'], 'export_bad.mp4'))
+    assert _status(fake_redis, 'export_bad')['status'] == 'failed'
@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+
+import pytest
+
+from job_control import (
+    JobCancelled, claim_submission, release_submission, request_cancel, clear_cancel,
+    is_cancel_requested, run_ffmpeg,
+)
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # Killed but not reaped yet (its parent died with it) counts as gone
+    try:
+        with open(f'/proc/{pid}/stat') as stat:
+            return stat.read().rsplit(')', 1)[1].split()[0] != 'Z'
+    except FileNotFoundError:
+        return False
+
+
+def test_run_ffmpeg_returns_exit_code_and_output_tail(fake_redis):
+    lines = []
+    code, tail = run_ffmpeg(
+        [sys.executable, '-c', 'print("\\n".join(str(i) for i in range(200))); raise SystemExit(3)'],
+        fake_redis, 'job-1', on_line=lines.append, poll_interval=0.05, tail_lines=2
+    )
+    assert code == 3
+    assert tail == '198\n199\n'
+    assert len(lines) == 200
+
+
+def test_cancel_kills_the_whole_process_group(fake_redis, tmp_path):
+    pid_file = tmp_path / 'grandchild.pid'
+    # The child starts a grandchild, as ffmpeg pipelines do, and both would outlive the job
+    child = (
+        "import subprocess, sys, time\n"
+        "grandchild = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        f"open({str(pid_file)!r}, 'w').write(str(grandchild.pid))\n"
+        "print('ready', flush=True)\n"
+        "time.sleep(60)\n"
+    )
+
+    def cancel_once_ready(line):
+        if line.strip() == 'ready':
+            request_cancel(fake_redis, 'job-2')
+
+    started = time.monotonic()
+    with pytest.raises(JobCancelled):
+        run_ffmpeg([sys.executable, '-c', child], fake_redis, 'job-2', on_line=cancel_once_ready, poll_interval=0.05)
+    assert time.monotonic() - started < 10
+
+    grandchild = int(pid_file.read_text())
+    for _ in range(50):
+        if not _alive(grandchild):
+            break
+        time.sleep(0.1)
+    else:
+        pytest.fail("grandchild survived the cancel")
+
+    clear_cancel(fake_redis, 'job-2')
+    assert not is_cancel_requested(fake_redis, 'job-2')
+
+
+def test_submission_claims(fake_redis):
+    assert claim_submission(fake_redis, 'submission:upload:1:abc', 'job-a') is None
+    # A duplicate attaches to the job holding the claim
+    assert claim_submission(fake_redis, 'submission:upload:1:abc', 'job-b') == 'job-a'
+    # Only the holder can release it
+    release_submission(fake_redis, 'submission:upload:1:abc', 'job-b')
+    assert claim_submission(fake_redis, 'submission:upload:1:abc', 'job-b') == 'job-a'
+    release_submission(fake_redis, 'submission:upload:1:abc', 'job-a')
+    assert claim_submission(fake_redis, 'submission:upload:1:abc', 'job-b') is None
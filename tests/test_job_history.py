@@ -0,0 +1,65 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+
+@pytest.fixture
+def history(app_module, make_job):
+    """Five jobs of one user (two created in the same second) plus another user's job."""
+    owner_job = make_job(status='completed', created_at=datetime(2026, 1, 1))
+    make_job(status='completed', created_at=datetime(2026, 1, 9))
+    base = datetime(2026, 1, 2)
+    with app_module.app.app_context():
+        user_id = app_module.db.session.get(app_module.VideoProcessingJob, owner_job).user_id
+        extra = []
+        for created_at, status in ((base, 'failed'), (base, 'editing'), (base + timedelta(days=2), 'completed'), (base + timedelta(days=5), 'failed')):
+            job = app_module.VideoProcessingJob(
+                id=str(uuid.uuid4()), user_id=user_id, status=status, created_at=created_at,
+                original_video_filepath='x.mp4', original_filename='x.mp4'
+            )
+            app_module.db.session.add(job)
+            extra.append(job.id)
+        app_module.db.session.commit()
+    yield owner_job, user_id
+    with app_module.app.app_context():
+        app_module.VideoProcessingJob.query.filter(app_module.VideoProcessingJob.id.in_(extra)).delete()
+        app_module.db.session.commit()
+
+
+def test_keyset_pages_cover_every_job_once_newest_first(app_module, history, login):
+    owner_job, user_id = history
+    client = login(owner_job)
+    seen, cursor = [], None
+    while True:
+        page = client.get('/api/jobs', query_string={"limit": 2, **({"cursor": cursor} if cursor else {})}).get_json()
+        seen += page['jobs']
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+    assert len(seen) == len({job['job_id'] for job in seen}) == 5
+    keys = [(job['created_at'], job['job_id']) for job in seen]
+    assert keys == sorted(keys, reverse=True)
+    assert seen[-1]['job_id'] == owner_job
+
+
+def test_filters_by_status_and_date(history, login):
+    owner_job, _ = history
+    client = login(owner_job)
+    failed = client.get('/api/jobs', query_string={"status": "failed"}).get_json()['jobs']
+    assert [job['status'] for job in failed] == ['failed', 'failed']
+    window = client.get('/api/jobs', query_string={"since": "2026-01-02", "until": "2026-01-05"}).get_json()['jobs']
+    assert sorted(job['status'] for job in window) == ['completed', 'editing', 'failed']
+    assert [job['editor_url'] is not None for job in window if job['status'] == 'editing'] == [True]
+    assert client.get('/api/jobs', query_string={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_listing_uses_the_index_and_skips_captions(app_module, history):
+    _, user_id = history
+    with app_module.app.app_context():
+        stmt = app_module.job_history_statement(user_id, statuses=['failed'])
+        compiled = stmt.compile(app_module.db.engine, compile_kwargs={"literal_binds": True})
+        assert 'captions' not in str(compiled)
+        plan = app_module.db.session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    assert 'ix_video_processing_job_user_status_created' in ' '.join(row[-1] for row in plan)
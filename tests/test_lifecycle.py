@@ -0,0 +1,55 @@
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from lifecycle import ARTIFACT_LRU_KEY, RETENTION_SECONDS, begin_job_work, end_job_work, enforce_retention, track_artifact
+
+
+@pytest.fixture
+def old_export(app_module, fake_redis):
+    """Publish an export for a job and make it look unused for longer than export retention."""
+    def publish(job_id):
+        key = f"export_{job_id}.mp4"
+        with open(os.path.join(app_module.app.config['UPLOAD_FOLDER'], key), 'wb') as f:
+            f.write(b'x' * 10)
+        track_artifact(fake_redis, job_id, key, 'export')
+        fake_redis.zadd(ARTIFACT_LRU_KEY, {key: time.time() - RETENTION_SECONDS['export'] - 60})
+        return key
+    return publish
+
+
+def _retained(app_module, fake_redis, key):
+    with app_module.app.app_context():
+        removed = enforce_retention(fake_redis)
+    return key not in removed and os.path.exists(os.path.join(app_module.app.config['UPLOAD_FOLDER'], key))
+
+
+def test_export_of_an_abandoned_editing_job_is_removed(app_module, fake_redis, make_job, old_export):
+    job_id = make_job(status='editing', updated_at=datetime.utcnow() - timedelta(days=3))
+    key = old_export(job_id)
+    assert not _retained(app_module, fake_redis, key)
+    assert not fake_redis.zscore(ARTIFACT_LRU_KEY, key)
+
+
+def test_recently_active_job_is_kept(app_module, fake_redis, make_job, old_export):
+    job_id = make_job(status='editing')
+    assert _retained(app_module, fake_redis, old_export(job_id))
+
+
+def test_queued_export_protects_a_stale_job_until_it_ends(app_module, fake_redis, make_job, old_export):
+    job_id = make_job(status='editing', updated_at=datetime.utcnow() - timedelta(days=3))
+    key = old_export(job_id)
+    begin_job_work(fake_redis, job_id, 'export_1')
+    assert _retained(app_module, fake_redis, key)
+    end_job_work(fake_redis, job_id, 'export_1')
+    assert not _retained(app_module, fake_redis, key)
+
+
+def test_work_past_its_deadline_no_longer_protects(app_module, fake_redis, make_job, old_export):
+    # The worker died without ending its work
+    job_id = make_job(status='completed')
+    key = old_export(job_id)
+    begin_job_work(fake_redis, job_id, 'burn', ttl=-1)
+    assert not _retained(app_module, fake_redis, key)
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def client(monkeypatch, fake_redis):
+    import app as app_module
+
+    monkeypatch.setattr(app_module, 'redis_conn', fake_redis)
+    os.makedirs(app_module.app.config['UPLOAD_FOLDER'], exist_ok=True)
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def media_file(client):
+    from app import app
+
+    filename = f"{'ab' * 16}_clip.mp4"
+    path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    with open(path, 'wb') as f:
+        f.write(bytes(range(256)) * 4)
+    yield filename
+    os.remove(path)
+
+
+def test_range_request(client, media_file):
+    response = client.get(f"/download/{media_file}", headers={'Range': 'bytes=10-19'})
+    assert response.status_code == 206
+    assert response.headers['Content-Range'] == 'bytes 10-19/1024'
+    assert response.data == bytes(range(10, 20))
+
+
+def test_strong_etag_and_revalidation(client, media_file):
+    response = client.get(f"/download/{media_file}")
+    etag = response.headers['ETag']
+    assert response.status_code == 200 and not etag.startswith('W/')
+    assert response.headers['Cache-Control'] == f"private, max-age={365 * 24 * 3600}, immutable"
+    assert client.get(f"/download/{media_file}", headers={'If-None-Match': etag}).status_code == 304
+
+
+def test_mutable_names_are_revalidated(client):
+    from app import app
+
+    path = os.path.join(app.config['UPLOAD_FOLDER'], 'notes.srt')
+    with open(path, 'w') as f:
+        f.write('1\n')
+    try:
+        assert client.get('/download/notes.srt').headers['Cache-Control'] == 'private, no-cache'
+    finally:
+        os.remove(path)
+
+
+def test_accel_redirect(client, media_file, monkeypatch):
+    from app import app
+
+    monkeypatch.setitem(app.config, 'MEDIA_ACCEL_REDIRECT_PREFIX', '/protected/')
+    response = client.get(f"/download/{media_file}")
+    assert response.headers['X-Accel-Redirect'] == f"/protected/{media_file}"
+    assert response.data == b''
+
+
+def test_missing_and_traversal(client):
+    assert client.get('/download/nope.mp4').status_code == 404
+    assert client.get('/download/..%2Fapp.py').status_code == 404
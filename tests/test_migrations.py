@@ -0,0 +1,32 @@
+from sqlalchemy import inspect, text
+
+from app import app, db
+from migrations import MIGRATIONS, MIGRATIONS_TABLE, run_migrations
+
+
+def _tables():
+    with app.app_context():
+        return set(inspect(db.engine).get_table_names())
+
+
+def test_upgrade_then_nothing_pending():
+    with app.app_context():
+        db.drop_all()
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql(f"DROP TABLE IF EXISTS {MIGRATIONS_TABLE}")
+            conn.exec_driver_sql("DROP TABLE IF EXISTS transcript_segment")
+
+    assert run_migrations() == [version for version, _, _ in MIGRATIONS]
+    assert {'user', 'video_processing_job', 'transcript_segment', MIGRATIONS_TABLE} <= _tables()
+    assert run_migrations() == []
+
+
+def test_replay_over_an_untracked_schema():
+    # A database upgraded before the runner existed: every step runs again and
+    # skips what is already there
+    run_migrations()
+    with app.app_context(), db.engine.begin() as conn:
+        conn.execute(text(f"DELETE FROM {MIGRATIONS_TABLE}"))
+
+    assert run_migrations() == [version for version, _, _ in MIGRATIONS]
+    assert run_migrations() == []
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from job_control import is_cancel_requested
+from lifecycle import begin_job_work, job_work_key
+from pipeline import (
+    AUTO_EXPORT_PIPELINE, TRANSCRIPTION_PIPELINE, batch_exports_key, enqueue_pipeline,
+    load_artifact, pipeline_params, pipeline_stages, pipeline_status, save_artifact, stage_job_id,
+)
+
+
+@pytest.fixture
+def queue(app_module, fake_redis, monkeypatch):
+    rq = pytest.importorskip('rq')
+    queue = rq.Queue(connection=fake_redis)
+    monkeypatch.setattr(app_module, 'q', queue)
+    return queue
+
+
+def _batch_params(app_module, job_id):
+    with app_module.app.app_context():
+        job = app_module.db.session.get(app_module.VideoProcessingJob, job_id)
+        return {
+            "user_id": job.user_id, "original_filepath": job.original_video_filepath,
+            "batch_id": "batch-1", "auto_export": {"style": {}, "settings": {}},
+        }
+
+
+def test_stages_are_chained_with_depends_on(queue):
+    enqueued = enqueue_pipeline(queue, 'job-1', {"user_id": 1})
+
+    assert set(enqueued) == {name for name, *_ in TRANSCRIPTION_PIPELINE}
+    for name, _, depends_on, *_ in TRANSCRIPTION_PIPELINE:
+        rq_job = enqueued[name]
+        assert rq_job.id == stage_job_id('job-1', name)
+        assert sorted(rq_job.dependency_ids) == sorted(stage_job_id('job-1', dep) for dep in depends_on)
+    # Only probe can run straight away; everything else waits on its dependencies
+    assert pipeline_status(queue, 'job-1') == ('queued', 'probe')
+    assert enqueued['transcribe'].retries_left == 2
+
+
+def test_stage_depending_on_a_later_stage_is_rejected(queue):
+    with pytest.raises(ValueError):
+        enqueue_pipeline(queue, 'job-2', {}, [('a', 'pipeline.probe_stage', ['b']), ('b', 'pipeline.probe_stage', [])])
+
+
+def test_artifacts_pass_by_reference(fake_redis):
+    save_artifact(fake_redis, 'job-3', 'audio', {"path": "/work/job-3/audio.wav"})
+    assert load_artifact(fake_redis, 'job-3', 'audio') == {"path": "/work/job-3/audio.wav"}
+    with pytest.raises(RuntimeError):
+        load_artifact(fake_redis, 'job-3', 'missing')
+
+
+def test_enqueued_stages_are_read_back(app_module, queue, make_job):
+    job_id = make_job(status='pending')
+    enqueue_pipeline(queue, job_id, _batch_params(app_module, job_id), AUTO_EXPORT_PIPELINE)
+
+    stages = pipeline_stages(pipeline_params(queue, job_id))
+    assert stages == AUTO_EXPORT_PIPELINE
+    # Only auto_export is still waiting once everything else finished
+    for name, *_ in TRANSCRIPTION_PIPELINE:
+        queue.fetch_job(stage_job_id(job_id, name)).set_status('finished')
+    assert pipeline_status(queue, job_id, stages) == ('deferred', 'auto_export')
+
+
+def test_params_without_stage_names_fall_back_on_auto_export():
+    assert pipeline_stages({}) == TRANSCRIPTION_PIPELINE
+    assert pipeline_stages({"auto_export": {"style": {}}}) == AUTO_EXPORT_PIPELINE
+
+
+def test_cancel_drops_auto_export_stage_and_its_export(app_module, fake_redis, queue, make_job, login):
+    import rq
+
+    job_id = make_job(status='pending')
+    enqueue_pipeline(queue, job_id, _batch_params(app_module, job_id), AUTO_EXPORT_PIPELINE)
+
+    # auto_export already handed an export to the exports queue
+    export_id = f"export_{job_id}_abc"
+    rq.Queue('exports', connection=fake_redis).enqueue('worker.export_video_task', job_id=export_id)
+    fake_redis.set(f"export_status:{export_id}", json.dumps({"export_id": export_id, "job_id": job_id, "status": "queued"}))
+    fake_redis.hset(batch_exports_key('batch-1'), job_id, export_id)
+    begin_job_work(fake_redis, job_id, export_id)
+
+    response = login(job_id).post(f'/api/job_cancel/{job_id}')
+    assert response.status_code == 200
+
+    assert queue.fetch_job(stage_job_id(job_id, 'auto_export')).get_status() == 'canceled'
+    assert is_cancel_requested(fake_redis, export_id)
+    assert rq.Queue('exports', connection=fake_redis).fetch_job(export_id).get_status() == 'canceled'
+    assert json.loads(fake_redis.get(f"export_status:{export_id}"))['status'] == 'cancelled'
+    assert not fake_redis.zcard(job_work_key(job_id))
@@ -0,0 +1,85 @@
+import time
+
+import pytest
+
+from quota import daily_tries_key, daily_tries_used, reserve_daily_tries, refund_daily_tries, refund_job_try
+
+pytest.importorskip('lupa')  # fakeredis runs EVAL through lupa
+
+
+def test_reserve_up_to_limit(fake_redis):
+    assert reserve_daily_tries(fake_redis, 7, limit=3) == 1
+    assert reserve_daily_tries(fake_redis, 7, limit=3, count=2) == 3
+    assert reserve_daily_tries(fake_redis, 7, limit=3) is None
+    # A refused reservation takes nothing
+    assert daily_tries_used(fake_redis, 7) == 3
+    assert reserve_daily_tries(fake_redis, 8, limit=3) == 1
+
+
+def test_unlimited_and_seeded(fake_redis):
+    assert reserve_daily_tries(fake_redis, 7, limit=-1, count=50) == 50
+    assert reserve_daily_tries(fake_redis, 9, limit=5, seed=4) == 5
+    assert reserve_daily_tries(fake_redis, 9, limit=5, seed=4) is None
+    # The seed only initializes a counter that does not exist yet
+    assert reserve_daily_tries(fake_redis, 7, limit=-1, seed=1000) == 51
+
+
+def test_counter_expires_after_the_day(fake_redis):
+    reserve_daily_tries(fake_redis, 7, limit=3)
+    ttl = fake_redis.ttl(daily_tries_key(7))
+    assert 3600 < ttl <= 25 * 3600 + 60
+
+
+def test_refund_never_goes_negative(fake_redis):
+    assert refund_daily_tries(fake_redis, 7) == 0
+    reserve_daily_tries(fake_redis, 7, limit=3, count=2)
+    assert refund_daily_tries(fake_redis, 7) == 1
+    assert refund_daily_tries(fake_redis, 7, count=5) == 0
+    assert daily_tries_used(fake_redis, 7) == 0
+
+
+def test_job_try_is_refunded_once(fake_redis):
+    reserve_daily_tries(fake_redis, 7, limit=3, count=2)
+    assert refund_job_try(fake_redis, 'job1', 7) == 1
+    assert refund_job_try(fake_redis, 'job1', 7) is None
+    assert daily_tries_used(fake_redis, 7) == 1
+
+
+def _pipeline_params(app_module, job_id):
+    from datetime import date
+
+    with app_module.app.app_context():
+        job = app_module.db.session.get(app_module.VideoProcessingJob, job_id)
+        return {"user_id": job.user_id, "original_filepath": job.original_video_filepath,
+                "user_max_duration": 10, "dedup_key": None, "reserved_on": date.today().isoformat()}
+
+
+def test_failed_pipeline_refunds_its_try(app_module, fake_redis, make_job, monkeypatch):
+    from pipeline import _fail_job, probe_stage
+
+    job_id = make_job(status='pending')
+    params = _pipeline_params(app_module, job_id)
+    reserve_daily_tries(fake_redis, params['user_id'], limit=3)
+    monkeypatch.setattr(app_module, 'get_video_duration', lambda path: None)  # ffprobe missing
+
+    with pytest.raises(RuntimeError):
+        probe_stage(job_id, params)
+    assert daily_tries_used(fake_redis, params['user_id']) == 0
+    # Another failure path for the same job refunds nothing more
+    reserve_daily_tries(fake_redis, params['user_id'], limit=3)
+    with pytest.raises(RuntimeError), app_module.app.app_context():
+        _fail_job(job_id, params, "again")
+    assert daily_tries_used(fake_redis, params['user_id']) == 1
+
+
+def test_cancelled_job_refunds_its_try(app_module, fake_redis, make_job):
+    from pipeline import discard_cancelled_job
+
+    job_id = make_job(status='pending')
+    params = _pipeline_params(app_module, job_id)
+    reserve_daily_tries(fake_redis, params['user_id'], limit=3, count=2)
+    with app_module.app.app_context():
+        # The cancel route and the running stage may both clean up
+        discard_cancelled_job(fake_redis, job_id, params['original_filepath'], params)
+        discard_cancelled_job(fake_redis, job_id, params['original_filepath'], params)
+    assert daily_tries_used(fake_redis, params['user_id']) == 1
@@ -0,0 +1,41 @@
+import threading
+
+import pytest
+import redis
+
+from redis_pool import (
+    REDIS_MAX_CONNECTIONS, create_redis_connection, read_status_snapshot, redis_round_trips,
+    write_status_snapshot,
+)
+
+
+@pytest.fixture
+def redis_url():
+    fakeredis = pytest.importorskip('fakeredis')
+    server = fakeredis.TcpFakeServer(('127.0.0.1', 0), server_type='redis')
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"redis://127.0.0.1:{server.server_address[1]}/0"
+    server.shutdown()
+    server.server_close()
+
+
+def test_connection_uses_a_bounded_blocking_pool(redis_url):
+    conn = create_redis_connection(redis_url)
+    assert isinstance(conn.connection_pool, redis.BlockingConnectionPool)
+    assert conn.connection_pool.max_connections == REDIS_MAX_CONNECTIONS
+
+
+def test_status_snapshot_is_one_round_trip_each_way(redis_url):
+    conn = create_redis_connection(redis_url)
+    conn.ping()
+
+    before = redis_round_trips()
+    write_status_snapshot(conn, 'export_status:e1', {"status": "processing", "progress": 40}, 'export_metrics:e1', {"frames": 120})
+    assert redis_round_trips() - before == 1
+
+    before = redis_round_trips()
+    status, metrics = read_status_snapshot(conn, 'export_status:e1', 'export_metrics:e1')
+    assert redis_round_trips() - before == 1
+    assert status == {"status": "processing", "progress": 40}
+    assert metrics == {"frames": "120", "status_writes": "1"}
+    assert 0 < conn.ttl('export_metrics:e1') <= 3600
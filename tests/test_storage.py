@@ -0,0 +1,95 @@
+import os
+import time
+
+import pytest
+
+import storage
+from storage import CachedStorage, LocalStorage, S3Storage
+
+
+def _file(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return str(path)
+
+
+@pytest.fixture
+def local(tmp_path):
+    return LocalStorage(str(tmp_path / 'uploads'), 'secret')
+
+
+def test_local_put_get_range_and_delete(local, tmp_path):
+    src = _file(tmp_path / 'scratch' / 'clip.mp4', b'0123456789')
+    local.put('exports/clip.mp4', src, move=True)
+    assert not os.path.exists(src) and local.exists('exports/clip.mp4')
+    assert local.get_range('exports/clip.mp4', 2, 5) == b'2345'
+
+    local.get('exports/clip.mp4', str(tmp_path / 'copy.mp4'))
+    assert (tmp_path / 'copy.mp4').read_bytes() == b'0123456789'
+
+    local.delete('exports')
+    assert not local.exists('exports/clip.mp4')
+    with pytest.raises(ValueError):
+        local.path('../outside.mp4')
+
+
+def test_local_presigned_urls_expire_and_bind_the_key(local):
+    url = local.presigned_url('clip.mp4', expires_in=60)
+    params = dict(part.split('=') for part in url.split('?', 1)[1].split('&'))
+    assert url.startswith('/storage/clip.mp4?')
+    assert local.verify_presigned('clip.mp4', params['expires'], params['signature'])
+    assert not local.verify_presigned('other.mp4', params['expires'], params['signature'])
+    assert not local.verify_presigned('clip.mp4', str(int(time.time()) - 1), local._signature('clip.mp4', int(time.time()) - 1))
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    moto = pytest.importorskip('moto')
+    # Smallest part size S3 accepts, so a few MB already go multipart
+    monkeypatch.setattr(storage, 'MULTIPART_THRESHOLD', 5 * 1024 * 1024)
+    monkeypatch.setattr(storage, 'MULTIPART_CHUNK_SIZE', 5 * 1024 * 1024)
+    with moto.mock_aws():
+        backend = S3Storage('media', prefix='tenant', region='us-east-1', access_key_id='test', secret_access_key='test')
+        backend.client.create_bucket(Bucket='media')
+        yield backend
+
+
+def test_s3_multipart_round_trip_and_ranges(s3, tmp_path):
+    data = os.urandom(11 * 1024 * 1024)
+    s3.put('abc_clip.mp4', _file(tmp_path / 'clip.mp4', data))
+    head = s3.client.head_object(Bucket='media', Key='tenant/abc_clip.mp4')
+    assert head['ContentType'] == 'video/mp4'
+    assert head['ETag'].strip('"').endswith('-3')  # uploaded in three parts
+    assert s3.get_range('abc_clip.mp4', 100, 199) == data[100:200]
+
+    s3.get('abc_clip.mp4', str(tmp_path / 'back.mp4'))
+    assert (tmp_path / 'back.mp4').read_bytes() == data
+    assert 'tenant/abc_clip.mp4' in s3.presigned_url('abc_clip.mp4')
+
+
+def test_s3_delete_removes_a_prefix_but_not_its_siblings(s3, tmp_path):
+    src = _file(tmp_path / 'x', b'x')
+    for key in ('sprites/abc/index.json', 'sprites/abc/sprite_1s_000.jpg', 'sprites/abc_proxy.mp4', 'abc', 'abc_proxy.mp4'):
+        s3.put(key, src)
+    s3.delete('sprites/abc')
+    s3.delete('abc')
+    assert not s3.exists('sprites/abc/index.json') and not s3.exists('abc')
+    assert s3.exists('sprites/abc_proxy.mp4') and s3.exists('abc_proxy.mp4')
+
+
+def test_cache_reads_through_once_and_evicts_lru(s3, tmp_path):
+    cached = CachedStorage(s3, str(tmp_path / 'cache'), max_bytes=10)
+    for key in ('a.bin', 'b.bin'):
+        s3.put(key, _file(tmp_path / key, b'x' * 6))
+
+    path_a = cached.local_path('a.bin')
+    assert open(path_a, 'rb').read() == b'x' * 6
+    # Served from disk now, even if the remote copy goes away
+    s3.client.delete_object(Bucket='media', Key='tenant/a.bin')
+    assert cached.local_path('a.bin') == path_a
+    assert cached.get_range('a.bin', 0, 1) == b'xx'
+
+    # Past max_bytes the least recently used file goes, never the one just fetched
+    path_b = cached.local_path('b.bin')
+    assert os.path.exists(path_b) and not os.path.exists(path_a)
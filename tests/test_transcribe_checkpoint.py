@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+import pytest
+
+
+class WorkerKilled(Exception):
+    pass
+
+
+def _segment(start, end, text):
+    word = SimpleNamespace(word=f" {text}", start=start, end=end, probability=0.912345)
+    return SimpleNamespace(start=start, end=end, text=f" {text}", words=[word])
+
+
+class FakeModel:
+    """Stands in for faster-whisper: one 1.5 s segment per second of audio after the offset."""
+
+    def __init__(self, total_seconds, die_after=None):
+        self.total_seconds = total_seconds
+        self.die_after = die_after
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append(audio)
+        return self._segments(audio), SimpleNamespace(language='en')
+
+    def _segments(self, offset):
+        for index in range(int(self.total_seconds - offset)):
+            if self.die_after is not None and index == self.die_after:
+                raise WorkerKilled()
+            yield _segment(index + 0.0001, index + 1.0004, f"w{offset + index:g}")
+
+
+@pytest.fixture
+def transcriber(monkeypatch, fake_redis):
+    import app as app_module
+    import audio_pcm
+
+    monkeypatch.setattr(app_module, 'redis_conn', fake_redis)
+    # The "audio" handed to the model is just the resume offset
+    monkeypatch.setattr(audio_pcm, 'open_pcm', lambda path, start_seconds=0.0: start_seconds)
+    return app_module
+
+
+def test_resume_from_checkpoint(transcriber, monkeypatch):
+    dying = FakeModel(total_seconds=7, die_after=5)
+    monkeypatch.setattr(transcriber, 'load_faster_whisper_model', lambda: dying)
+    with pytest.raises(WorkerKilled):
+        transcriber.transcribe_audio_file('audio.pcm', checkpoint_id='job1', checkpoint_every=2)
+
+    done, offset = transcriber.load_transcribe_checkpoint('job1')
+    assert [seg['id'] for seg in done] == ['segment_1', 'segment_2', 'segment_3', 'segment_4']
+    assert offset == done[-1]['end'] == 4.0
+
+    retry = FakeModel(total_seconds=7)
+    monkeypatch.setattr(transcriber, 'load_faster_whisper_model', lambda: retry)
+    captions = transcriber.transcribe_audio_file('audio.pcm', checkpoint_id='job1', checkpoint_every=2)
+
+    # Only the audio after the checkpoint is transcribed again
+    assert retry.calls == [4.0]
+    assert [seg['id'] for seg in captions] == [f"segment_{n}" for n in range(1, 8)]
+    assert [seg['text'] for seg in captions] == [f"w{n}" for n in range(7)]
+    assert [seg['start'] for seg in captions[4:]] == [4.0, 5.0, 6.0]
+    assert captions[:4] == done
+
+
+def test_values_rounded_to_codec_precision(transcriber, monkeypatch):
+    from caption_codec import encode_captions, decode_captions
+
+    monkeypatch.setattr(transcriber, 'load_faster_whisper_model', lambda: FakeModel(total_seconds=2))
+    captions = transcriber.transcribe_audio_file('audio.pcm')
+
+    word = captions[0]['words'][0]
+    assert (word['start'], word['end'], word['probability']) == (0.0, 1.0, 0.9123)
+    assert decode_captions(encode_captions(captions)) == captions
@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import create_engine
+
+from migrations import _transcript_search
+from transcript_search import index_transcript, search_terms, search_transcripts
+
+
+def _segment(segment_id, text, start):
+    words = [{"text": f" {word}", "start": start + i, "end": start + i + 1} for i, word in enumerate(text.split())]
+    return {"id": segment_id, "text": text, "start": start, "end": start + len(words), "words": words}
+
+
+@pytest.fixture
+def conn():
+    engine = create_engine('sqlite://')
+    with engine.begin() as connection:
+        _transcript_search(connection)
+        index_transcript(connection, 'job1', 1, [
+            _segment('segment_1', 'the quick brown fox', 0.0),
+            _segment('segment_2', 'said "NOT" OR near* -- don\'t', 10.0),
+        ])
+        index_transcript(connection, 'job2', 2, [_segment('segment_1', 'quick fox of another user', 0.0)])
+        yield connection
+
+
+def test_search_terms():
+    assert search_terms('Quick, "brown" fox!') == ['quick', 'brown', 'fox']
+    assert search_terms('') == [] and search_terms(None) == []
+
+
+def test_matches_with_word_timestamps(conn):
+    [hit] = search_transcripts(conn, 1, 'Brown FOX')
+    assert (hit['job_id'], hit['segment_id'], hit['start']) == ('job1', 'segment_1', 0.0)
+    assert hit['words'] == [{"text": "brown", "start": 2.0, "end": 3.0}, {"text": "fox", "start": 3.0, "end": 4.0}]
+
+
+def test_only_the_users_own_transcripts(conn):
+    assert [hit['job_id'] for hit in search_transcripts(conn, 2, 'quick')] == ['job2']
+
+
+@pytest.mark.parametrize('query', ['"NOT"', 'NOT', 'OR', 'near*', 'fox AND', '"unbalanced', 'NEAR(fox quick)', 'text:fox', "don't", '^fox'])
+def test_fts_syntax_is_never_interpreted(conn, query):
+    # Would raise an FTS5 syntax error (or change meaning) if passed through unquoted
+    search_transcripts(conn, 1, query)
+
+
+def test_operators_match_as_plain_words(conn):
+    assert [hit['segment_id'] for hit in search_transcripts(conn, 1, 'not or')] == ['segment_2']
+    assert search_transcripts(conn, 1, '*** ---') == []
+
+
+def test_reindexing_segments(conn):
+    index_transcript(conn, 'job1', 1, [_segment('segment_1', 'slow brown dog', 0.0)], segment_ids=['segment_1', 'segment_2'])
+    assert [hit['segment_id'] for hit in search_transcripts(conn, 1, 'dog')] == ['segment_1']
+    assert search_transcripts(conn, 1, 'fox') == []
+    assert search_transcripts(conn, 1, 'near') == []
@@ -0,0 +1,66 @@
+import io
+import os
+
+import pytest
+
+import uploads
+from uploads import (
+    UploadError, create_upload_session, finish_upload_session, hash_and_write_stream, upload_progress,
+    write_chunk,
+)
+
+CHUNK = 4
+
+
+@pytest.fixture
+def session(fake_redis, tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, 'UPLOAD_CHUNK_SIZE', CHUNK)
+    return create_upload_session(fake_redis, 'up-1', 7, 'in.mp4', str(tmp_path / 'in.mp4'), 10, '720p', None)
+
+
+def _put(fake_redis, session, index, data):
+    return write_chunk(fake_redis, 'up-1', session, index, io.BytesIO(data), len(data))
+
+
+def test_out_of_order_chunks_land_at_their_offsets(fake_redis, session):
+    data = b'0123456789'
+    _put(fake_redis, session, 2, data[8:])
+    _put(fake_redis, session, 0, data[:4])
+    progress = upload_progress(fake_redis, 'up-1', session)
+    assert progress['missing_chunks'] == [1] and progress['offset'] == 4 and not progress['complete']
+
+    _put(fake_redis, session, 1, data[4:8])
+    assert upload_progress(fake_redis, 'up-1', session)['complete']
+    content_hash = finish_upload_session(fake_redis, 'up-1', session)
+    with open(session['filepath'], 'rb') as f:
+        assert f.read() == data
+    # The single-request /upload path hashes the same bytes to the same value
+    assert content_hash == hash_and_write_stream(io.BytesIO(data), io.BytesIO(), chunk_size=CHUNK)
+
+
+def test_bad_chunks_are_rejected_and_not_recorded(fake_redis, session):
+    with pytest.raises(UploadError):
+        _put(fake_redis, session, 3, b'xx')
+    with pytest.raises(UploadError):
+        _put(fake_redis, session, 0, b'abc')
+    # A dropped connection leaves the chunk for the client to resend
+    with pytest.raises(UploadError):
+        write_chunk(fake_redis, 'up-1', session, 0, io.BytesIO(b'ab'), CHUNK)
+    assert upload_progress(fake_redis, 'up-1', session)['received_chunks'] == []
+    with pytest.raises(UploadError) as incomplete:
+        finish_upload_session(fake_redis, 'up-1', session)
+    assert incomplete.value.status_code == 409
+
+
+def test_declared_size_is_capped_before_preallocating(fake_redis, tmp_path):
+    path = tmp_path / 'huge.mp4'
+    with pytest.raises(UploadError) as too_big:
+        create_upload_session(fake_redis, 'up-2', 7, 'huge.mp4', str(path), 11, None, None, max_size=10)
+    assert too_big.value.status_code == 413
+    assert not os.path.exists(path)
+
+
+def test_session_belongs_to_its_user(fake_redis, session):
+    with pytest.raises(UploadError) as other_user:
+        uploads.load_upload_session(fake_redis, 'up-1', 8)
+    assert other_user.value.status_code == 404
@@ -0,0 +1,40 @@
+import pytest
+
+
+@pytest.fixture
+def client(app_module, make_job, login, monkeypatch):
+    for name in ('PEXELS_API_KEY', 'PIXABAY_API_KEY', 'OPENAI_API_KEY'):
+        monkeypatch.delenv(name, raising=False)
+    return login(make_job())
+
+
+def _run_queued_tasks(fake_redis):
+    from rq import Queue, SimpleWorker
+    from upstream import INTERACTIVE_QUEUE
+
+    SimpleWorker([Queue(INTERACTIVE_QUEUE, connection=fake_redis)], connection=fake_redis).work(burst=True)
+
+
+def test_upstream_calls_are_queued_by_default(client, fake_redis):
+    response = client.get('/api/broll/search?q=sunset')
+    assert response.status_code == 202
+    task = response.get_json()
+    assert client.get(task['status_url']).get_json()['status'] == 'queued'
+
+    _run_queued_tasks(fake_redis)
+    finished = client.get(task['status_url']).get_json()
+    assert finished['status'] == 'finished'
+    # Same shape the inline endpoint returned
+    assert [clip['id'] for clip in finished['result']['results']] == ['mock1', 'mock2']
+
+
+def test_prefer_wait_runs_inline(client):
+    response = client.post('/api/ai/generate', json={"transcript": "hello"}, headers={'Prefer': 'wait=15'})
+    assert response.status_code == 200
+    assert response.get_json()['hashtags']
+
+
+def test_tasks_are_private(client, app_module, make_job, login):
+    task = client.get('/api/broll/search?q=sunset').get_json()
+    other = login(make_job())
+    assert other.get(task['status_url']).status_code == 404
@@ -0,0 +1,60 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+
+@pytest.fixture
+def user(monkeypatch, fake_redis):
+    import app as app_module
+    from migrations import run_migrations
+
+    monkeypatch.setattr(app_module, 'redis_conn', fake_redis)
+    run_migrations()
+    with app_module.app.app_context():
+        user = app_module.User(email='cached@example.com', username='cached', subscription_tier='pro')
+        app_module.db.session.add(user)
+        app_module.db.session.commit()
+        user_id = user.id
+    yield user_id
+    with app_module.app.app_context():
+        app_module.db.session.delete(app_module.db.session.get(app_module.User, user_id))
+        app_module.db.session.commit()
+
+
+@contextmanager
+def _recorded_queries(engine):
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+def test_cached_user_loads_without_a_query(user, fake_redis):
+    from app import app, db, load_user, user_cache_key
+
+    with app.app_context():
+        assert load_user(str(user)).subscription_tier == 'pro'
+        assert fake_redis.exists(user_cache_key(user))
+    with app.app_context():
+        with _recorded_queries(db.engine) as statements:
+            cached = load_user(str(user))
+        assert (cached.id, cached.email, cached.subscription_tier) == (user, 'cached@example.com', 'pro')
+        assert statements == []
+
+
+def test_update_drops_the_entry(user, fake_redis):
+    from app import app, db, load_user, user_cache_key
+
+    with app.app_context():
+        load_user(str(user)).subscription_tier = 'free'
+        db.session.commit()
+        assert not fake_redis.exists(user_cache_key(user))
+    with app.app_context():
+        assert load_user(str(user)).subscription_tier == 'free'
@@ -0,0 +1,49 @@
+import struct
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from audio_pcm import PCM_SAMPLE_RATE, WAVE_FORMAT_IEEE_FLOAT
+from waveform import BASE_SAMPLES_PER_PEAK, LEVEL_FACTOR, read_peaks_header, read_peaks_window, write_peaks_file
+
+
+def _write_pcm(path, samples):
+    data = np.asarray(samples, dtype='<f4').tobytes()
+    fmt = struct.pack('<HHIIHH', WAVE_FORMAT_IEEE_FLOAT, 1, PCM_SAMPLE_RATE, PCM_SAMPLE_RATE * 4, 4, 32)
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<4sI4s', b'RIFF', 4 + 8 + len(fmt) + 8 + len(data), b'WAVE'))
+        f.write(struct.pack('<4sI', b'fmt ', len(fmt)) + fmt)
+        f.write(struct.pack('<4sI', b'data', len(data)) + data)
+
+
+@pytest.fixture
+def peaks_path(tmp_path):
+    # Two seconds: silence, then a full-scale square wave
+    samples = np.zeros(2 * PCM_SAMPLE_RATE, dtype=np.float32)
+    samples[PCM_SAMPLE_RATE:] = np.where(np.arange(PCM_SAMPLE_RATE) % 2, 1.0, -1.0)
+    pcm_path, out_path = tmp_path / 'audio.pcm', tmp_path / 'audio.peaks'
+    _write_pcm(pcm_path, samples)
+    write_peaks_file(str(pcm_path), str(out_path))
+    return str(out_path)
+
+
+def test_levels(peaks_path):
+    header = read_peaks_header(peaks_path)
+    assert header['sample_rate'] == PCM_SAMPLE_RATE
+    counts = [level['count'] for level in header['levels']]
+    assert counts[0] == 2 * PCM_SAMPLE_RATE // BASE_SAMPLES_PER_PEAK
+    assert all(-(-bigger // LEVEL_FACTOR) == smaller for bigger, smaller in zip(counts, counts[1:]))
+    assert header['levels'][0]['peaks_per_second'] == 100
+
+
+def test_window_reads_min_max_pairs(peaks_path):
+    first, raw = read_peaks_window(peaks_path, 0, start_seconds=0.5, end_seconds=1.5)
+    peaks = np.frombuffer(raw, dtype=np.int8).reshape(-1, 2)
+    assert first == 50 and len(peaks) == 100
+    assert (peaks[:50] == 0).all()
+    assert (peaks[50:] == [-127, 127]).all()
+
+
+def test_window_past_the_end(peaks_path):
+    assert read_peaks_window(peaks_path, 0, start_seconds=10.0) == (1000, b'')
@@ -0,0 +1,89 @@
+import io
+import os
+from types import SimpleNamespace
+
+import pytest
+
+
+class FakeModel:
+    """Stands in for faster-whisper; records what it was asked to transcribe."""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append((audio, kwargs))
+        words = [
+            SimpleNamespace(word=" hello", start=0.12, end=0.48, probability=0.9),
+            SimpleNamespace(word=" there", start=0.9, end=1.35, probability=0.8),
+        ]
+        return iter([SimpleNamespace(start=0.1, end=1.4, text=" hello there", words=words)]), SimpleNamespace(language='en')
+
+
+@pytest.fixture
+def model(app_module, monkeypatch):
+    import audio_pcm
+
+    model = FakeModel()
+    monkeypatch.setattr(app_module, 'load_faster_whisper_model', lambda: model)
+    # The "audio" handed to the model is the path of the PCM artifact it was mapped from
+    monkeypatch.setattr(audio_pcm, 'open_pcm', lambda path, start_seconds=0.0: path)
+    return model
+
+
+def _run_default_queue(fake_redis):
+    from rq import Queue, SimpleWorker
+    SimpleWorker([Queue('default', connection=fake_redis)], connection=fake_redis).work(burst=True)
+
+
+def test_job_transcription_is_queued_and_reuses_the_pcm_artifact(app_module, fake_redis, model, make_job, login):
+    from pipeline import pcm_path
+
+    job_id = make_job()
+    client = login(job_id)
+    with app_module.app.app_context():
+        original = app_module.db.session.get(app_module.VideoProcessingJob, job_id).original_video_filepath
+    os.makedirs(os.path.dirname(pcm_path(job_id)), exist_ok=True)
+    for path in (original, pcm_path(job_id)):
+        with open(path, 'wb') as f:
+            f.write(b'media')
+    try:
+        response = client.post('/api/transcribe_word_level', data={"job_id": job_id, "language": "en"})
+        assert response.status_code == 202
+        # The web request never ran inference
+        assert model.calls == []
+
+        _run_default_queue(fake_redis)
+        (audio, kwargs), = model.calls
+        assert audio == pcm_path(job_id)
+        assert kwargs['word_timestamps'] is True and kwargs['language'] == 'en'
+        task = client.get(response.get_json()['status_url']).get_json()
+        assert task['status'] == 'finished'
+        # Real word timestamps, not words spread evenly over the segment
+        assert [(w['start'], w['end']) for w in task['result']['captions'][0]['words']] == [(0.12, 0.48), (0.9, 1.35)]
+        assert task['result']['duration'] == 1.4
+    finally:
+        for path in (original, pcm_path(job_id)):
+            os.remove(path)
+
+
+def test_uploaded_video_is_decoded_on_the_worker_and_removed(app_module, fake_redis, model, make_job, login, monkeypatch):
+    import audio_pcm
+
+    extracted = []
+
+    def extract_pcm(source_path, out_path, **kwargs):
+        extracted.append(source_path)
+        open(out_path, 'wb').close()
+        return 0, ''
+
+    monkeypatch.setattr(audio_pcm, 'extract_pcm', extract_pcm)
+    client = login(make_job())
+    response = client.post('/api/transcribe_word_level', data={"video": (io.BytesIO(b'video bytes'), 'clip.mp4')})
+    assert response.status_code == 202
+    assert extracted == []
+
+    _run_default_queue(fake_redis)
+    assert client.get(response.get_json()['status_url']).get_json()['status'] == 'finished'
+    (upload,) = extracted
+    assert upload.endswith('_clip.mp4') and not os.path.exists(upload)
@@ -0,0 +1,128 @@
+import re
+import json
+
+# Full-text search over a user's transcripts.
+#
+# Every caption segment is one row of transcript_segment, holding its text and
+# the word timings needed to jump to a hit. The table is dialect-specific
+# (created by migrations.py):
+#
+#   postgresql  plain table with a generated tsvector column and a GIN index
+#   sqlite      FTS5 virtual table, for local runs
+#
+# Both have the same column names, so writes are shared and only the query
+# differs. Rows are replaced per job when a transcription finishes and per
+# segment when the editor patches captions.
+SEARCH_TABLE = 'transcript_segment'
+SEARCH_CONFIG = 'simple'  # No stemming or stop words: transcripts mix languages
+SUPPORTED_DIALECTS = ('postgresql', 'sqlite')
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class SearchUnavailable(Exception):
+    pass
+
+
+def search_terms(query):
+    return [term.lower() for term in _TERM_RE.findall(query or '')]
+
+
+def _dialect(conn):
+    # Works for a Session (get_bind) as well as a Connection
+    return (conn.get_bind() if hasattr(conn, 'get_bind') else conn).dialect.name
+
+
+def _segment_row(job_id, user_id, segment):
+    words = [[w.get('text', '').strip(), w.get('start'), w.get('end')] for w in segment.get('words') or []]
+    return {
+        "job_id": job_id,
+        "segment_id": str(segment.get('id')),
+        "user_id": user_id,
+        "start_time": segment.get('start'),
+        "end_time": segment.get('end'),
+        "text": segment.get('text') or ' '.join(w[0] for w in words),
+        "words": json.dumps(words, separators=(',', ':'))
+    }
+
+
+def index_transcript(conn, job_id, user_id, captions, segment_ids=None):
+    """
+    (Re)index a job's captions on `conn` (a SQLAlchemy connection or session).
+    With segment_ids only those segments are replaced; ids no longer present
+    in `captions` are removed.
+    """
+    from sqlalchemy import text, bindparam
+
+    if _dialect(conn) not in SUPPORTED_DIALECTS:
+        return 0
+    if segment_ids is None:
+        conn.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE job_id = :job_id"), {"job_id": job_id})
+        segments = captions
+    else:
+        segment_ids = [str(segment_id) for segment_id in segment_ids]
+        if not segment_ids:
+            return 0
+        conn.execute(
+            text(f"DELETE FROM {SEARCH_TABLE} WHERE job_id = :job_id AND segment_id IN :segment_ids")
+            .bindparams(bindparam('segment_ids', expanding=True)),
+            {"job_id": job_id, "segment_ids": segment_ids}
+        )
+        wanted = set(segment_ids)
+        segments = [segment for segment in captions if str(segment.get('id')) in wanted]
+    rows = [_segment_row(job_id, user_id, segment) for segment in segments]
+    if rows:
+        conn.execute(text(
+            f"INSERT INTO {SEARCH_TABLE} (job_id, segment_id, user_id, start_time, end_time, text, words) "
+            "VALUES (:job_id, :segment_id, :user_id, :start_time, :end_time, :text, :words)"
+        ), rows)
+    return len(rows)
+
+
+def search_transcripts(conn, user_id, query, limit=20):
+    """
+    Best-matching segments of the user's transcripts, each with the words
+    that matched and their timestamps. Raises SearchUnavailable on databases
+    without a search index.
+    """
+    from sqlalchemy import text
+
+    terms = search_terms(query)
+    if not terms:
+        return []
+    dialect = _dialect(conn)
+    if dialect == 'postgresql':
+        rows = conn.execute(text(
+            f"SELECT job_id, segment_id, start_time, end_time, text, words, ts_rank(tsv, query) AS rank "
+            f"FROM {SEARCH_TABLE}, plainto_tsquery('{SEARCH_CONFIG}', :query) AS query "
+            "WHERE user_id = :user_id AND tsv @@ query "
+            "ORDER BY rank DESC, job_id, start_time LIMIT :limit"
+        ), {"query": ' '.join(terms), "user_id": user_id, "limit": limit}).all()
+    elif dialect == 'sqlite':
+        # Every term quoted, so user input can never be read as FTS5 query syntax
+        match = ' '.join('"' + term.replace('"', '""') + '"' for term in terms)
+        rows = conn.execute(text(
+            f"SELECT job_id, segment_id, start_time, end_time, text, words, bm25({SEARCH_TABLE}) AS rank "
+            f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match AND user_id = :user_id "
+            "ORDER BY rank LIMIT :limit"
+        ), {"match": match, "user_id": user_id, "limit": limit}).all()
+    else:
+        raise SearchUnavailable(f"Transcript search is not available on {dialect}")
+
+    wanted = set(terms)
+    results = []
+    for row in rows:
+        words = json.loads(row.words or '[]')
+        hits = [
+            {"text": word, "start": start, "end": end}
+            for word, start, end in words
+            if set(search_terms(word)) & wanted
+        ]
+        results.append({
+            "job_id": row.job_id,
+            "segment_id": row.segment_id,
+            "start": row.start_time,
+            "end": row.end_time,
+            "text": row.text,
+            "words": hits
+        })
+    return results
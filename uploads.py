@@ -0,0 +1,177 @@
+import os
+import hashlib
+
+# Resumable chunked uploads.
+#
+# A client opens a session, then PUTs fixed-size chunks in any order, each one
+# written with pwrite straight into the preallocated final file in
+# UPLOAD_FOLDER (no spooling, no copy). Each chunk is hashed as it arrives and
+# its digest recorded in Redis, so the session can report which chunks are
+# still missing after a dropped connection and the content hash is ready the
+# moment the last chunk lands.
+#
+# The content hash is a hash over the ordered per-chunk SHA-256 digests. The
+# single-request /upload path computes the same hash while it streams, so
+# dedup works across both.
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_SESSION_TTL_SECONDS = 24 * 3600
+# Sessions preallocate their file, so the declared size is capped before any disk is taken
+MAX_UPLOAD_BYTES = int(os.environ.get('MAX_UPLOAD_BYTES', 4 * 1024 ** 3))
+
+
+class UploadError(Exception):
+    """A chunk or session request the client has to fix; carries an HTTP status."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def session_key(upload_id):
+    return f"upload_session:{upload_id}"
+
+
+def chunks_key(upload_id):
+    return f"upload_chunks:{upload_id}"
+
+
+def chunk_count(size, chunk_size=UPLOAD_CHUNK_SIZE):
+    return max(1, (size + chunk_size - 1) // chunk_size)
+
+
+def combine_chunk_digests(digests):
+    """Content hash of a file from its ordered per-chunk SHA-256 hex digests."""
+    combined = hashlib.sha256()
+    for digest in digests:
+        combined.update(bytes.fromhex(digest))
+    return combined.hexdigest()
+
+
+def hash_and_write_stream(stream, out, chunk_size=UPLOAD_CHUNK_SIZE, read_size=1024 * 1024):
+    """Copy a stream to `out`, returning the chunked content hash of what was written."""
+    digests = []
+    chunk_digest, chunk_filled = hashlib.sha256(), 0
+    while True:
+        block = stream.read(min(read_size, chunk_size - chunk_filled))
+        if not block:
+            break
+        out.write(block)
+        chunk_digest.update(block)
+        chunk_filled += len(block)
+        if chunk_filled == chunk_size:
+            digests.append(chunk_digest.hexdigest())
+            chunk_digest, chunk_filled = hashlib.sha256(), 0
+    if chunk_filled or not digests:
+        digests.append(chunk_digest.hexdigest())
+    return combine_chunk_digests(digests)
+
+
+def create_upload_session(redis_conn, upload_id, user_id, filename, filepath, size, resolution, language, max_size=MAX_UPLOAD_BYTES):
+    if size > max_size:
+        raise UploadError(f"Uploads are limited to {max_size} bytes.", 413)
+    # Preallocate so chunks can be written at their offsets in any order
+    with open(filepath, 'wb') as f:
+        f.truncate(size)
+
+    key = session_key(upload_id)
+    pipe = redis_conn.pipeline(transaction=True)
+    pipe.hset(key, mapping={
+        "user_id": user_id,
+        "filename": filename,
+        "filepath": filepath,
+        "size": size,
+        "chunk_size": UPLOAD_CHUNK_SIZE,
+        "resolution": resolution or '',
+        "language": language or ''
+    })
+    pipe.expire(key, UPLOAD_SESSION_TTL_SECONDS)
+    pipe.execute()
+    return load_upload_session(redis_conn, upload_id, user_id)
+
+
+def load_upload_session(redis_conn, upload_id, user_id):
+    raw = redis_conn.hgetall(session_key(upload_id))
+    if not raw:
+        raise UploadError("Upload session not found or expired.", 404)
+    session = {k.decode(): v.decode() for k, v in raw.items()}
+    if int(session['user_id']) != user_id:
+        raise UploadError("Upload session not found or expired.", 404)
+    session['size'] = int(session['size'])
+    session['chunk_size'] = int(session['chunk_size'])
+    session['total_chunks'] = chunk_count(session['size'], session['chunk_size'])
+    return session
+
+
+def received_chunks(redis_conn, upload_id):
+    return sorted(int(index) for index in redis_conn.hkeys(chunks_key(upload_id)))
+
+
+def upload_progress(redis_conn, upload_id, session):
+    """Which chunks are in, which are missing, and the offset a sequential client should resume at."""
+    received = set(received_chunks(redis_conn, upload_id))
+    missing = [index for index in range(session['total_chunks']) if index not in received]
+    return {
+        "upload_id": upload_id,
+        "size": session['size'],
+        "chunk_size": session['chunk_size'],
+        "total_chunks": session['total_chunks'],
+        "received_chunks": sorted(received),
+        "missing_chunks": missing,
+        "offset": missing[0] * session['chunk_size'] if missing else session['size'],
+        "complete": not missing
+    }
+
+
+def write_chunk(redis_conn, upload_id, session, index, stream, content_length, read_size=1024 * 1024):
+    """Write one chunk at its offset in the final file and record its digest."""
+    if index < 0 or index >= session['total_chunks']:
+        raise UploadError(f"Chunk index {index} out of range (0-{session['total_chunks'] - 1}).")
+
+    offset = index * session['chunk_size']
+    expected = min(session['chunk_size'], session['size'] - offset)
+    if content_length != expected:
+        raise UploadError(f"Chunk {index} must be exactly {expected} bytes, got {content_length}.")
+
+    digest = hashlib.sha256()
+    written = 0
+    fd = os.open(session['filepath'], os.O_WRONLY)
+    try:
+        while written < expected:
+            block = stream.read(min(read_size, expected - written))
+            if not block:
+                break
+            os.pwrite(fd, block, offset + written)
+            digest.update(block)
+            written += len(block)
+    finally:
+        os.close(fd)
+
+    if written != expected:
+        # Connection dropped mid-chunk: leave it unrecorded so the client resends it
+        raise UploadError(f"Chunk {index} was truncated ({written} of {expected} bytes).")
+
+    key = chunks_key(upload_id)
+    pipe = redis_conn.pipeline(transaction=True)
+    pipe.hset(key, index, digest.hexdigest())
+    pipe.expire(key, UPLOAD_SESSION_TTL_SECONDS)
+    pipe.execute()
+    return digest.hexdigest()
+
+
+def finish_upload_session(redis_conn, upload_id, session):
+    """Return the content hash once every chunk is in, and drop the session."""
+    raw = redis_conn.hgetall(chunks_key(upload_id))
+    digests = {int(index): digest.decode() for index, digest in raw.items()}
+    missing = [index for index in range(session['total_chunks']) if index not in digests]
+    if missing:
+        raise UploadError(f"Upload incomplete, {len(missing)} chunk(s) missing.", 409)
+
+    content_hash = combine_chunk_digests(digests[index] for index in range(session['total_chunks']))
+    redis_conn.delete(session_key(upload_id), chunks_key(upload_id))
+    return content_hash
+
+
+def abort_upload_session(redis_conn, upload_id, session):
+    redis_conn.delete(session_key(upload_id), chunks_key(upload_id))
+    if os.path.exists(session['filepath']):
+        os.remove(session['filepath'])
@@ -0,0 +1,190 @@
+import os
+import json
+import hashlib
+import requests
+
+# Third-party AI and stock-media calls.
+#
+# Run inline, a slow OpenAI or Pexels response would hold a sync gunicorn
+# worker for its whole duration. The web tier enqueues them on the
+# 'interactive' queue (listened to first by every worker) and clients poll
+# /api/tasks/<id> for the result; only a `Prefer: wait=<seconds>` request
+# runs one inline. Each task returns plain
+# JSON-able data, kept by RQ for TASK_RESULT_TTL_SECONDS.
+#
+# Base URLs come from the environment so scripts/bench.py upstream-loadtest
+# can point the workers at a local stub.
+INTERACTIVE_QUEUE = 'interactive'
+TASK_TIMEOUT_SECONDS = 60
+TASK_RESULT_TTL_SECONDS = 600
+UPSTREAM_TIMEOUT_SECONDS = 15
+# Stock search results barely change; caching them also spares the API rate limits
+STOCK_SEARCH_CACHE_TTL_SECONDS = 3600
+
+PEXELS_API_URL = os.environ.get('PEXELS_API_URL', 'https://api.pexels.com/videos/search')
+PIXABAY_API_URL = os.environ.get('PIXABAY_API_URL', 'https://pixabay.com/api/videos/')
+
+FALLBACK_AI_CONTENT = {
+    "hooks": ["Amazing content!", "Don't miss this", "Watch till the end"],
+    "hashtags": ["#viral", "#trending", "#fyp"]
+}
+
+
+def stock_search_cache_key(query, per_page):
+    digest = hashlib.sha1(query.strip().lower().encode('utf-8')).hexdigest()
+    return f"stock_search:{per_page}:{digest}"
+
+
+def cached_stock_search(redis_conn, query, per_page=8):
+    """Results of an earlier identical search, or None."""
+    cached = redis_conn.get(stock_search_cache_key(query, per_page))
+    return json.loads(cached) if cached else None
+
+
+def _search_pexels(query, per_page, logger):
+    pexels_key = os.environ.get('PEXELS_API_KEY')
+    if not pexels_key:
+        return []
+    results = []
+    try:
+        response = requests.get(
+            PEXELS_API_URL,
+            headers={'Authorization': pexels_key},
+            params={'query': query, 'per_page': per_page, 'orientation': 'portrait'},
+            timeout=UPSTREAM_TIMEOUT_SECONDS
+        )
+        if response.status_code == 200:
+            for video in response.json().get('videos', []):
+                video_files = video.get('video_files', [])
+                if video_files:
+                    results.append({
+                        'id': str(video['id']),
+                        'video_url': video_files[0]['link'],
+                        'thumbnail': video['image'],
+                        'source': 'pexels',
+                        'duration': video.get('duration', 15)
+                    })
+    except Exception as e:
+        logger.error(f"Pexels search error for '{query}': {e}")
+    return results
+
+
+def _search_pixabay(query, per_page, logger):
+    pixabay_key = os.environ.get('PIXABAY_API_KEY')
+    if not pixabay_key:
+        return []
+    results = []
+    try:
+        response = requests.get(
+            PIXABAY_API_URL,
+            params={'key': pixabay_key, 'q': query, 'per_page': per_page, 'orientation': 'vertical'},
+            timeout=UPSTREAM_TIMEOUT_SECONDS
+        )
+        if response.status_code == 200:
+            for video in response.json().get('hits', []):
+                results.append({
+                    'id': str(video['id']),
+                    'video_url': video['videos']['medium']['url'],
+                    'thumbnail': video['videos']['medium']['thumbnail'],
+                    'source': 'pixabay',
+                    'duration': video.get('duration', 15)
+                })
+    except Exception as e:
+        logger.error(f"Pixabay search error for '{query}': {e}")
+    return results
+
+
+def search_stock_videos(query, per_page=8, fallback=True):
+    """
+    RQ task: portrait stock clips for `query` from Pexels, topped up from
+    Pixabay. Without any API key (or results) placeholder clips are returned
+    when `fallback` is set.
+    """
+    from app import app, redis_conn
+
+    cached = cached_stock_search(redis_conn, query, per_page)
+    if cached is not None:
+        return cached
+
+    results = _search_pexels(query, per_page, app.logger)
+    if len(results) < min(5, per_page):
+        results += _search_pixabay(query, per_page - len(results), app.logger)
+    if results:
+        redis_conn.setex(stock_search_cache_key(query, per_page), STOCK_SEARCH_CACHE_TTL_SECONDS, json.dumps(results[:per_page]))
+    elif fallback:
+        results = [
+            {
+                'id': 'mock1',
+                'video_url': 'https://example.com/video1.mp4',
+                'thumbnail': f'https://source.unsplash.com/300x500/?{query},nature',
+                'source': 'pexels',
+                'duration': 10
+            },
+            {
+                'id': 'mock2',
+                'video_url': 'https://example.com/video2.mp4',
+                'thumbnail': f'https://source.unsplash.com/300x500/?{query},city',
+                'source': 'pixabay',
+                'duration': 15
+            }
+        ]
+    return results[:per_page]
+
+
+def suggest_broll(keywords):
+    """RQ task: two stock clips per keyword, tagged with the keyword that found them."""
+    suggested_broll = []
+    for keyword in keywords:
+        for clip in search_stock_videos(keyword, per_page=2, fallback=False):
+            suggested_broll.append({**clip, 'keyword': keyword})
+    return suggested_broll
+
+
+def generate_ai_content(transcript):
+    """RQ task: viral hooks, a description and hashtags for a transcript, via GPT-4o."""
+    from app import app
+
+    if not os.environ.get('OPENAI_API_KEY'):
+        # Fallback mock data if no API key
+        return {
+            "hooks": [
+                "You won't believe what happens next...",
+                "This changed everything for me",
+                "Stop doing this mistake right now"
+            ],
+            "descriptions": [
+                f"An amazing video about: {transcript[:100]}..."
+            ],
+            "hashtags": ["#viral", "#trending", "#fyp", "#contentcreator", "#video"]
+        }
+
+    try:
+        import openai
+        # OPENAI_BASE_URL, when set, is picked up by the client
+        client = openai.OpenAI(timeout=UPSTREAM_TIMEOUT_SECONDS, max_retries=1)
+        response = client.chat.completions.create(
+            model="gpt-4o",
+            messages=[{
+                "role": "system",
+                "content": "You are a viral content strategist. Generate engaging hooks, descriptions, and hashtags."
+            }, {
+                "role": "user",
+                "content": f"Based on this transcript, generate:\n1. Three viral hook ideas\n2. One compelling description\n3. Ten relevant hashtags\n\nTranscript: {transcript[:2000]}"
+            }]
+        )
+        content = response.choices[0].message.content or ''
+
+        # Parse the response
+        lines = content.split('\n')
+        hooks = [l.strip('- ') for l in lines if l.strip().startswith('-') or l.strip().startswith('1.') or l.strip().startswith('2.') or l.strip().startswith('3.')][:3]
+        description = next((l for l in lines if 'description' in l.lower() or len(l) > 50), transcript[:150])
+        hashtags = [tag.strip() for tag in content.split() if tag.startswith('#')][:10]
+
+        return {
+            "hooks": hooks or FALLBACK_AI_CONTENT["hooks"],
+            "descriptions": [description],
+            "hashtags": hashtags or ["#viral", "#trending"]
+        }
+    except Exception as e:
+        app.logger.error(f"AI generation error: {e}")
+        return {**FALLBACK_AI_CONTENT, "descriptions": [transcript[:150] + "..."]}
@@ -0,0 +1,106 @@
+import os
+import struct
+import numpy as np
+from audio_pcm import open_pcm, PCM_SAMPLE_RATE
+
+# Multi-resolution waveform peaks ("mipmaps") for the editor timeline.
+#
+# Level 0 holds one (min, max) pair per BASE_SAMPLES_PER_PEAK samples; every
+# following level merges LEVEL_FACTOR pairs of the previous one. Peaks are
+# stored as int8 (the float samples scaled to -127..127), interleaved min/max,
+# so an hour of audio at level 0 is ~700 KB and any zoom level can be drawn
+# without decoding audio in the browser.
+#
+# File layout (little endian):
+#   header  : magic b'WPK1', sample_rate u32, level count u16
+#   per level: samples_per_peak u32, peak count u32, data offset u64
+#   data    : int8 [min, max] pairs for each level, back to back
+MAGIC = b'WPK1'
+HEADER = struct.Struct('<4sIH')
+LEVEL_ENTRY = struct.Struct('<IIQ')
+BASE_SAMPLES_PER_PEAK = 160  # 100 peaks per second at 16 kHz
+LEVEL_FACTOR = 4
+LEVEL_COUNT = 5
+READ_BLOCK_PEAKS = 4096
+
+
+def compute_base_peaks(pcm_path):
+    """Walk the memory-mapped PCM artifact block by block into level-0 int8 (min, max) pairs."""
+    samples = open_pcm(pcm_path)
+    block = BASE_SAMPLES_PER_PEAK * READ_BLOCK_PEAKS
+    blocks = [reduce_samples(samples[i:i + block], BASE_SAMPLES_PER_PEAK) for i in range(0, len(samples), block)]
+    peaks = np.concatenate(blocks) if blocks else np.zeros((0, 2), dtype=np.int8)
+    return PCM_SAMPLE_RATE, peaks
+
+
+def reduce_samples(samples, samples_per_peak):
+    """(min, max) of every `samples_per_peak` samples, scaled to int8."""
+    pad = (-len(samples)) % samples_per_peak
+    if pad:
+        samples = np.concatenate([samples, np.repeat(samples[-1:], pad)])
+    frames = samples.reshape(-1, samples_per_peak)
+    peaks = np.stack([frames.min(axis=1), frames.max(axis=1)], axis=1)
+    return np.clip(np.round(peaks * 127), -127, 127).astype(np.int8)
+
+
+def reduce_peaks(peaks, factor):
+    """Merge `factor` consecutive (min, max) pairs into one."""
+    pad = (-len(peaks)) % factor
+    if pad:
+        peaks = np.concatenate([peaks, np.repeat(peaks[-1:], pad, axis=0)])
+    grouped = peaks.reshape(-1, factor, 2)
+    return np.stack([grouped[:, :, 0].min(axis=1), grouped[:, :, 1].max(axis=1)], axis=1)
+
+
+def write_peaks_file(pcm_path, out_path):
+    sample_rate, level = compute_base_peaks(pcm_path)
+    levels = [(BASE_SAMPLES_PER_PEAK, level)]
+    for i in range(1, LEVEL_COUNT):
+        if len(level) <= 1:
+            break
+        level = reduce_peaks(level, LEVEL_FACTOR)
+        levels.append((BASE_SAMPLES_PER_PEAK * LEVEL_FACTOR ** i, level))
+
+    offset = HEADER.size + LEVEL_ENTRY.size * len(levels)
+    partial_path = f"{out_path}.partial"
+    with open(partial_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, sample_rate, len(levels)))
+        for samples_per_peak, peaks in levels:
+            f.write(LEVEL_ENTRY.pack(samples_per_peak, len(peaks), offset))
+            offset += peaks.nbytes
+        for _, peaks in levels:
+            f.write(np.ascontiguousarray(peaks).tobytes())
+    os.replace(partial_path, out_path)
+    return read_peaks_header(out_path)
+
+
+def read_peaks_header(path):
+    with open(path, 'rb') as f:
+        magic, sample_rate, level_count = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a waveform peaks file")
+        levels = []
+        for _ in range(level_count):
+            samples_per_peak, count, offset = LEVEL_ENTRY.unpack(f.read(LEVEL_ENTRY.size))
+            levels.append({
+                "samples_per_peak": samples_per_peak,
+                "peaks_per_second": sample_rate / samples_per_peak,
+                "count": count,
+                "offset": offset
+            })
+    return {"sample_rate": sample_rate, "levels": levels}
+
+
+def read_peaks_window(path, level_index, start_seconds=0.0, end_seconds=None):
+    """
+    Memory-map one level and return (first peak index, raw int8 min/max bytes)
+    covering [start_seconds, end_seconds). Only the pages for the window are read.
+    """
+    header = read_peaks_header(path)
+    level = header["levels"][level_index]
+    first = max(0, int(start_seconds * level["peaks_per_second"]))
+    last = level["count"] if end_seconds is None else min(level["count"], int(np.ceil(end_seconds * level["peaks_per_second"])))
+    if level["count"] == 0 or first >= last:
+        return first, b''
+    peaks = np.memmap(path, dtype=np.int8, mode='r', offset=level["offset"], shape=(level["count"], 2))
+    return first, peaks[first:last].tobytes()
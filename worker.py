@@ -4,7 +4,12 @@ import json
 import subprocess
 import time
 from rq import Worker, Queue
-from app import app, redis_conn, transcribe_video_task, burn_subtitles_task
+from app import app, redis_conn, storage, media_key, load_caption_revision, transcribe_video_task, burn_subtitles_task
+from redis_pool import create_redis_connection, redis_round_trips, write_status_snapshot
+from job_control import JobCancelled, run_ffmpeg, raise_if_cancelled, clear_cancel
+from lifecycle import track_artifact, end_job_work, schedule_disk_maintenance
+from quota import schedule_usage_flush
+from upstream import INTERACTIVE_QUEUE
 
 def generate_ass_subtitles(captions, style, width, height):
     """
@@ -86,33 +91,61 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
     
     return ass_content
 
-def export_video_task(job_id, export_id, video_path, captions, style, settings):
+def export_video_task(job_id, export_id, video_path, captions, style, settings, caption_version=None):
     """
     Professional video export with FFmpeg - ACTUALLY burns subtitles
     """
-    from app import redis_conn
+    started_at = time.time()
+    round_trips_at_start = redis_round_trips()
     
     def update_status(status, progress, message, download_url=None):
         status_data = {
             "export_id": export_id,
+            "job_id": job_id,
             "status": status,
             "progress": progress,
             "message": message
         }
         if download_url:
             status_data["download_url"] = download_url
-        redis_conn.setex(f"export_status:{export_id}", 3600, json.dumps(status_data))
+        # Status snapshot and metrics go out together in one MULTI/EXEC round trip
+        write_status_snapshot(
+            redis_conn,
+            f"export_status:{export_id}", status_data,
+            f"export_metrics:{export_id}", {
+                "status": status,
+                "progress": progress,
+                "elapsed_seconds": round(time.time() - started_at, 2),
+                "redis_round_trips": redis_round_trips() - round_trips_at_start + 1
+            }
+        )
+    
+    tmp_dir = os.path.join(os.getcwd(), 'tmp')
+    ass_path = os.path.join(tmp_dir, f"{export_id}.ass")
+    final_key = f"{export_id}.mp4"
+    # Encode straight onto the destination filesystem when storage is local, so
+    # publishing is a rename; remote storage uploads from local scratch instead.
+    output_path = storage.staging_path(final_key) or os.path.join(tmp_dir, f"{export_id}_final.mp4")
     
     try:
+        raise_if_cancelled(redis_conn, export_id)
         update_status("processing", 10, "Preparing video...")
         
         print(f"Export task started: export_id={export_id}")
         print(f"Video path: {video_path}")
-        print(f"Video exists: {os.path.exists(video_path)}")
         
         # Verify input video exists
-        if not os.path.exists(video_path):
+        if not storage.exists(media_key(video_path)):
             raise Exception(f"Input video file not found: {video_path}")
+        # On a worker without the shared disk this pulls the original into the local cache once
+        video_path = storage.local_path(media_key(video_path))
+        
+        if captions is None:
+            # The export renders a caption version pinned when it was queued
+            with app.app_context():
+                captions = load_caption_revision(job_id, caption_version)
+            if captions is None:
+                raise Exception(f"Caption version {caption_version} of job {job_id} is no longer available")
         
         # Get settings
         resolution = settings.get('resolution', '1080x1920')
@@ -125,11 +158,9 @@ def export_video_task(job_id, export_id, video_path, captions, style, settings):
         update_status("processing", 30, "Generating subtitles...")
         
         # Generate ASS subtitle file
-        tmp_dir = os.path.join(os.getcwd(), 'tmp')
         os.makedirs(tmp_dir, exist_ok=True)
         
         ass_content = generate_ass_subtitles(captions, style, width, height)
-        ass_path = os.path.join(tmp_dir, f"{export_id}.ass")
         
         with open(ass_path, 'w', encoding='utf-8') as f:
             f.write(ass_content)
@@ -138,8 +169,6 @@ def export_video_task(job_id, export_id, video_path, captions, style, settings):
         
         update_status("processing", 50, "Encoding video with subtitles...")
         
-        # Output path
-        output_path = os.path.join(tmp_dir, f"{export_id}_final.mp4")
         print(f"Output path: {output_path}")
         
         # Build video filter with subtitles
@@ -160,34 +189,25 @@ def export_video_task(job_id, export_id, video_path, captions, style, settings):
             '-pix_fmt', 'yuv420p',
             '-c:a', 'aac',
             '-b:a', '128k',
+            # moov atom up front: playback and download previews start before the last byte arrives
+            '-movflags', '+faststart',
+            '-f', 'mp4',
             output_path
         ]
         
         print(f"Starting FFmpeg: {' '.join(cmd)}")
         
-        # Run FFmpeg
-        process = subprocess.Popen(
+        # Run FFmpeg in its own process group so a cancel can kill it outright
+        returncode, full_output = run_ffmpeg(
             cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            universal_newlines=True,
-            bufsize=1
+            redis_conn=redis_conn,
+            cancel_id=export_id,
+            on_line=lambda line: print(f"FFmpeg: {line.strip()}")
         )
         
-        # Capture output
-        output_lines = []
-        for line in process.stdout:
-            output_lines.append(line)
-            if len(output_lines) > 100:
-                output_lines.pop(0)
-            print(f"FFmpeg: {line.strip()}")
-        
-        process.wait()
+        print(f"FFmpeg exit code: {returncode}")
         
-        print(f"FFmpeg exit code: {process.returncode}")
-        
-        if process.returncode != 0:
-            full_output = ''.join(output_lines)
+        if returncode != 0:
             print(f"FFmpeg failed:\n{full_output}")
             raise Exception("FFmpeg encoding failed")
         
@@ -203,23 +223,17 @@ def export_video_task(job_id, export_id, video_path, captions, style, settings):
         
         update_status("processing", 90, "Saving file...")
         
-        # Move to uploads folder
-        upload_folder = app.config['UPLOAD_FOLDER']
-        os.makedirs(upload_folder, exist_ok=True)
-        
-        final_output = os.path.join(upload_folder, f"{export_id}.mp4")
-        
-        import shutil
-        shutil.copy2(output_path, final_output)
-        os.remove(output_path)
+        # Publish atomically: a rename on local storage, a completed multipart upload on S3
+        final_size = file_size
+        track_artifact(redis_conn, job_id, final_key, 'export', size=file_size)
+        storage.put(final_key, output_path, move=True)
         os.remove(ass_path)  # Clean up subtitle file
         
         # Verify final file
-        if not os.path.exists(final_output):
+        if not storage.exists(final_key):
             raise Exception("Failed to save output file")
         
-        final_size = os.path.getsize(final_output)
-        print(f"Final file saved: {final_output} ({final_size} bytes)")
+        print(f"Final file saved: {final_key} ({final_size} bytes)")
         
         # Generate download URL
         download_url = f"/uploads/{export_id}.mp4"
@@ -228,19 +242,51 @@ def export_video_task(job_id, export_id, video_path, captions, style, settings):
         
         return {"status": "success", "download_url": download_url, "file_size": final_size}
         
+    except JobCancelled:
+        print(f"Export cancelled: export_id={export_id}")
+        for path in (ass_path, output_path):
+            if os.path.exists(path):
+                os.remove(path)
+        clear_cancel(redis_conn, export_id)
+        update_status("cancelled", 0, "Export cancelled.")
+        return {"status": "cancelled"}
+        
     except Exception as e:
         error_msg = f"Export failed: {str(e)}"
         print(error_msg)
+        for path in (ass_path, output_path):
+            if os.path.exists(path):
+                os.remove(path)
         update_status("failed", 0, error_msg)
         raise
+    finally:
+        end_job_work(redis_conn, job_id, export_id)
 
 # Preload Flask app context for db access within tasks
 with app.app_context():
     if __name__ == '__main__':
-        # Define the queue(s) to listen to
+        # The dequeue loop blocks in BLPOP for up to worker_ttl - 15 s while idle.
+        # With the shared pool's socket timeout that read times out, and RQ only
+        # handles ConnectionError, so the worker gets a connection without one.
+        worker_conn = create_redis_connection(app.config['REDIS_URL'], socket_timeout=None)
+        # Define the queue(s) to listen to.
+        # Listed first: RQ serves queues in order, so a quick upstream call the
+        # editor is waiting on never sits behind a transcription or an export
         queues = [
-            Queue('default', connection=redis_conn),
-            Queue('exports', connection=redis_conn)
+            Queue(INTERACTIVE_QUEUE, connection=worker_conn),
+            Queue('default', connection=worker_conn),
+            Queue('exports', connection=worker_conn)
         ]
-        worker = Worker(queues, connection=redis_conn)
-        worker.work()
+        # Periodic disk maintenance (retention, quota, orphan sweep) runs as a scheduled job
+        schedule_disk_maintenance(redis_conn, queues[1])
+        # UsageLog rows are written by a periodic flush of the Redis usage counters
+        schedule_usage_flush(redis_conn, queues[1])
+        # The web tier never imports the ML stack (see app.load_faster_whisper_model).
+        # Import it once here so every forked work horse inherits it instead of
+        # paying for ctranslate2 and numpy on each job.
+        import numpy  # noqa: F401
+        import faster_whisper  # noqa: F401
+        import audio_pcm  # noqa: F401
+        import waveform  # noqa: F401
+        worker = Worker(queues, connection=worker_conn)
+        worker.work(with_scheduler=True)